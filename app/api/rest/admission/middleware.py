@@ -0,0 +1,60 @@
+from collections.abc import Collection
+
+from dependency_injector.wiring import Provide, inject
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.app_layer.services.csv_normalization import (
+    CsvAdmissionController,
+    CsvAdmissionError,
+    CsvAdmissionQueueFullError,
+)
+from app.containers import Container
+
+
+class AdmissionMiddleware:
+    """Hold uploads to ``paths`` back until the normalize budget has room for them.
+
+    Runs before the body is read, sizing the upload by its ``Content-Length``, so uploads over
+    budget wait or are turned away without being buffered. The budget is held until the last byte
+    of the response is sent, which for streamed responses is when the normalization ends.
+    """
+
+    def __init__(self, app: ASGIApp, *, paths: Collection[str]) -> None:
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"].rstrip("/") not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        await self._admit(scope, receive, send)
+
+    @inject
+    async def _admit(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        controller: CsvAdmissionController = Provide[Container.csv_admission_controller],
+    ) -> None:
+        content_length = Headers(scope=scope).get("content-length", "")
+        try:
+            admission = await controller.acquire(int(content_length) if content_length.isdigit() else None)
+        except CsvAdmissionError as exc:
+            # Too many waiting uploads is the client's to back off from, a long wait is the server's
+            status_code = 429 if isinstance(exc, CsvAdmissionQueueFullError) else 503
+            response = JSONResponse(
+                {"detail": str(exc)},
+                status_code=status_code,
+                headers={"Retry-After": str(exc.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(admission)
@@ -0,0 +1,110 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.app_layer.services.csv_normalization import Compression
+from app.app_layer.services.csv_normalization.compression import StreamCompressor, zstd_available
+
+# Bodies that are compressed already and would only grow
+PRECOMPRESSED_MEDIA_TYPES = frozenset(
+    {
+        "application/gzip",
+        "application/x-bzip2",
+        "application/zip",
+        "application/zstd",
+        "application/vnd.apache.parquet",
+    },
+)
+
+
+def negotiate_encoding(accept_encoding: str, offered: tuple[Compression, ...]) -> Compression | None:
+    """Pick the first of ``offered`` the ``Accept-Encoding`` header accepts, honouring ``q=0`` and ``*``."""
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        token, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if token:
+            qualities[token.lower()] = quality
+
+    for compression in offered:
+        if qualities.get(compression, qualities.get("*", 0.0)) > 0:
+            return compression
+    return None
+
+
+class CompressionMiddleware:
+    """Compress response bodies with zstd or gzip when the client accepts it.
+
+    A plain ASGI middleware rather than Starlette's ``GZipMiddleware``, so zstd can be offered and
+    streamed bodies are compressed and flushed chunk by chunk instead of being held back. Small
+    bodies, bodies that already have a ``Content-Encoding`` and compressed media types are sent as is.
+    """
+
+    def __init__(self, app: ASGIApp, *, minimum_size: int = 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offered = (Compression.ZSTD, Compression.GZIP) if zstd_available() else (Compression.GZIP,)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        compression = None
+        if scope["type"] == "http":
+            compression = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.offered)
+
+        if compression is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, _CompressingSender(send, compression, self.minimum_size))
+
+
+class _CompressingSender:
+    def __init__(self, send: Send, compression: Compression, minimum_size: int) -> None:
+        self.send = send
+        self.compression = compression
+        self.minimum_size = minimum_size
+        self.start: Message | None = None
+        self.compressor: StreamCompressor | None = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+            self.passthrough = "content-encoding" in headers or media_type in PRECOMPRESSED_MEDIA_TYPES
+            if self.passthrough:
+                await self.send(message)
+            else:
+                # Held back until the first body chunk tells whether compressing is worth it
+                self.start = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough or self.start is None:
+            await self.send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+        if self.compressor is None:
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+
+            self.compressor = StreamCompressor(self.compression)
+            headers = MutableHeaders(scope=self.start)
+            del headers["content-length"]
+            headers["content-encoding"] = self.compression
+            headers.add_vary_header("Accept-Encoding")
+            await self.send(self.start)
+
+        content = self.compressor.compress(body) if body else b""
+        if not more_body:
+            content += self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": content, "more_body": more_body})
@@ -1,7 +1,21 @@
 from fastapi import FastAPI
 
+from app.api.rest.admission.middleware import AdmissionMiddleware
+from app.api.rest.compression.middleware import CompressionMiddleware
 from app.api.rest.internal.controllers import internal_api
+from app.api.rest.metrics.api import router as metrics_router
+from app.api.rest.metrics.middleware import MetricsMiddleware
+from app.configs.base import settings
+
+NORMALIZE_PATH = "/api/internal/v1/upload/normalize"
+BULK_NORMALIZE_PATH = "/api/internal/v1/upload/normalize/bulk"
 
 
 def init_rest_api(app: FastAPI) -> FastAPI:
     app.include_router(internal_api, prefix="/api/internal")
+    app.include_router(metrics_router, tags=["Metrics"])
+    if settings.api.response_compression:
+        app.add_middleware(CompressionMiddleware, minimum_size=settings.api.response_compression_min_size)
+    # Only the synchronous endpoints hold whole uploads in memory; jobs are bounded by their own queue
+    app.add_middleware(AdmissionMiddleware, paths=(NORMALIZE_PATH, BULK_NORMALIZE_PATH))
+    app.add_middleware(MetricsMiddleware)
@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 
+from app.api.rest.internal.v1.jobs.api import router as jobs_router
 from app.api.rest.internal.v1.upload.api import router as upload_router
 
 internal_api = APIRouter()
 
 internal_api.include_router(upload_router, prefix="/v1/upload", tags=["CSV Upload"])
+internal_api.include_router(jobs_router, prefix="/v1/jobs", tags=["CSV Jobs"])
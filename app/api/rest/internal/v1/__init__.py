@@ -1 +1 @@
-from app.api.rest.internal.v1 import upload  # noqa: F401
+from app.api.rest.internal.v1 import jobs, upload  # noqa: F401
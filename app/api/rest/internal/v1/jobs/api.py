@@ -0,0 +1,210 @@
+import re
+from typing import Annotated
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Request, UploadFile
+from pydantic import BaseModel, Field
+from starlette.responses import FileResponse, JSONResponse
+
+from app.app_layer.services.csv_normalization import (
+    CsvJobManager,
+    CsvJobNotFoundError,
+    CsvJobNotReadyError,
+    CsvJobQueueFullError,
+    CsvNormalizationError,
+    CsvNormalizationJobDTO,
+    CsvUploadIncompleteError,
+    CsvUploadRangeError,
+    CsvUploadSessionDTO,
+    CsvUploadTooLargeError,
+    DedupPolicy,
+)
+from app.containers import Container
+
+router = APIRouter()
+
+CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+
+class JobParams(BaseModel):
+    country: str | None = Field(
+        default=None,
+        description="ISO region or calling code of phone numbers in rows without a country value",
+    )
+    dedup: DedupPolicy | None = Field(
+        default=None,
+        description="Keep one row per id: the first, the last, or the first with conflicts reported",
+    )
+    confidence: bool = Field(
+        default=False,
+        description="Add a confidence column flagging swapped days and months, inferred centuries and country codes",
+    )
+
+
+class UploadParams(JobParams):
+    filename: str = Field(description="Name of the file; a .gz, .zst or .bz2 suffix tells its compression")
+    size: int = Field(gt=0, description="Size of the whole file in bytes")
+
+
+@router.post(
+    "/normalize",
+    status_code=202,
+    summary="Queue normalization of an uploaded CSV",
+    response_description="Job to poll for progress; the result is downloadable once it is completed",
+)
+@inject
+async def submit_normalization_job(
+    request: Request,
+    file: Annotated[UploadFile, File(description="CSV file with columns id;phone;dob")],
+    jobs: Annotated[CsvJobManager, Depends(Provide[Container.csv_job_manager])],
+    params: Annotated[JobParams, Query()],
+) -> JSONResponse:
+    try:
+        job = await jobs.submit(file, country=params.country, dedup=params.dedup, confidence=params.confidence)
+    except CsvJobQueueFullError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    except CsvNormalizationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    return JSONResponse(
+        content=job.model_dump(mode="json"),
+        status_code=202,
+        headers={"Location": str(request.url_for("get_normalization_job", job_id=job.job_id))},
+    )
+
+
+@router.post(
+    "/uploads",
+    status_code=201,
+    summary="Start a resumable chunked upload",
+    response_description="Upload session; its job normalizes the file while the chunks arrive",
+)
+@inject
+async def create_upload(
+    request: Request,
+    params: Annotated[UploadParams, Query()],
+    jobs: Annotated[CsvJobManager, Depends(Provide[Container.csv_job_manager])],
+) -> JSONResponse:
+    try:
+        session = await jobs.create_upload(
+            params.filename,
+            params.size,
+            country=params.country,
+            dedup=params.dedup,
+            confidence=params.confidence,
+        )
+    except CsvUploadTooLargeError as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    except CsvJobQueueFullError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    except CsvNormalizationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    return JSONResponse(
+        content=session.model_dump(mode="json"),
+        status_code=201,
+        headers={"Location": str(request.url_for("get_upload", job_id=session.job_id))},
+    )
+
+
+@router.put("/uploads/{job_id}", summary="Send a byte range of a chunked upload")
+@inject
+async def put_upload_range(
+    job_id: str,
+    request: Request,
+    content_range: Annotated[str, Header(description="Range of the body, as in bytes 0-1048575/4194304")],
+    jobs: Annotated[CsvJobManager, Depends(Provide[Container.csv_job_manager])],
+) -> CsvUploadSessionDTO:
+    try:
+        first, last = _parse_content_range(content_range, jobs.get_upload(job_id).size)
+        session = await jobs.write_upload(job_id, first, last, request.stream())
+    except CsvJobNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except CsvUploadRangeError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except CsvNormalizationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    return session
+
+
+@router.get("/uploads/{job_id}", summary="Get the received and missing bytes of a chunked upload")
+@inject
+async def get_upload(
+    job_id: str,
+    jobs: Annotated[CsvJobManager, Depends(Provide[Container.csv_job_manager])],
+) -> CsvUploadSessionDTO:
+    try:
+        return jobs.get_upload(job_id)
+    except CsvJobNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@router.post(
+    "/uploads/{job_id}/finalize",
+    status_code=202,
+    summary="Finish a chunked upload",
+    response_description="Job of the upload, possibly completed already",
+)
+@inject
+async def finalize_upload(
+    request: Request,
+    job_id: str,
+    jobs: Annotated[CsvJobManager, Depends(Provide[Container.csv_job_manager])],
+) -> JSONResponse:
+    try:
+        job = await jobs.finalize_upload(job_id)
+    except CsvJobNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except CsvUploadIncompleteError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+    return JSONResponse(
+        content=job.model_dump(mode="json"),
+        status_code=202,
+        headers={"Location": str(request.url_for("get_normalization_job", job_id=job.job_id))},
+    )
+
+
+@router.get("/{job_id}", summary="Get status and progress of a normalization job")
+@inject
+async def get_normalization_job(
+    job_id: str,
+    jobs: Annotated[CsvJobManager, Depends(Provide[Container.csv_job_manager])],
+) -> CsvNormalizationJobDTO:
+    try:
+        return jobs.get(job_id)
+    except CsvJobNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+
+@router.get("/{job_id}/result", summary="Download the normalized CSV of a completed job")
+@inject
+async def get_normalization_job_result(
+    job_id: str,
+    jobs: Annotated[CsvJobManager, Depends(Provide[Container.csv_job_manager])],
+) -> FileResponse:
+    try:
+        path = jobs.result_path(job_id)
+    except CsvJobNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except CsvJobNotReadyError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+
+    job = jobs.get(job_id)
+    headers = {
+        "X-CSV-Processed": str(job.processed_rows),
+        "X-CSV-Normalized": str(job.normalized_rows),
+        "X-CSV-Skipped": str(job.skipped_rows),
+    }
+    return FileResponse(path, media_type="text/csv", filename=job.filename, headers=headers)
+
+
+def _parse_content_range(content_range: str, size: int) -> tuple[int, int]:
+    match = CONTENT_RANGE.fullmatch(content_range.strip())
+    if match is None:
+        raise CsvUploadRangeError(f"Content-Range must look like bytes 0-1023/{size}")
+    first, last, total = int(match[1]), int(match[2]), match[3]
+    if last < first or last >= size or total not in {"*", str(size)}:
+        raise CsvUploadRangeError(f"Content-Range {content_range} does not fit an upload of {size} bytes")
+    return first, last
@@ -1,35 +1,348 @@
+from collections.abc import AsyncIterator
+from io import BytesIO
 from typing import Annotated
+from uuid import uuid4
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
-from starlette.responses import Response
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, UploadFile
+from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
+from starlette.responses import FileResponse, Response, StreamingResponse
 
-from app.app_layer.services.csv_normalization import CsvNormalizationError, CSVService
+from app.app_layer.services.csv_normalization import (
+    CsvArchiveService,
+    CsvDeltaBaseNotFoundError,
+    CsvNormalizationError,
+    CsvNormalizationStreamDTO,
+    CsvNormalizationSummaryDTO,
+    CsvResultCache,
+    CSVService,
+    CsvSkipReportStore,
+    CsvSummaryStore,
+    DedupPolicy,
+    DeltaMode,
+    NormalizationCache,
+    NormalizationCacheStatsDTO,
+    OutputFormat,
+    UnsupportedCompressionError,
+    UnsupportedOutputFormatError,
+)
+from app.app_layer.services.csv_normalization.output import MEDIA_TYPES
+from app.app_layer.services.csv_normalization.result_cache import CachedResult
 from app.containers import Container
 
 router = APIRouter()
 
 
+class NormalizeParams(BaseModel):
+    stream: bool = Field(
+        default=False,
+        description="Stream rows as they are normalized; stats are served by the summary endpoint",
+    )
+    skip_report: bool = Field(
+        default=False,
+        description="Write every skipped row to a report served by the skip report endpoint",
+    )
+    country: str | None = Field(
+        default=None,
+        description="ISO region or calling code of phone numbers in rows without a country value",
+    )
+    format: OutputFormat | None = Field(
+        default=None,
+        description="Output format; without it the Accept header picks Arrow IPC or Parquet, CSV otherwise",
+    )
+    dedup: DedupPolicy | None = Field(
+        default=None,
+        description="Keep one row per id: the first, the last, or the first with differing duplicates reported apart",
+    )
+    confidence: bool = Field(
+        default=False,
+        description="Add a confidence column flagging swapped days and months, inferred centuries and country codes",
+    )
+    delta: DeltaMode | None = Field(
+        default=None,
+        description="Index rows for later delta normalizations and, with delta_base, normalize only changed rows",
+    )
+    delta_base: str | None = Field(
+        default=None,
+        description="Delta id of an earlier normalization whose unchanged rows are written (full) or left out (diff)",
+    )
+
+    def output_format(self, accept: str | None) -> OutputFormat:
+        if self.format is not None:
+            return self.format
+        media_types = [media_type.split(";")[0].strip().lower() for media_type in (accept or "").split(",")]
+        for output_format, media_type in MEDIA_TYPES.items():
+            if media_type in media_types and output_format is not OutputFormat.CSV:
+                return output_format
+        return OutputFormat.CSV
+
+
+class BulkNormalizeParams(BaseModel):
+    country: str | None = Field(
+        default=None,
+        description="ISO region or calling code of phone numbers in rows without a country value",
+    )
+    dedup: DedupPolicy | None = Field(
+        default=None,
+        description="Keep one row per id of every CSV: the first, the last, or the first with conflicts reported",
+    )
+    confidence: bool = Field(
+        default=False,
+        description="Add a confidence column flagging swapped days and months, inferred centuries and country codes",
+    )
+
+
 @router.post(
     "/normalize",
     summary="Normalize uploaded CSV data",
     response_description="CSV file where phone numbers are formatted as E.164 and dates as YYYY-MM-DD",
 )
 @inject
-async def normalize_csv(
+async def normalize_csv(  # noqa: PLR0913
+    *,
     file: Annotated[UploadFile, File(description="CSV file with columns id;phone;dob")],
     service: Annotated[CSVService, Depends(Provide[Container.get_csv_normalization_service])],
+    summaries: Annotated[CsvSummaryStore, Depends(Provide[Container.csv_summary_store])],
+    result_cache: Annotated[CsvResultCache, Depends(Provide[Container.csv_result_cache])],
+    params: Annotated[NormalizeParams, Query()],
+    accept: Annotated[str | None, Header()] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    output_format = params.output_format(accept)
+    cache_key = None
+    # Skip reports and delta indexes are written by the normalization that asked for them, so those never hit
+    if result_cache.enabled and not params.skip_report and params.delta is None:
+        cache_key = await result_cache.key(file, (params.country, output_format, params.dedup, params.confidence))
+        if _etag_matches(if_none_match, cache_key):
+            return Response(status_code=304, headers={"ETag": f'"{cache_key}"'})
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            # ``*`` matches any current representation, which only a cached output is
+            if if_none_match is not None and if_none_match.strip() == "*":
+                return Response(status_code=304, headers={"ETag": f'"{cache_key}"'})
+            return _cached_response(result_cache, cache_key, cached, summaries, stream=params.stream)
+
+    if params.stream:
+        return await _stream_csv(
+            _detach_upload(file),
+            service,
+            summaries,
+            params,
+            output_format,
+            result_cache=result_cache if cache_key is not None else None,
+            cache_key=cache_key,
+        )
+
+    try:
+        result = await service.process(
+            file,
+            skip_report=params.skip_report,
+            country=params.country,
+            output_format=output_format,
+            dedup=params.dedup,
+            confidence=params.confidence,
+            delta=params.delta,
+            delta_base=params.delta_base,
+        )
+    except CsvNormalizationError as exc:
+        raise HTTPException(status_code=_status_code(exc), detail=str(exc)) from exc
+
+    headers = _summary_headers(result)
+    if cache_key is not None:
+        summary = CsvNormalizationSummaryDTO.model_validate(result.model_dump(exclude={"content", "content_type"}))
+        result_cache.put(cache_key, result.content, summary, result.content_type)
+        headers["ETag"] = f'"{cache_key}"'
+
+    return Response(content=result.content, media_type=result.content_type, headers=headers)
+
+
+@router.post(
+    "/normalize/bulk",
+    summary="Normalize many uploaded CSVs or a zip archive of CSVs",
+    response_description="Zip of normalized CSVs and a manifest.json with the outcome of every CSV",
+)
+@inject
+async def normalize_csv_bulk(
+    *,
+    files: Annotated[list[UploadFile], File(description="CSV files with columns id;phone;dob, or one zip of them")],
+    service: Annotated[CsvArchiveService, Depends(Provide[Container.csv_archive_service])],
+    params: Annotated[BulkNormalizeParams, Query()],
+) -> Response:
+    uploads = [_detach_upload(file) for file in files]
+    try:
+        result = await service.stream(uploads, country=params.country, dedup=params.dedup, confidence=params.confidence)
+    except CsvNormalizationError as exc:
+        await _close_uploads(uploads)
+        raise HTTPException(status_code=_status_code(exc), detail=str(exc)) from exc
+
+    return StreamingResponse(
+        result.content,
+        media_type=result.content_type,
+        headers={"Content-Disposition": f'attachment; filename="{result.filename}"'},
+        background=BackgroundTask(_close_uploads, uploads),
+    )
+
+
+@router.get(
+    "/normalize/summaries/{summary_id}",
+    summary="Get stats of a streamed normalization",
+)
+@inject
+async def get_normalization_summary(
+    summary_id: str,
+    summaries: Annotated[CsvSummaryStore, Depends(Provide[Container.csv_summary_store])],
+) -> CsvNormalizationSummaryDTO:
+    summary = summaries.get(summary_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Summary not found or stream is still in progress")
+    return summary
+
+
+@router.get(
+    "/normalize/skip-reports/{report_id}",
+    summary="Download every skipped row of a normalization",
+    response_description="CSV with columns row_number;reason",
+)
+@inject
+async def get_skip_report(
+    report_id: str,
+    skip_reports: Annotated[CsvSkipReportStore, Depends(Provide[Container.csv_skip_report_store])],
+) -> FileResponse:
+    path = skip_reports.path(report_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Skip report not found or normalization is still in progress")
+    return FileResponse(path, media_type="text/csv", filename=f"skipped-{report_id}.csv")
+
+
+@router.get(
+    "/normalize/cache",
+    summary="Get hit, miss and eviction counters of the normalization cache",
+)
+@inject
+async def get_normalization_cache_stats(
+    cache: Annotated[NormalizationCache, Depends(Provide[Container.normalization_cache])],
+) -> NormalizationCacheStatsDTO:
+    return cache.stats
+
+
+async def _stream_csv(  # noqa: PLR0913
+    file: UploadFile,
+    service: CSVService,
+    summaries: CsvSummaryStore,
+    params: NormalizeParams,
+    output_format: OutputFormat,
+    *,
+    result_cache: CsvResultCache | None = None,
+    cache_key: str | None = None,
 ) -> Response:
     try:
-        result = await service.process(file)
+        result = await service.stream(
+            file,
+            skip_report=params.skip_report,
+            country=params.country,
+            output_format=output_format,
+            dedup=params.dedup,
+            confidence=params.confidence,
+            delta=params.delta,
+            delta_base=params.delta_base,
+        )
     except CsvNormalizationError as exc:
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
+        await file.close()
+        raise HTTPException(status_code=_status_code(exc), detail=str(exc)) from exc
 
     headers = {
         "Content-Disposition": f'attachment; filename="{result.filename}"',
-        "X-CSV-Processed": str(result.processed_rows),
-        "X-CSV-Normalized": str(result.normalized_rows),
-        "X-CSV-Skipped": str(result.skipped_rows),
+        "X-CSV-Summary-Id": result.summary_id,
     }
+    if result.summary.skip_report_id is not None:
+        headers["X-CSV-Skip-Report-Id"] = result.summary.skip_report_id
+    if result.summary.delta_id is not None:
+        headers["X-CSV-Delta-Id"] = result.summary.delta_id
+    if result_cache is not None and cache_key is not None:
+        result.content = result_cache.store(cache_key, result.content, result.summary, result.content_type)
+        headers["ETag"] = f'"{cache_key}"'
 
-    return Response(content=result.content, media_type=result.content_type, headers=headers)
+    return StreamingResponse(
+        _iter_with_summary(result, summaries),
+        media_type=result.content_type,
+        headers=headers,
+        background=BackgroundTask(file.close),
+    )
+
+
+def _cached_response(
+    result_cache: CsvResultCache,
+    cache_key: str,
+    cached: CachedResult,
+    summaries: CsvSummaryStore,
+    *,
+    stream: bool,
+) -> Response:
+    """Serve an output cached for an identical upload straight from disk, without normalizing again."""
+    if stream:
+        summary_id = uuid4().hex
+        summaries.save(summary_id, cached.summary)
+        headers = {
+            "Content-Disposition": f'attachment; filename="{cached.summary.filename}"',
+            "X-CSV-Summary-Id": summary_id,
+        }
+    else:
+        headers = _summary_headers(cached.summary)
+    headers["ETag"] = f'"{cache_key}"'
+    return FileResponse(result_cache.content_path(cache_key), media_type=cached.content_type, headers=headers)
+
+
+def _summary_headers(summary: CsvNormalizationSummaryDTO) -> dict[str, str]:
+    headers = {
+        "Content-Disposition": f'attachment; filename="{summary.filename}"',
+        "X-CSV-Processed": str(summary.processed_rows),
+        "X-CSV-Normalized": str(summary.normalized_rows),
+        "X-CSV-Skipped": str(summary.skipped_rows),
+    }
+    if summary.skip_report_id is not None:
+        headers["X-CSV-Skip-Report-Id"] = summary.skip_report_id
+    if summary.delta_id is not None:
+        headers["X-CSV-Delta-Id"] = summary.delta_id
+        headers["X-CSV-Unchanged"] = str(summary.unchanged_rows)
+    return headers
+
+
+def _etag_matches(if_none_match: str | None, cache_key: str) -> bool:
+    if if_none_match is None:
+        return False
+    # Weak and strong validators compare alike, the output being the same bytes either way
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return f'"{cache_key}"' in tags
+
+
+def _status_code(exc: CsvNormalizationError) -> int:
+    if isinstance(exc, UnsupportedOutputFormatError):
+        return 406
+    if isinstance(exc, UnsupportedCompressionError):
+        return 415
+    if isinstance(exc, CsvDeltaBaseNotFoundError):
+        return 404
+    return 400
+
+
+async def _iter_with_summary(result: CsvNormalizationStreamDTO, summaries: CsvSummaryStore) -> AsyncIterator[bytes]:
+    async for chunk in result.content:
+        yield chunk
+    summaries.save(result.summary_id, result.summary)
+
+
+async def _close_uploads(uploads: list[UploadFile]) -> None:
+    for upload in uploads:
+        await upload.close()
+
+
+def _detach_upload(file: UploadFile) -> UploadFile:
+    """Take over the spooled upload so it outlives the request form.
+
+    FastAPI closes form files before a ``StreamingResponse`` body is sent, so the form keeps an
+    empty placeholder and the streamed response closes the real file once it is written.
+    """
+    detached = UploadFile(file=file.file, size=file.size, filename=file.filename, headers=file.headers)
+    file.file = BytesIO()
+    return detached
@@ -0,0 +1,28 @@
+from typing import Annotated
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends
+from starlette.responses import Response
+
+from app.app_layer.services.csv_normalization.metrics import CsvNormalizationMetrics
+from app.app_layer.services.metrics import CONTENT_TYPE, MetricsRegistry
+from app.containers import Container
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics",
+    summary="Prometheus metrics of this worker process",
+    response_description="Metrics in the Prometheus text exposition format",
+)
+@inject
+async def get_metrics(
+    registry: Annotated[MetricsRegistry, Depends(Provide[Container.metrics_registry])],
+    _csv_metrics: Annotated[
+        CsvNormalizationMetrics,
+        # Registers the normalization series, so they are exported before the first upload
+        Depends(Provide[Container.csv_normalization_metrics]),
+    ],
+) -> Response:
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,56 @@
+from time import perf_counter
+
+from dependency_injector.wiring import Provide, inject
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.app_layer.services.metrics import HttpMetrics
+from app.containers import Container
+
+
+class MetricsMiddleware:
+    """Track in-flight requests and request durations until the response body has been sent.
+
+    A plain ASGI middleware rather than ``BaseHTTPMiddleware``, so streamed responses are timed to
+    their last chunk and are not buffered.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        await self._observe(scope, receive, send)
+
+    @inject
+    async def _observe(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        metrics: HttpMetrics = Provide[Container.http_metrics],
+    ) -> None:
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight.inc()
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.in_flight.dec()
+            # Route templates keep the label set bounded; unmatched paths share a single label
+            route = scope.get("route")
+            metrics.duration.observe(
+                perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status),
+            )
@@ -1,13 +1,84 @@
-from .dto import CsvNormalizationDTO, CsvSkippedRow
-from .exceptions import CsvFileError, CsvNormalizationError, InvalidRowError, MissingColumnError
+from .archive import AbstractCsvArchiveService
+from .dto import (
+    Compression,
+    CsvBulkFileResultDTO,
+    CsvBulkReportDTO,
+    CsvBulkStreamDTO,
+    CsvJobStatus,
+    CsvNormalizationDTO,
+    CsvNormalizationJobDTO,
+    CsvNormalizationStreamDTO,
+    CsvNormalizationSummaryDTO,
+    CsvSkippedRow,
+    CsvSkipReason,
+    CsvUploadSessionDTO,
+    DedupPolicy,
+    DeltaMode,
+    NormalizationCacheStatsDTO,
+    OutputFormat,
+    ParserEngine,
+)
+from .exceptions import (
+    CsvAdmissionError,
+    CsvAdmissionQueueFullError,
+    CsvAdmissionTimeoutError,
+    CsvDeltaBaseNotFoundError,
+    CsvFileError,
+    CsvJobNotFoundError,
+    CsvJobNotReadyError,
+    CsvJobQueueFullError,
+    CsvNormalizationError,
+    CsvUploadIncompleteError,
+    CsvUploadRangeError,
+    CsvUploadTooLargeError,
+    InvalidRowError,
+    MissingColumnError,
+    UnsupportedCompressionError,
+    UnsupportedOutputFormatError,
+)
+from .jobs import AbstractCsvJobManager
+from .normalizer import AbstractDataNormalizer, DateLayoutProfile, NormalizedColumn, RowFlag
 from .service import AbstractCSVService
 
 __all__ = [
     "AbstractCSVService",
+    "AbstractCsvArchiveService",
+    "AbstractCsvJobManager",
+    "AbstractDataNormalizer",
+    "Compression",
+    "CsvAdmissionError",
+    "CsvAdmissionQueueFullError",
+    "CsvAdmissionTimeoutError",
+    "CsvBulkFileResultDTO",
+    "CsvBulkReportDTO",
+    "CsvBulkStreamDTO",
+    "CsvDeltaBaseNotFoundError",
     "CsvFileError",
+    "CsvJobNotFoundError",
+    "CsvJobNotReadyError",
+    "CsvJobQueueFullError",
+    "CsvJobStatus",
     "CsvNormalizationDTO",
     "CsvNormalizationError",
+    "CsvNormalizationJobDTO",
+    "CsvNormalizationStreamDTO",
+    "CsvNormalizationSummaryDTO",
+    "CsvSkipReason",
     "CsvSkippedRow",
+    "CsvUploadIncompleteError",
+    "CsvUploadRangeError",
+    "CsvUploadSessionDTO",
+    "CsvUploadTooLargeError",
+    "DateLayoutProfile",
+    "DedupPolicy",
+    "DeltaMode",
     "InvalidRowError",
     "MissingColumnError",
+    "NormalizationCacheStatsDTO",
+    "NormalizedColumn",
+    "OutputFormat",
+    "ParserEngine",
+    "RowFlag",
+    "UnsupportedCompressionError",
+    "UnsupportedOutputFormatError",
 ]
@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+from starlette.datastructures import UploadFile
+
+from app.app_layer.interfaces.services.csv_normalization.dto import CsvBulkStreamDTO, DedupPolicy
+
+
+class AbstractCsvArchiveService(ABC):
+    @abstractmethod
+    async def stream(
+        self,
+        files: Sequence[UploadFile],
+        *,
+        country: str | None = None,
+        dedup: DedupPolicy | None = None,
+        confidence: bool = False,
+    ) -> CsvBulkStreamDTO: ...
@@ -1,4 +1,44 @@
-from pydantic import BaseModel, Field
+from collections.abc import AsyncIterator
+from datetime import datetime
+from enum import StrEnum
+from uuid import uuid4
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class OutputFormat(StrEnum):
+    CSV = "csv"
+    ARROW = "arrow"
+    PARQUET = "parquet"
+
+
+class Compression(StrEnum):
+    GZIP = "gzip"
+    ZSTD = "zstd"
+    BZIP2 = "bzip2"
+
+
+class DedupPolicy(StrEnum):
+    """Which row of a repeated id is kept."""
+
+    FIRST = "first"
+    LAST = "last"
+    # First row kept, duplicates with another phone or date of birth reported apart
+    CONFLICTS = "conflicts"
+
+
+class DeltaMode(StrEnum):
+    """What a delta normalization writes: every row, or only rows that are new or changed since its base."""
+
+    FULL = "full"
+    DIFF = "diff"
+
+
+class ParserEngine(StrEnum):
+    """What splits the lines of an upload into fields: the ``csv`` module, or pyarrow's multi-threaded parser."""
+
+    STDLIB = "stdlib"
+    PYARROW = "pyarrow"
 
 
 class CsvSkippedRow(BaseModel):
@@ -6,11 +46,104 @@ class CsvSkippedRow(BaseModel):
     reason: str
 
 
-class CsvNormalizationDTO(BaseModel):
+class CsvSkipReason(BaseModel):
+    reason: str
+    count: int
+    row_numbers: list[int] = Field([], description="First rows skipped for this reason, up to the sample size")
+
+
+class CsvNormalizationSummaryDTO(BaseModel):
     filename: str
+    processed_rows: int = 0
+    normalized_rows: int = 0
+    skipped_rows: int = 0
+    skipped: list[CsvSkipReason] = Field([], description="Skipped rows grouped by reason, most frequent first")
+    skip_report_id: str | None = Field(None, description="Report listing every skipped row, when one was requested")
+    unchanged_rows: int = Field(0, description="Rows of a delta normalization taken unchanged from its base")
+    delta_id: str | None = Field(None, description="Index a later delta normalization may use as its base")
+
+
+class CsvNormalizationDTO(CsvNormalizationSummaryDTO):
     content: bytes
     content_type: str = "text/csv"
-    processed_rows: int
-    normalized_rows: int
-    skipped_rows: int
-    skipped: list[CsvSkippedRow] = Field([], description="Skipped rows for any reason about data set")
+
+
+class CsvNormalizationStreamDTO(BaseModel):
+    """Normalized CSV produced lazily; ``summary`` is complete once ``content`` is exhausted."""
+
+    summary_id: str = Field(default_factory=lambda: uuid4().hex)
+    filename: str
+    content: AsyncIterator[bytes]
+    content_type: str = "text/csv"
+    summary: CsvNormalizationSummaryDTO
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+class NormalizationCacheStatsDTO(BaseModel):
+    max_entries: int
+    size: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class CsvJobStatus(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class CsvNormalizationJobDTO(CsvNormalizationSummaryDTO):
+    """Background normalization; row counts grow while the job is running."""
+
+    job_id: str
+    status: CsvJobStatus = CsvJobStatus.PENDING
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
+
+
+class CsvUploadSessionDTO(BaseModel):
+    """Progress of a chunked upload, normalized by job ``job_id`` while its bytes arrive."""
+
+    job_id: str
+    filename: str
+    size: int
+    received_bytes: int = 0
+    # First byte not yet received, where an interrupted upload resumes
+    next_offset: int = 0
+    # Inclusive byte ranges still missing, as in ``Content-Range``
+    missing_ranges: list[tuple[int, int]] = []
+    finalized: bool = False
+
+
+class CsvBulkFileResultDTO(CsvNormalizationSummaryDTO):
+    """Outcome of one file of an offline bulk normalization; ``filename`` is the output file name."""
+
+    source: str
+    target: str | None = None
+    seconds: float = 0.0
+    error: str | None = None
+
+
+class CsvBulkReportDTO(BaseModel):
+    files: list[CsvBulkFileResultDTO] = []
+    failed_files: int = 0
+    processed_rows: int = 0
+    normalized_rows: int = 0
+    skipped_rows: int = 0
+    seconds: float = 0.0
+    rows_per_second: float = 0.0
+
+
+class CsvBulkStreamDTO(BaseModel):
+    """Zip of normalized CSVs produced lazily; ``report`` is complete once ``content`` is exhausted."""
+
+    filename: str
+    content: AsyncIterator[bytes]
+    content_type: str = "application/zip"
+    report: CsvBulkReportDTO
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -15,6 +15,14 @@ class MissingColumnError(CsvNormalizationError):
         self.missing = tuple(missing)
 
 
+class UnsupportedOutputFormatError(CsvNormalizationError):
+    """Raised when an output format needs an optional dependency that is not installed."""
+
+
+class UnsupportedCompressionError(CsvNormalizationError):
+    """Raised when an upload is compressed with an unknown codec or one whose optional dependency is missing."""
+
+
 class InvalidRowError(CsvNormalizationError):
     """Raised when a row contains invalid data."""
 
@@ -22,3 +30,55 @@ class InvalidRowError(CsvNormalizationError):
         super().__init__(f"Row {row_number}: {message}")
         self.row_number = row_number
         self.message = message
+
+
+class CsvJobNotFoundError(CsvNormalizationError):
+    """Raised when a normalization job is unknown or has expired."""
+
+    def __init__(self, job_id: str) -> None:
+        super().__init__(f"Job {job_id} was not found")
+        self.job_id = job_id
+
+
+class CsvDeltaBaseNotFoundError(CsvNormalizationError):
+    """Raised when the base of a delta normalization is unknown or has expired."""
+
+    def __init__(self, delta_id: str) -> None:
+        super().__init__(f"Delta base {delta_id} was not found")
+        self.delta_id = delta_id
+
+
+class CsvJobNotReadyError(CsvNormalizationError):
+    """Raised when the result of an unfinished or failed job is requested."""
+
+
+class CsvJobQueueFullError(CsvNormalizationError):
+    """Raised when no more normalization jobs can be queued."""
+
+
+class CsvUploadRangeError(CsvNormalizationError):
+    """Raised when a chunk of an upload is outside its declared size or its session is closed."""
+
+
+class CsvUploadIncompleteError(CsvNormalizationError):
+    """Raised when an upload is finalized before all of its bytes were received."""
+
+
+class CsvUploadTooLargeError(CsvNormalizationError):
+    """Raised when a chunked upload declares more bytes than uploads may have."""
+
+
+class CsvAdmissionError(CsvNormalizationError):
+    """Raised when an upload is not admitted because the in-flight budget is used up."""
+
+    def __init__(self, message: str, *, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CsvAdmissionQueueFullError(CsvAdmissionError):
+    """Raised when too many uploads are already waiting for the in-flight budget."""
+
+
+class CsvAdmissionTimeoutError(CsvAdmissionError):
+    """Raised when an upload waited too long for the in-flight budget."""
@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from starlette.datastructures import UploadFile
+
+from app.app_layer.interfaces.services.csv_normalization.dto import CsvNormalizationJobDTO, CsvUploadSessionDTO
+
+
+class AbstractCsvJobManager(ABC):
+    @abstractmethod
+    async def submit(self, file: UploadFile) -> CsvNormalizationJobDTO: ...
+
+    @abstractmethod
+    async def create_upload(self, filename: str, size: int) -> CsvUploadSessionDTO: ...
+
+    @abstractmethod
+    async def write_upload(
+        self,
+        job_id: str,
+        first: int,
+        last: int,
+        chunks: AsyncIterator[bytes],
+    ) -> CsvUploadSessionDTO: ...
+
+    @abstractmethod
+    def get_upload(self, job_id: str) -> CsvUploadSessionDTO: ...
+
+    @abstractmethod
+    async def finalize_upload(self, job_id: str) -> CsvNormalizationJobDTO: ...
+
+    @abstractmethod
+    def get(self, job_id: str) -> CsvNormalizationJobDTO: ...
+
+    @abstractmethod
+    def result_path(self, job_id: str) -> Path: ...
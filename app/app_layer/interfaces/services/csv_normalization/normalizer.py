@@ -1,4 +1,36 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from enum import IntFlag
+from typing import NamedTuple
+
+
+class RowFlag(IntFlag):
+    """What a normalizer inferred instead of reading it from a value; a value without flags was exact."""
+
+    DOB_SWAPPED = 1
+    DOB_CENTURY_INFERRED = 2
+    PHONE_COUNTRY_DEFAULTED = 4
+
+
+class NormalizedColumn(NamedTuple):
+    """Normalized values of a column; failed positions hold ``None`` and their reason in ``errors``.
+
+    ``flags`` holds the inferences made for the normalized positions that needed any.
+    """
+
+    values: list[str | None]
+    errors: dict[int, str]
+    flags: dict[int, RowFlag]
+
+
+class DateLayoutProfile(NamedTuple):
+    """Date layouts detected in a file, most frequent first."""
+
+    layouts: tuple[str, ...] = ()
+
+    @property
+    def month_first(self) -> bool:
+        return "MM/DD/YYYY" in self.layouts
 
 
 class AbstractDataNormalizer(ABC):
@@ -8,6 +40,42 @@ class AbstractDataNormalizer(ABC):
     """Standardise a date-of-birth string to ISO ``YYYY-MM-DD``."""
 
     @abstractmethod
-    async def get_phone(self, phone: str | None) -> str: ...
+    async def get_phone(self, phone: str | None, country: str | None = None) -> str: ...
+
+    """Convert ``phone`` into E.164 format, reading local numbers in ``country`` or else ``default_country_code``."""
+
+    @abstractmethod
+    def detect_dob_layouts(self, sample: Sequence[str | None]) -> DateLayoutProfile: ...
+
+    """Detect the dominant date-of-birth layouts of a file from a sample of its values."""
+
+    @abstractmethod
+    def normalize_dobs(
+        self,
+        dobs: Sequence[str | None],
+        profile: DateLayoutProfile | None = None,
+    ) -> NormalizedColumn: ...
+
+    """Standardise a column of date-of-birth strings, collecting failures per index."""
+
+    @abstractmethod
+    def normalize_phones(
+        self,
+        phones: Sequence[str | None],
+        countries: Sequence[str | None] | str | None = None,
+    ) -> NormalizedColumn: ...
+
+    """Convert a column of phone values into E.164 format, collecting failures per index.
+
+    ``countries`` is one country hint for the whole column or one per value.
+    """
+
+    @abstractmethod
+    def has_phone_plan(self, country: str) -> bool: ...
+
+    """Whether ``country``, an ISO region or a calling code, has a known numbering plan."""
+
+    @abstractmethod
+    def warm_up(self) -> None: ...
 
-    """Convert ``phone`` into E.164 format, assuming ``default_country_code`` for local numbers."""
+    """Run sample values through the normalization paths, so that lazily built state exists before the first upload."""
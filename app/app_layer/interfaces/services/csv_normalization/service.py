@@ -2,9 +2,43 @@ from abc import ABC, abstractmethod
 
 from starlette.datastructures import UploadFile
 
-from app.app_layer.interfaces.services.csv_normalization.dto import CsvNormalizationDTO
+from app.app_layer.interfaces.services.csv_normalization.dto import (
+    CsvNormalizationDTO,
+    CsvNormalizationStreamDTO,
+    DedupPolicy,
+    DeltaMode,
+    OutputFormat,
+)
 
 
 class AbstractCSVService(ABC):
     @abstractmethod
-    async def process(self, file: UploadFile) -> CsvNormalizationDTO: ...
+    async def process(  # noqa: PLR0913
+        self,
+        file: UploadFile,
+        *,
+        skip_report: bool = False,
+        country: str | None = None,
+        output_format: OutputFormat = OutputFormat.CSV,
+        dedup: DedupPolicy | None = None,
+        confidence: bool = False,
+        delta: DeltaMode | None = None,
+        delta_base: str | None = None,
+    ) -> CsvNormalizationDTO: ...
+
+    @abstractmethod
+    async def stream(  # noqa: PLR0913
+        self,
+        file: UploadFile,
+        *,
+        skip_report: bool = False,
+        country: str | None = None,
+        output_format: OutputFormat = OutputFormat.CSV,
+        dedup: DedupPolicy | None = None,
+        confidence: bool = False,
+        delta: DeltaMode | None = None,
+        delta_base: str | None = None,
+    ) -> CsvNormalizationStreamDTO: ...
+
+    @abstractmethod
+    async def warm_up(self) -> None: ...
@@ -1,24 +1,143 @@
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from app.app_layer.interfaces.services.csv_normalization import (
+    AbstractCsvArchiveService,
+    AbstractCsvJobManager,
     AbstractCSVService,
+    AbstractDataNormalizer,
+    Compression,
+    CsvAdmissionError,
+    CsvAdmissionQueueFullError,
+    CsvAdmissionTimeoutError,
+    CsvBulkFileResultDTO,
+    CsvBulkReportDTO,
+    CsvBulkStreamDTO,
+    CsvDeltaBaseNotFoundError,
     CsvFileError,
+    CsvJobNotFoundError,
+    CsvJobNotReadyError,
+    CsvJobQueueFullError,
+    CsvJobStatus,
     CsvNormalizationDTO,
     CsvNormalizationError,
+    CsvNormalizationJobDTO,
+    CsvNormalizationStreamDTO,
+    CsvNormalizationSummaryDTO,
     CsvSkippedRow,
+    CsvSkipReason,
+    CsvUploadIncompleteError,
+    CsvUploadRangeError,
+    CsvUploadSessionDTO,
+    CsvUploadTooLargeError,
+    DateLayoutProfile,
+    DedupPolicy,
+    DeltaMode,
     InvalidRowError,
     MissingColumnError,
+    NormalizationCacheStatsDTO,
+    NormalizedColumn,
+    OutputFormat,
+    ParserEngine,
+    RowFlag,
+    UnsupportedCompressionError,
+    UnsupportedOutputFormatError,
 )
 
-from .normalizer import DataNormalizer
-from .service import CSVService
+if TYPE_CHECKING:
+    from .admission import CsvAdmissionController
+    from .archive import CsvArchiveService
+    from .cache import NormalizationCache
+    from .delta import CsvDeltaIndexStore
+    from .jobs import CsvJobManager
+    from .normalizer import DataNormalizer
+    from .numbering_plan import CountryPlan, NumberingPlans, load_numbering_plans
+    from .result_cache import CsvResultCache
+    from .service import CSVService
+    from .skip_report import CsvSkipReportStore, SkipReport
+    from .summaries import CsvSummaryStore
+
+# Implementations are imported on first access, so worker processes, which only need the batch
+# and normalizer modules, do not import the job, upload and web machinery on boot
+_LAZY_EXPORTS = {
+    "CSVService": ".service",
+    "CountryPlan": ".numbering_plan",
+    "CsvAdmissionController": ".admission",
+    "CsvArchiveService": ".archive",
+    "CsvDeltaIndexStore": ".delta",
+    "CsvJobManager": ".jobs",
+    "CsvResultCache": ".result_cache",
+    "CsvSkipReportStore": ".skip_report",
+    "CsvSummaryStore": ".summaries",
+    "DataNormalizer": ".normalizer",
+    "NormalizationCache": ".cache",
+    "NumberingPlans": ".numbering_plan",
+    "SkipReport": ".skip_report",
+    "load_numbering_plans": ".numbering_plan",
+}
 
 __all__ = [
     "AbstractCSVService",
+    "AbstractCsvArchiveService",
+    "AbstractCsvJobManager",
+    "AbstractDataNormalizer",
     "CSVService",
+    "Compression",
+    "CountryPlan",
+    "CsvAdmissionController",
+    "CsvAdmissionError",
+    "CsvAdmissionQueueFullError",
+    "CsvAdmissionTimeoutError",
+    "CsvArchiveService",
+    "CsvBulkFileResultDTO",
+    "CsvBulkReportDTO",
+    "CsvBulkStreamDTO",
+    "CsvDeltaBaseNotFoundError",
+    "CsvDeltaIndexStore",
     "CsvFileError",
+    "CsvJobManager",
+    "CsvJobNotFoundError",
+    "CsvJobNotReadyError",
+    "CsvJobQueueFullError",
+    "CsvJobStatus",
     "CsvNormalizationDTO",
     "CsvNormalizationError",
+    "CsvNormalizationJobDTO",
+    "CsvNormalizationStreamDTO",
+    "CsvNormalizationSummaryDTO",
+    "CsvResultCache",
+    "CsvSkipReason",
+    "CsvSkipReportStore",
     "CsvSkippedRow",
+    "CsvSummaryStore",
+    "CsvUploadIncompleteError",
+    "CsvUploadRangeError",
+    "CsvUploadSessionDTO",
+    "CsvUploadTooLargeError",
     "DataNormalizer",
+    "DateLayoutProfile",
+    "DedupPolicy",
+    "DeltaMode",
     "InvalidRowError",
     "MissingColumnError",
+    "NormalizationCache",
+    "NormalizationCacheStatsDTO",
+    "NormalizedColumn",
+    "NumberingPlans",
+    "OutputFormat",
+    "ParserEngine",
+    "RowFlag",
+    "SkipReport",
+    "UnsupportedCompressionError",
+    "UnsupportedOutputFormatError",
+    "load_numbering_plans",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
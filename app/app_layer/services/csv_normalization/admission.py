@@ -0,0 +1,147 @@
+from asyncio import CancelledError, Future, get_running_loop, wait_for
+from collections import deque
+from math import ceil
+from time import perf_counter
+
+from app.app_layer.interfaces.services.csv_normalization import (
+    CsvAdmissionQueueFullError,
+    CsvAdmissionTimeoutError,
+)
+from app.app_layer.services.csv_normalization.metrics import CsvNormalizationMetrics
+from app.configs.admission import AdmissionSettings
+from app.configs.base import settings
+
+
+class Admission:
+    """Share of the in-flight budget held by one upload until it is released."""
+
+    __slots__ = ("bytes", "released", "rows")
+
+    def __init__(self, size: int, rows: int) -> None:
+        self.bytes = size
+        self.rows = rows
+        self.released = False
+
+
+class CsvAdmissionController:
+    """Bound the upload bytes and rows the normalize endpoint handles at once.
+
+    Uploads are admitted in arrival order while the in-flight totals stay within budget, the others
+    wait in a queue. An upload larger than the whole budget is admitted once nothing else is in
+    flight, so it runs alone rather than never. Uploads are rejected when the queue is full or when
+    they waited for ``queue_timeout_seconds``, telling clients when to retry.
+    """
+
+    def __init__(
+        self,
+        *,
+        metrics: CsvNormalizationMetrics | None = None,
+        admission_settings: AdmissionSettings | None = None,
+    ) -> None:
+        admission_settings = admission_settings or settings.admission
+        self.metrics = metrics
+        self.max_in_flight_bytes = admission_settings.max_in_flight_bytes
+        self.max_in_flight_rows = admission_settings.max_in_flight_rows
+        self.estimated_row_bytes = admission_settings.estimated_row_bytes
+        self.max_queued_requests = admission_settings.max_queued_requests
+        self.queue_timeout = admission_settings.queue_timeout_seconds
+        self.retry_after = admission_settings.retry_after_seconds
+        self.in_flight = 0
+        self.in_flight_bytes = 0
+        self.in_flight_rows = 0
+        self._waiting: deque[tuple[Admission, Future[None]]] = deque()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiting)
+
+    async def acquire(self, size: int | None) -> Admission:
+        """Wait for budget for an upload of ``size`` bytes; an unknown size counts as the whole budget."""
+        size = self.max_in_flight_bytes if size is None else size
+        admission = Admission(size, ceil(size / self.estimated_row_bytes))
+        if not self._waiting and self._fits(admission):
+            self._take(admission)
+            self._observe_wait(0.0)
+            return admission
+
+        if len(self._waiting) >= self.max_queued_requests:
+            self._reject("queue_full")
+            raise CsvAdmissionQueueFullError(
+                "Too many uploads are waiting to be normalized, retry later",
+                retry_after=self.retry_after,
+            )
+
+        started = perf_counter()
+        waiter: Future[None] = get_running_loop().create_future()
+        entry = (admission, waiter)
+        self._waiting.append(entry)
+        self._observe()
+        try:
+            await wait_for(waiter, self.queue_timeout)
+        except (TimeoutError, CancelledError) as exc:
+            if waiter.done() and not waiter.cancelled():
+                # Admitted just as the wait ended, so the budget taken for it is handed back
+                self.release(admission)
+            elif entry in self._waiting:
+                self._waiting.remove(entry)
+                self._admit_waiting()
+            self._observe()
+            if isinstance(exc, CancelledError):
+                raise
+            self._reject("timeout")
+            raise CsvAdmissionTimeoutError(
+                "Uploads being normalized use up the in-flight budget, retry later",
+                retry_after=self.retry_after,
+            ) from exc
+
+        self._observe_wait(perf_counter() - started)
+        return admission
+
+    def release(self, admission: Admission) -> None:
+        """Return the budget of ``admission``; releasing twice is a no-op."""
+        if admission.released:
+            return
+        admission.released = True
+        self.in_flight -= 1
+        self.in_flight_bytes -= admission.bytes
+        self.in_flight_rows -= admission.rows
+        self._admit_waiting()
+        self._observe()
+
+    def _fits(self, admission: Admission) -> bool:
+        if not self.in_flight:
+            return True
+        return (
+            self.in_flight_bytes + admission.bytes <= self.max_in_flight_bytes
+            and self.in_flight_rows + admission.rows <= self.max_in_flight_rows
+        )
+
+    def _take(self, admission: Admission) -> None:
+        self.in_flight += 1
+        self.in_flight_bytes += admission.bytes
+        self.in_flight_rows += admission.rows
+        self._observe()
+
+    def _admit_waiting(self) -> None:
+        # Strictly in arrival order, so a large upload is not starved by smaller ones behind it
+        while self._waiting and self._fits(self._waiting[0][0]):
+            admission, waiter = self._waiting.popleft()
+            if waiter.done():
+                # Cancelled by a timeout whose handler has not run yet
+                continue
+            self._take(admission)
+            waiter.set_result(None)
+
+    def _observe(self) -> None:
+        if self.metrics is not None:
+            self.metrics.admission_queue_depth.set(len(self._waiting))
+            self.metrics.admission_in_flight_bytes.set(self.in_flight_bytes)
+            self.metrics.admission_in_flight_rows.set(self.in_flight_rows)
+
+    def _observe_wait(self, seconds: float) -> None:
+        if self.metrics is not None:
+            self.metrics.admission_wait.observe(seconds)
+
+    def _reject(self, reason: str) -> None:
+        if self.metrics is not None:
+            self.metrics.admission_rejections.inc(reason=reason)
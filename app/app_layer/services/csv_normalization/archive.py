@@ -0,0 +1,230 @@
+from asyncio import Semaphore, Task, create_task
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from functools import partial
+from pathlib import PurePosixPath
+from tempfile import SpooledTemporaryFile
+from time import localtime, perf_counter
+from typing import NamedTuple
+from zipfile import ZIP_DEFLATED, BadZipFile, ZipFile, ZipInfo
+
+from starlette.datastructures import UploadFile
+
+from app.app_layer.interfaces.services.csv_normalization import (
+    AbstractCsvArchiveService,
+    CsvBulkFileResultDTO,
+    CsvBulkReportDTO,
+    CsvBulkStreamDTO,
+    CsvFileError,
+    CsvNormalizationError,
+    CsvNormalizationStreamDTO,
+    DedupPolicy,
+)
+from app.app_layer.services.csv_normalization.bulk import add_totals
+from app.app_layer.services.csv_normalization.compression import strip_compression_suffix
+from app.app_layer.services.csv_normalization.service import CSVService
+from app.configs.base import settings
+from app.configs.data_normalizer import DataNormalizerSettings
+
+ZIP_MEDIA_TYPES = frozenset({"application/zip", "application/x-zip-compressed"})
+MANIFEST_NAME = "manifest.json"
+# Normalized CSVs stay in memory up to this size, larger ones are spooled to disk until their turn
+SPOOL_SIZE = 1024 * 1024
+
+Normalize = Callable[[UploadFile], Awaitable[CsvNormalizationStreamDTO]]
+
+
+class ArchiveMember(NamedTuple):
+    """CSV of a bulk upload, an uploaded file or a zip member, opened only once it is normalized."""
+
+    source: str
+    # Directory of the normalized CSV in the output archive, the zip member's own directory
+    target_dir: str
+    open: Callable[[], UploadFile]
+
+
+class _ZipSink:
+    """Write-only file a zip archive is written to; the bytes are taken out after every write."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        content = b"".join(self._chunks)
+        self._chunks.clear()
+        return content
+
+
+class CsvArchiveService(AbstractCsvArchiveService):
+    """Normalize the CSVs of one request, uploaded as separate files or one zip archive, into a zip.
+
+    Up to ``archive_concurrency`` CSVs are normalized at a time, zip members being read straight
+    from the uploaded archive. Their outputs are spooled until they are written to the response
+    archive in upload order, and a ``manifest.json`` with the outcome of every CSV closes it.
+    """
+
+    def __init__(self, service: CSVService, *, normalizer_settings: DataNormalizerSettings | None = None) -> None:
+        normalizer_settings = normalizer_settings or settings.normalizer
+        self.service = service
+        self.concurrency = normalizer_settings.archive_concurrency
+        self.chunk_size = normalizer_settings.stream_chunk_size
+
+    async def stream(
+        self,
+        files: Sequence[UploadFile],
+        *,
+        country: str | None = None,
+        dedup: DedupPolicy | None = None,
+        confidence: bool = False,
+    ) -> CsvBulkStreamDTO:
+        """List the CSVs of ``files`` and return the archive of their normalized outputs as a lazy byte stream.
+
+        A CSV that fails is reported in the manifest instead of failing the others. Uploads that are
+        broken archives, hold no CSV or would give two outputs the same name are rejected up front.
+        """
+        archives: list[ZipFile] = []
+        try:
+            members = _list_members(files, archives)
+        except BadZipFile as exc:
+            _close(archives)
+            raise CsvFileError("Uploaded archive is not a valid zip file") from exc
+        except CsvNormalizationError:
+            _close(archives)
+            raise
+
+        filename = "normalized.zip"
+        if len(files) == 1 and archives:
+            filename = f"normalized-{PurePosixPath(files[0].filename or 'contacts.zip').name}"
+
+        report = CsvBulkReportDTO()
+        normalize = partial(self.service.stream, country=country, dedup=dedup, confidence=confidence)
+        return CsvBulkStreamDTO(
+            filename=filename,
+            content=self._write_archive(members, archives, report, normalize),
+            report=report,
+        )
+
+    async def _write_archive(
+        self,
+        members: list[ArchiveMember],
+        archives: list[ZipFile],
+        report: CsvBulkReportDTO,
+        normalize: Normalize,
+    ) -> AsyncIterator[bytes]:
+        started = perf_counter()
+        slots = Semaphore(self.concurrency)
+        tasks: list[Task[tuple[CsvBulkFileResultDTO, SpooledTemporaryFile | None]]] = [
+            create_task(self._normalize_member(member, slots, normalize)) for member in members
+        ]
+        sink = _ZipSink()
+        try:
+            with ZipFile(sink, "w", compression=ZIP_DEFLATED) as target:  # type: ignore[call-overload]
+                for task in tasks:
+                    result, output = await task
+                    report.files.append(result)
+                    if output is None or result.target is None:
+                        continue
+                    with output, target.open(_member_info(result.target, output), "w") as entry:
+                        while chunk := output.read(self.chunk_size):
+                            entry.write(chunk)
+                            if content := sink.drain():
+                                yield content
+
+                report.seconds = perf_counter() - started
+                target.writestr(MANIFEST_NAME, add_totals(report).model_dump_json(indent=2))
+            yield sink.drain()
+        finally:
+            for task in tasks:
+                task.cancel()
+            _close(archives)
+
+    @staticmethod
+    async def _normalize_member(
+        member: ArchiveMember,
+        slots: Semaphore,
+        normalize: Normalize,
+    ) -> tuple[CsvBulkFileResultDTO, SpooledTemporaryFile | None]:
+        async with slots:
+            started = perf_counter()
+            output: SpooledTemporaryFile = SpooledTemporaryFile(max_size=SPOOL_SIZE)  # noqa: SIM115
+            upload = member.open()
+            try:
+                normalized = await normalize(upload)
+                async for chunk in normalized.content:
+                    output.write(chunk)
+            except (CsvNormalizationError, BadZipFile, OSError) as exc:
+                output.close()
+                result = CsvBulkFileResultDTO(source=member.source, filename=upload.filename or "", error=str(exc))
+                result.seconds = perf_counter() - started
+                return result, None
+            finally:
+                await upload.close()
+
+        target = str(PurePosixPath(member.target_dir, normalized.filename))
+        result = CsvBulkFileResultDTO(source=member.source, target=target, **normalized.summary.model_dump())
+        result.seconds = perf_counter() - started
+        output.seek(0)
+        return result, output
+
+
+def _list_members(files: Sequence[UploadFile], archives: list[ZipFile]) -> list[ArchiveMember]:
+    """List the CSVs of ``files``, opening every zip upload into ``archives``."""
+    members = []
+    for file in files:
+        if not _is_zip(file):
+            members.append(ArchiveMember(file.filename or "contacts.csv", "", lambda file=file: file))
+            continue
+
+        archive = ZipFile(file.file)
+        archives.append(archive)
+        for info in archive.infolist():
+            path = PurePosixPath(info.filename)
+            # Folders, macOS resource forks and other hidden files are not contact lists
+            if info.is_dir() or path.parts[0] == "__MACOSX" or path.name.startswith("."):
+                continue
+            if strip_compression_suffix(path.name).lower().endswith(".csv"):
+                target_dir = "" if path.parent == PurePosixPath() else str(path.parent)
+                members.append(ArchiveMember(info.filename, target_dir, partial(_open_member, archive, info)))
+
+    if not members:
+        raise CsvFileError("Uploaded archive holds no CSV files")
+
+    # Output names derive from input names, so equal names in one directory would overwrite each other
+    targets: dict[str, ArchiveMember] = {}
+    for member in members:
+        name = strip_compression_suffix(PurePosixPath(member.source).name).lower()
+        other = targets.setdefault(f"{member.target_dir}/{name}", member)
+        if other is not member:
+            raise CsvFileError(f"{other.source} and {member.source} would be written to the same output file")
+
+    return members
+
+
+def _open_member(archive: ZipFile, info: ZipInfo) -> UploadFile:
+    # The member is decompressed while it is read, its compression inside the member is told by its name
+    return UploadFile(file=archive.open(info), filename=PurePosixPath(info.filename).name, size=info.file_size)
+
+
+def _member_info(name: str, output: SpooledTemporaryFile) -> ZipInfo:
+    # Sized up front, so that only members that need them get zip64 records
+    info = ZipInfo(name, date_time=localtime()[:6])
+    info.compress_type = ZIP_DEFLATED
+    info.file_size = output.seek(0, 2)
+    output.seek(0)
+    return info
+
+
+def _is_zip(file: UploadFile) -> bool:
+    media_type = (file.content_type or "").split(";")[0].strip().lower()
+    return media_type in ZIP_MEDIA_TYPES or (file.filename or "").lower().endswith(".zip")
+
+
+def _close(archives: list[ZipFile]) -> None:
+    for archive in archives:
+        archive.close()
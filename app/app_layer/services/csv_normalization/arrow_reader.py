@@ -0,0 +1,136 @@
+from collections.abc import AsyncIterator, Sequence
+from csv import reader as csv_reader
+from io import BytesIO, StringIO
+from time import perf_counter
+
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+
+from app.app_layer.services.csv_normalization.dialect import CsvDialect
+from app.app_layer.services.csv_normalization.reader import IncrementalCsvReader, split_columns
+from app.configs.base import settings
+
+# Text carried over without a line break outside quotes, in blocks, before the rest of the upload
+# is left to ``csv.reader``, which does not need one
+_MAX_CARRIED_BLOCKS = 4
+
+
+class ArrowCsvReader(IncrementalCsvReader):
+    """Parse CSV rows with pyarrow's multi-threaded CSV parser, the ``pyarrow`` parser engine.
+
+    The header is read by ``csv.reader`` as in the ``stdlib`` engine. The rest of the decoded text
+    is gathered into blocks of about ``block_size`` characters, cut after the last line break
+    outside quotes, and pyarrow splits each block into columns in one call. A block pyarrow would
+    read differently from ``csv.reader``, with rows of another number of fields than the header or
+    a leading byte order mark, is parsed by ``csv.reader`` instead, so both engines yield the same
+    values.
+    """
+
+    def __init__(
+        self,
+        chunks: AsyncIterator[bytes],
+        *,
+        dialect: CsvDialect | None = None,
+        sniff_size: int = 16 * 1024,
+        block_size: int | None = None,
+    ) -> None:
+        super().__init__(chunks, dialect=dialect, sniff_size=sniff_size)
+        self.block_size = block_size or settings.normalizer.parser_block_size
+        self._blocks: list[str] = []
+        self._block_chars = 0
+        self._gathering = False
+
+    async def column_batches(self, indexes: Sequence[int]) -> AsyncIterator[list[list[str | None]]]:
+        fieldnames = await self.fieldnames()
+        names = [str(index) for index in range(len(fieldnames or ()))]
+        # Lines decoded along with the header are the start of the first block
+        self._gathering = True
+        self._push(self._feed.drain())
+        carried = ""
+
+        while True:
+            while not self._feed.exhausted and self._block_chars < self.block_size:
+                await self._fill()
+            exhausted = self._feed.exhausted
+            text = carried + "".join(self._blocks)
+            self._blocks.clear()
+            self._block_chars = 0
+
+            started = perf_counter()
+            cut = len(text) if exhausted else self._record_end(text)
+            carried = text[cut:]
+            columns = self._parse(text[:cut], names, indexes) if cut else None
+            self.parse_seconds += perf_counter() - started
+
+            if columns and columns[0]:
+                yield columns
+            if exhausted:
+                return
+            if len(carried) > _MAX_CARRIED_BLOCKS * self.block_size:
+                break
+
+        # Quotes do not pair up in the last blocks, so where their records end is left to ``csv.reader``
+        self._gathering = False
+        self._feed.extend(carried)
+        async for columns in super().column_batches(indexes):
+            yield columns
+
+    def _push(self, text: str) -> None:
+        if not self._gathering:
+            super()._push(text)
+            return
+        self._blocks.append(text)
+        self._block_chars += len(text)
+
+    def _record_end(self, text: str) -> int:
+        """Offset after the last line break of ``text`` that is outside quotes, 0 if there is none."""
+        quotechar = self.dialect.quotechar  # type: ignore[union-attr]
+        # One pass over the lines, adding up their quotes, so a stray quote costs no rescans
+        cut = start = quotes = 0
+        while (end := text.find("\n", start)) != -1:
+            quotes += text.count(quotechar, start, end)
+            start = end + 1
+            if not quotes % 2:
+                cut = start
+        return cut
+
+    def _parse(self, text: str, names: list[str], indexes: Sequence[int]) -> list[list[str | None]]:
+        dialect: CsvDialect = self.dialect  # type: ignore[assignment]
+        invalid_rows = 0
+
+        def skip_invalid(_row: object) -> str:
+            nonlocal invalid_rows
+            invalid_rows += 1
+            return "skip"
+
+        table = None
+        # pyarrow drops a byte order mark opening its input, csv.reader keeps it in the first field
+        if not text.startswith("\ufeff"):
+            try:
+                table = pa_csv.read_csv(
+                    BytesIO(text.encode("utf-8")),
+                    read_options=pa_csv.ReadOptions(column_names=names),
+                    parse_options=pa_csv.ParseOptions(
+                        delimiter=dialect.delimiter,
+                        quote_char=dialect.quotechar,
+                        newlines_in_values=True,
+                        invalid_row_handler=skip_invalid,
+                    ),
+                    convert_options=pa_csv.ConvertOptions(
+                        include_columns=[names[index] for index in indexes],
+                        column_types=dict.fromkeys(names, pa.string()),
+                        strings_can_be_null=False,
+                        quoted_strings_can_be_null=False,
+                    ),
+                )
+            except pa.ArrowInvalid:
+                table = None
+        if table is not None and not invalid_rows:
+            return [table.column(names[index]).to_pylist() for index in indexes]
+
+        rows = [
+            row
+            for row in csv_reader(StringIO(text, newline=""), delimiter=dialect.delimiter, quotechar=dialect.quotechar)
+            if row
+        ]
+        return split_columns(rows, indexes)
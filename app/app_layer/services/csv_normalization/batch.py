@@ -0,0 +1,182 @@
+from csv import writer as csv_writer
+from functools import cache
+from io import StringIO
+from time import perf_counter
+from typing import NamedTuple
+
+from app.app_layer.interfaces.services.csv_normalization import (
+    AbstractDataNormalizer,
+    DateLayoutProfile,
+    OutputFormat,
+    RowFlag,
+)
+
+OUTPUT_FIELDNAMES = ("id", "phone", "dob")
+CONFIDENCE_FIELDNAME = "confidence"
+# Confidence of a row the normalizer inferred nothing for
+EXACT_CONFIDENCE = "exact"
+# Dates the generic parser rejects without a message
+INVALID_DOB_REASON = "Date of birth value is not a valid date"
+
+# Normalizer of a worker process, set once by the pool initializer so batches are sent without it
+_worker_normalizer: AbstractDataNormalizer | None = None
+
+
+class SkippedRow(NamedTuple):
+    """A row left out of the output; the API only sees the aggregate of these, ``CsvSkipReason``."""
+
+    row_number: int
+    reason: str
+
+
+class RowBatch(NamedTuple):
+    """Consecutive CSV rows split into columns, starting at file line ``first_row_number``."""
+
+    first_row_number: int
+    ids: list[str | None]
+    phones: list[str | None]
+    dobs: list[str | None]
+    # Country of every phone number, from a country column or one hint for the whole upload
+    countries: list[str | None] | str | None = None
+
+
+class NormalizedColumns(NamedTuple):
+    """Values of the rows kept in a batch, one list per output column."""
+
+    ids: list[str]
+    phones: list[str]
+    dobs: list[str]
+    # File line of every kept row, for the stages that drop rows after normalization
+    row_numbers: list[int]
+    # Flags of every kept row, such as ``dob_swapped|phone_country_defaulted``, when asked for
+    confidence: list[str] | None = None
+
+
+class NormalizedBatch(NamedTuple):
+    # CSV text of the kept rows, empty for columnar output formats
+    content: str
+    processed_rows: int
+    skipped: list[SkippedRow]
+    # Seconds spent on the phone, dob and write stages, measured where the batch ran
+    stage_seconds: dict[str, float]
+    # Kept rows for columnar output formats, encoded where the output is written
+    columns: NormalizedColumns | None = None
+    # Rows of a delta normalization taken from its base instead of being normalized
+    unchanged_rows: int = 0
+
+
+def normalize_batch(  # noqa: PLR0913
+    normalizer: AbstractDataNormalizer,
+    batch: RowBatch,
+    dob_profile: DateLayoutProfile | None = None,
+    output_format: OutputFormat = OutputFormat.CSV,
+    *,
+    keep_columns: bool = False,
+    confidence: bool = False,
+) -> NormalizedBatch:
+    """Normalize a batch into CSV text without a header, or into columns for columnar output formats.
+
+    With ``keep_columns`` the columns are returned whatever the format, for a later stage to filter
+    and encode. With ``confidence`` every kept row also gets the flags of what the normalizer
+    inferred for it, from the same pass. Worker processes of the parallel path run it through
+    ``normalize_in_worker``.
+    """
+    started = perf_counter()
+    phones = normalizer.normalize_phones(batch.phones, batch.countries)
+    phones_done = perf_counter()
+    dobs = normalizer.normalize_dobs(batch.dobs, dob_profile)
+    dobs_done = perf_counter()
+
+    columns = NormalizedColumns(ids=[], phones=[], dobs=[], row_numbers=[], confidence=[] if confidence else None)
+    skipped: list[SkippedRow] = []
+
+    for offset, as_is_id in enumerate(batch.ids):
+        if not as_is_id:
+            skipped.append(SkippedRow(batch.first_row_number + offset, "ID value is missing"))
+            continue
+
+        reason = phones.errors.get(offset)
+        if reason is None:
+            reason = dobs.errors.get(offset)
+            if reason == "":
+                reason = INVALID_DOB_REASON
+        if reason is not None:
+            skipped.append(SkippedRow(batch.first_row_number + offset, reason))
+            continue
+
+        columns.ids.append(as_is_id)
+        columns.phones.append(phones.values[offset])  # type: ignore[arg-type]
+        columns.dobs.append(dobs.values[offset])  # type: ignore[arg-type]
+        columns.row_numbers.append(batch.first_row_number + offset)
+        if columns.confidence is not None:
+            columns.confidence.append(confidence_label(phones.flags.get(offset, 0) | dobs.flags.get(offset, 0)))
+
+    as_csv = output_format is OutputFormat.CSV and not keep_columns
+    content = format_csv(columns) if as_csv else ""
+
+    stage_seconds = {
+        "phone": phones_done - started,
+        "dob": dobs_done - phones_done,
+        "write": perf_counter() - dobs_done,
+    }
+    return NormalizedBatch(
+        content=content,
+        processed_rows=len(batch.ids),
+        skipped=skipped,
+        stage_seconds=stage_seconds,
+        columns=None if as_csv else columns,
+    )
+
+
+def init_worker(normalizer: AbstractDataNormalizer) -> None:
+    """Keep the normalizer of a worker process; the ``initializer`` of normalization process pools."""
+    global _worker_normalizer  # noqa: PLW0603
+    _worker_normalizer = normalizer
+
+
+def worker_normalizer() -> AbstractDataNormalizer:
+    if _worker_normalizer is None:
+        raise RuntimeError("Normalization pools need initializer=init_worker with the normalizer to use")
+    return _worker_normalizer
+
+
+def normalize_in_worker(
+    batch: RowBatch,
+    dob_profile: DateLayoutProfile | None,
+    output_format: OutputFormat,
+    *,
+    keep_columns: bool = False,
+    confidence: bool = False,
+) -> NormalizedBatch:
+    """Run ``normalize_batch`` with the normalizer ``init_worker`` kept in this process."""
+    return normalize_batch(
+        worker_normalizer(),
+        batch,
+        dob_profile,
+        output_format,
+        keep_columns=keep_columns,
+        confidence=confidence,
+    )
+
+
+def warm_up_worker() -> None:
+    worker_normalizer().warm_up()
+
+
+def format_csv(columns: NormalizedColumns) -> str:
+    """Write the kept rows as ``;`` separated CSV lines without a header."""
+    buffer = StringIO()
+    rows = (
+        zip(columns.ids, columns.phones, columns.dobs, strict=True)
+        if columns.confidence is None
+        else zip(columns.ids, columns.phones, columns.dobs, columns.confidence, strict=True)
+    )
+    csv_writer(buffer, delimiter=";", lineterminator="\n").writerows(rows)
+    return buffer.getvalue()
+
+
+@cache
+def confidence_label(flags: int) -> str:
+    """Name the flags of a row, ``exact`` for none; a handful of combinations, so each is built once."""
+    names = [str(flag.name).lower() for flag in RowFlag if flag & flags]
+    return "|".join(names) or EXACT_CONFIDENCE
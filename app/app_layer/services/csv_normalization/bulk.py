@@ -0,0 +1,210 @@
+from asyncio import run
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import cache
+import mmap
+from multiprocessing import get_context
+from os import fstat
+from pathlib import Path
+from time import perf_counter
+from typing import NamedTuple
+
+from starlette.datastructures import UploadFile
+
+from app.app_layer.interfaces.services.csv_normalization import (
+    CsvBulkFileResultDTO,
+    CsvBulkReportDTO,
+    CsvNormalizationError,
+)
+from app.app_layer.services.csv_normalization.batch import init_worker
+from app.app_layer.services.csv_normalization.cache import NormalizationCache
+from app.app_layer.services.csv_normalization.compression import strip_compression_suffix
+from app.app_layer.services.csv_normalization.normalizer import DataNormalizer
+from app.app_layer.services.csv_normalization.service import CSVService
+from app.configs.base import settings
+
+
+class BulkInput(NamedTuple):
+    """CSV file to normalize and the directory, relative to the output directory, its result goes to."""
+
+    source: Path
+    target_dir: Path
+
+
+class MappedUploadFile(UploadFile):
+    """Upload backed by a memory map: chunks are page cache slices read without thread pool round trips."""
+
+    async def read(self, size: int = -1) -> bytes:
+        return self.file.read(size)
+
+    async def close(self) -> None:
+        self.file.close()
+
+
+def expand_inputs(inputs: Iterable[str], *, pattern: str = "*.csv") -> list[BulkInput]:
+    """Resolve files, directories and glob patterns into the CSV files they name.
+
+    Directories are searched recursively for ``pattern`` and their layout is kept under the output
+    directory; files and glob matches are written to the output directory itself.
+    """
+    resolved: dict[Path, BulkInput] = {}
+    for value in inputs:
+        path = Path(value)
+        if path.is_dir():
+            matches = [
+                BulkInput(source, source.parent.relative_to(path))
+                for source in sorted(path.rglob(pattern))
+                if source.is_file()
+            ]
+        elif path.is_file():
+            matches = [BulkInput(path, Path())]
+        else:
+            base = Path(path.anchor) if path.is_absolute() else Path()
+            matches = [
+                BulkInput(match, Path()) for match in sorted(base.glob(str(path.relative_to(base)))) if match.is_file()
+            ]
+
+        if not matches:
+            raise ValueError(f"No CSV files found for {value}")
+        for match in matches:
+            resolved.setdefault(match.source.resolve(), match)
+
+    # Output names derive from input names, so equal names in one target directory would overwrite each other
+    targets: dict[Path, Path] = {}
+    for source, target_dir in resolved.values():
+        other = targets.setdefault(target_dir / strip_compression_suffix(source.name).lower(), source)
+        if other != source:
+            raise ValueError(f"{other} and {source} would be written to the same output file")
+
+    return list(resolved.values())
+
+
+@contextmanager
+def open_upload(path: Path) -> Iterator[UploadFile]:
+    """Open a local CSV as an upload, memory-mapped unless the file cannot be mapped, e.g. when empty."""
+    with path.open("rb") as source:
+        size = fstat(source.fileno()).st_size
+        try:
+            mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            yield UploadFile(file=source, filename=path.name, size=size)
+            return
+
+        with mapped:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            yield MappedUploadFile(file=mapped, filename=path.name, size=size)  # type: ignore[arg-type]
+
+
+async def normalize_file(
+    service: CSVService,
+    bulk_input: BulkInput,
+    output_dir: Path,
+    *,
+    country: str | None = None,
+) -> CsvBulkFileResultDTO:
+    """Stream one CSV from disk to disk; the output only appears under its final name once complete."""
+    started = perf_counter()
+    result = CsvBulkFileResultDTO(source=str(bulk_input.source), filename=bulk_input.source.name)
+    target_dir = output_dir / bulk_input.target_dir
+
+    try:
+        with open_upload(bulk_input.source) as upload:
+            normalized = await service.stream(upload, country=country)
+            target = target_dir / normalized.filename
+            partial = target.with_name(f"{target.name}.part")
+            target_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                with partial.open("wb") as output:
+                    async for chunk in normalized.content:
+                        output.write(chunk)
+                partial.replace(target)
+            finally:
+                partial.unlink(missing_ok=True)
+    except (CsvNormalizationError, OSError) as exc:
+        result.error = str(exc)
+    else:
+        result = CsvBulkFileResultDTO(source=result.source, target=str(target), **normalized.summary.model_dump())
+
+    result.seconds = perf_counter() - started
+    return result
+
+
+@cache
+def _worker_service() -> CSVService:
+    # One service per worker process, so its cache serves every file the worker is given
+    return CSVService(DataNormalizer(cache=NormalizationCache()))
+
+
+def _normalize_in_worker(bulk_input: BulkInput, output_dir: Path, country: str | None) -> CsvBulkFileResultDTO:
+    return run(normalize_file(_worker_service(), bulk_input, output_dir, country=country))
+
+
+def normalize_files(
+    inputs: list[BulkInput],
+    output_dir: Path,
+    *,
+    country: str | None = None,
+    workers: int | None = None,
+    on_result: Callable[[CsvBulkFileResultDTO], None] | None = None,
+) -> CsvBulkReportDTO:
+    """Normalize local CSV files using every core, calling ``on_result`` as each file finishes.
+
+    With at least as many files as workers each worker process normalizes whole files, largest
+    first; fewer files are normalized one at a time with their batches spread over the workers.
+    """
+    workers = workers or settings.normalizer.parallel_worker_count
+    started = perf_counter()
+    results: dict[BulkInput, CsvBulkFileResultDTO] = {}
+
+    def finish(bulk_input: BulkInput, result: CsvBulkFileResultDTO) -> None:
+        results[bulk_input] = result
+        if on_result is not None:
+            on_result(result)
+
+    normalizer = DataNormalizer(cache=NormalizationCache())
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_context("spawn"),
+        initializer=init_worker,
+        initargs=(normalizer,),
+    ) as executor:
+        if len(inputs) >= workers > 1:
+            _normalize_per_file(executor, inputs, output_dir, country, finish)
+        else:
+            service = CSVService(normalizer, executor=executor if workers > 1 else None)
+            for bulk_input in inputs:
+                finish(bulk_input, run(normalize_file(service, bulk_input, output_dir, country=country)))
+
+    report = CsvBulkReportDTO(files=[results[bulk_input] for bulk_input in inputs], seconds=perf_counter() - started)
+    return add_totals(report)
+
+
+def add_totals(report: CsvBulkReportDTO) -> CsvBulkReportDTO:
+    """Total the row counts and failures of the files of ``report`` into the report itself."""
+    for result in report.files:
+        report.failed_files += result.error is not None
+        report.processed_rows += result.processed_rows
+        report.normalized_rows += result.normalized_rows
+        report.skipped_rows += result.skipped_rows
+    if report.seconds > 0:
+        report.rows_per_second = report.processed_rows / report.seconds
+    return report
+
+
+def _normalize_per_file(
+    executor: Executor,
+    inputs: list[BulkInput],
+    output_dir: Path,
+    country: str | None,
+    finish: Callable[[BulkInput, CsvBulkFileResultDTO], None],
+) -> None:
+    # Largest files first, so that a big file picked up last does not keep one worker busy alone
+    largest_first = sorted(inputs, key=lambda bulk_input: bulk_input.source.stat().st_size, reverse=True)
+    futures = {
+        executor.submit(_normalize_in_worker, bulk_input, output_dir, country): bulk_input
+        for bulk_input in largest_first
+    }
+    for future in as_completed(futures):
+        finish(futures[future], future.result())
@@ -0,0 +1,59 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+from functools import cache
+
+from app.app_layer.interfaces.services.csv_normalization import NormalizationCacheStatsDTO, RowFlag
+from app.configs.base import settings
+
+# Normalized value and failure reason, exactly one of them is set, and the inferences behind the value
+CacheEntry = tuple[str | None, str | None, RowFlag]
+
+
+class NormalizationCache:
+    """Bounded LRU cache of normalization outcomes, failures included."""
+
+    def __init__(self, *, max_entries: int | None = None) -> None:
+        self.max_entries = settings.normalizer.cache_size if max_entries is None else max_entries
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: Hashable, entry: CacheEntry) -> None:
+        if not self.max_entries:
+            return
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    @property
+    def stats(self) -> NormalizationCacheStatsDTO:
+        return NormalizationCacheStatsDTO(
+            max_entries=self.max_entries,
+            size=len(self._entries),
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+        )
+
+
+@cache
+def process_cache(max_entries: int) -> NormalizationCache:
+    """Return the cache shared by normalizers unpickled in this worker process."""
+    return NormalizationCache(max_entries=max_entries)
@@ -0,0 +1,175 @@
+import bz2
+from collections.abc import AsyncIterator, Callable, Iterator, Mapping
+from importlib import import_module
+from pathlib import PurePath
+from types import ModuleType
+from typing import Any
+import zlib
+
+from app.app_layer.interfaces.services.csv_normalization import (
+    Compression,
+    CsvFileError,
+    UnsupportedCompressionError,
+)
+
+# Tokens of the ``Content-Encoding`` header, media types and file suffixes naming each codec
+CONTENT_ENCODINGS = {
+    "gzip": Compression.GZIP,
+    "x-gzip": Compression.GZIP,
+    "zstd": Compression.ZSTD,
+    "bzip2": Compression.BZIP2,
+    "x-bzip2": Compression.BZIP2,
+}
+MEDIA_TYPES = {
+    "application/gzip": Compression.GZIP,
+    "application/x-gzip": Compression.GZIP,
+    "application/zstd": Compression.ZSTD,
+    "application/x-bzip2": Compression.BZIP2,
+}
+SUFFIXES = {
+    ".gz": Compression.GZIP,
+    ".zst": Compression.ZSTD,
+    ".bz2": Compression.BZIP2,
+}
+
+_GZIP_WBITS = zlib.MAX_WBITS | 16
+
+
+def detect_compression(filename: str | None, headers: Mapping[str, str]) -> Compression | None:
+    """Tell the codec of an upload from its ``Content-Encoding``, its media type or its file suffix."""
+    encoding = headers.get("content-encoding", "").strip().lower()
+    if encoding and encoding != "identity":
+        compression = CONTENT_ENCODINGS.get(encoding)
+        if compression is None:
+            raise UnsupportedCompressionError(f"Unsupported content encoding: {encoding}")
+        return compression
+
+    media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    return MEDIA_TYPES.get(media_type) or SUFFIXES.get(PurePath(filename or "").suffix.lower())
+
+
+def strip_compression_suffix(filename: str) -> str:
+    """Drop the codec suffix, so ``contacts.csv.gz`` is named after the CSV it holds."""
+    suffix = PurePath(filename).suffix
+    return filename.removesuffix(suffix) if suffix.lower() in SUFFIXES else filename
+
+
+class _GzipDecompressor:
+    """``zlib`` decompressor exposing the ``eof``, ``needs_input`` and ``unused_data`` of the bz2 and zstd ones."""
+
+    def __init__(self) -> None:
+        self._decompressor = zlib.decompressobj(wbits=_GZIP_WBITS)
+        self.needs_input = True
+
+    @property
+    def eof(self) -> bool:
+        return self._decompressor.eof
+
+    @property
+    def unused_data(self) -> bytes:
+        return self._decompressor.unused_data
+
+    def decompress(self, data: bytes, max_length: int) -> bytes:
+        output = self._decompressor.decompress(self._decompressor.unconsumed_tail + data, max_length)
+        self.needs_input = not self._decompressor.unconsumed_tail and len(output) < max_length
+        return output
+
+
+class StreamDecompressor:
+    """Inflate a compressed stream piece by piece, never producing more than ``max_chunk_size`` bytes at once.
+
+    Output is bounded whatever the compression ratio, so a small upload cannot expand into memory as
+    a whole. Concatenated members or frames, as written by ``cat a.gz b.gz``, are read one after another.
+    """
+
+    def __init__(self, compression: Compression, *, max_chunk_size: int) -> None:
+        self.compression = compression
+        self.max_chunk_size = max_chunk_size
+        self._factory, self._errors = _decompressor_factory(compression)
+        self._decompressor = self._factory()
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        while True:
+            if self._decompressor.eof:
+                if not data:
+                    return
+                self._decompressor = self._factory()
+
+            try:
+                output = self._decompressor.decompress(data, self.max_chunk_size)
+            except self._errors as exc:
+                raise CsvFileError(f"Uploaded file is not valid {self.compression} data") from exc
+            data = self._decompressor.unused_data if self._decompressor.eof else b""
+            if output:
+                yield output
+            if not data and not self._decompressor.eof and self._decompressor.needs_input:
+                return
+
+    def finish(self) -> None:
+        if not self._decompressor.eof:
+            raise CsvFileError(f"Uploaded {self.compression} data is truncated")
+
+
+async def decompress_chunks(
+    chunks: AsyncIterator[bytes],
+    compression: Compression,
+    *,
+    max_chunk_size: int,
+) -> AsyncIterator[bytes]:
+    decompressor = StreamDecompressor(compression, max_chunk_size=max_chunk_size)
+    async for chunk in chunks:
+        for output in decompressor.decompress(chunk):
+            yield output
+    decompressor.finish()
+
+
+class StreamCompressor:
+    """Compress a body chunk by chunk, flushing every chunk so that clients can decode it as it arrives."""
+
+    def __init__(self, compression: Compression, *, level: int | None = None) -> None:
+        self.compression = compression
+        if compression is Compression.GZIP:
+            self._compressor: Any = zlib.compressobj(-1 if level is None else level, zlib.DEFLATED, _GZIP_WBITS)
+        elif compression is Compression.ZSTD:
+            self._zstd = _import_zstd()
+            self._compressor = self._zstd.ZstdCompressor(level)
+        else:
+            self._compressor = bz2.BZ2Compressor(9 if level is None else level)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.compression is Compression.GZIP:
+            return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        if self.compression is Compression.ZSTD:
+            return self._compressor.compress(data, self._zstd.ZstdCompressor.FLUSH_BLOCK)
+        # bzip2 cannot flush mid-stream, its blocks are emitted once full
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def zstd_available() -> bool:
+    try:
+        _import_zstd()
+    except UnsupportedCompressionError:
+        return False
+    return True
+
+
+def _decompressor_factory(compression: Compression) -> tuple[Callable[[], Any], tuple[type[Exception], ...]]:
+    if compression is Compression.GZIP:
+        return _GzipDecompressor, (zlib.error,)
+    if compression is Compression.ZSTD:
+        zstd = _import_zstd()
+        return zstd.ZstdDecompressor, (zstd.ZstdError,)
+    return bz2.BZ2Decompressor, (OSError, EOFError)
+
+
+def _import_zstd() -> ModuleType:
+    # zstd is in the standard library from Python 3.14 on, earlier versions need the optional backport
+    for name in ("compression.zstd", "backports.zstd"):
+        try:
+            return import_module(name)
+        except ImportError:
+            continue
+    raise UnsupportedCompressionError("zstd compression needs backports.zstd, install the 'zstd' extra")
@@ -0,0 +1,126 @@
+from calendar import isleap
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from datetime import MAXYEAR, MINYEAR
+from re import Pattern, compile as compile_pattern
+from typing import NamedTuple
+
+from app.app_layer.interfaces.services.csv_normalization.normalizer import DateLayoutProfile
+
+_SEPARATOR = r"[\s,._/:;-]+"
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+DAY_FIRST = "DD/MM/YYYY"
+MONTH_FIRST = "MM/DD/YYYY"
+
+
+class DateLayout(NamedTuple):
+    """Date shape parsed by a single regex match, without the generic tokenization.
+
+    ``year_first`` restricts eight-digit layouts to the reading the generic parser would choose.
+    """
+
+    name: str
+    pattern: Pattern[str]
+    year_first: bool | None = None
+
+    @property
+    def positions(self) -> tuple[int, int, int]:
+        """Indexes of year, month and day in ``match.groups()``."""
+        index = self.pattern.groupindex
+        return index["year"] - 1, index["month"] - 1, index["day"] - 1
+
+
+_LAYOUTS = (
+    DateLayout(DAY_FIRST, compile_pattern(r"(?P<day>\d{1,2})([./_ -])(?P<month>\d{1,2})\2(?P<year>\d{4}|\d{2})")),
+    DateLayout(MONTH_FIRST, compile_pattern(r"(?P<month>\d{1,2})([./_ -])(?P<day>\d{1,2})\2(?P<year>\d{4}|\d{2})")),
+    DateLayout("YYYY/MM/DD", compile_pattern(r"(?P<year>[1-9]\d{3})([./_ -])(?P<month>\d{1,2})\2(?P<day>\d{1,2})")),
+    DateLayout("YYYYMMDD", compile_pattern(r"(?P<year>\d{4})(?P<month>\d{2})(?P<day>\d{2})"), year_first=True),
+    DateLayout("DDMMYYYY", compile_pattern(r"(?P<day>\d{2})(?P<month>\d{2})(?P<year>\d{4})"), year_first=False),
+    DateLayout("DDMMYY", compile_pattern(r"(?P<day>\d{2})(?P<month>\d{2})(?P<year>\d{2})")),
+    DateLayout(
+        "D Mon YYYY",
+        compile_pattern(rf"(?P<day>\d{{1,2}}){_SEPARATOR}(?P<month>[^\W\d_]+){_SEPARATOR}(?P<year>\d{{4}}|\d{{2}})"),
+    ),
+    DateLayout(
+        "Mon D YYYY",
+        compile_pattern(rf"(?P<month>[^\W\d_]+){_SEPARATOR}(?P<day>\d{{1,2}}){_SEPARATOR}(?P<year>\d{{4}}|\d{{2}})"),
+    ),
+    DateLayout(
+        "YYYY Mon D",
+        compile_pattern(rf"(?P<year>[1-9]\d{{3}}){_SEPARATOR}(?P<month>[^\W\d_]+){_SEPARATOR}(?P<day>\d{{1,2}})"),
+    ),
+)
+DATE_LAYOUTS: Mapping[str, DateLayout] = {layout.name: layout for layout in _LAYOUTS}
+
+
+def detect_layouts(sample: Sequence[str | None], *, base_year: int, min_share: float) -> DateLayoutProfile:
+    """Pick the layouts covering at least ``min_share`` of ``sample``, most frequent first.
+
+    Numeric dates with the year last are read day first unless the sample only ever shows a month
+    above 12 in the second position, which makes every ambiguous value of the file month first.
+    """
+    counts: Counter[str] = Counter()
+    day_first_evidence = month_first_evidence = 0
+
+    for value in sample:
+        raw = "" if value is None else str(value).strip()
+        for layout in _LAYOUTS:
+            if layout.name == MONTH_FIRST:
+                continue
+            match = layout.pattern.fullmatch(raw)
+            if match is None or (
+                layout.year_first is not None and (int(raw[:4]) >= base_year) is not layout.year_first
+            ):
+                continue
+            counts[layout.name] += 1
+            if layout.name == DAY_FIRST:
+                day_first_evidence += int(match["day"]) > 12
+                month_first_evidence += int(match["month"]) > 12
+            break
+
+    threshold = max(1, min_share * len(sample))
+    names = [name for name, count in counts.most_common() if count >= threshold]
+    if month_first_evidence and not day_first_evidence:
+        names = [MONTH_FIRST if name == DAY_FIRST else name for name in names]
+
+    return DateLayoutProfile(layouts=tuple(names))
+
+
+class LayoutParser:
+    """Callable bound to one layout, keeping per-value work to a regex match and three ``int`` calls."""
+
+    __slots__ = ("base_year", "day", "match", "month", "month_map", "year", "year_first")
+
+    def __init__(self, layout: DateLayout, month_map: Mapping[str, int], base_year: int) -> None:
+        self.match = layout.pattern.fullmatch
+        self.year, self.month, self.day = layout.positions
+        self.year_first = layout.year_first
+        self.month_map = month_map
+        self.base_year = base_year
+
+    def __call__(self, raw: str) -> tuple[int, int, int] | None:
+        match = self.match(raw)
+        if match is None:
+            return None
+        if self.year_first is not None and (int(raw[:4]) >= self.base_year) is not self.year_first:
+            return None
+
+        groups = match.groups()
+        month_token = groups[self.month]
+        if month_token.isdigit():
+            month = int(month_token)
+        else:
+            month = self.month_map.get(month_token.lower())
+            if month is None:
+                return None
+
+        return int(groups[self.year]), month, int(groups[self.day])
+
+
+def is_valid_date(year: int, month: int, day: int) -> bool:
+    if not (MINYEAR <= year <= MAXYEAR and 1 <= month <= 12 and day >= 1):
+        return False
+    if month == 2 and isleap(year):
+        return day <= 29
+    return day <= _DAYS_IN_MONTH[month]
@@ -0,0 +1,277 @@
+from array import array
+from collections import deque
+from contextlib import suppress
+from hashlib import blake2b
+from pathlib import Path
+from re import compile as compile_pattern
+from time import time
+from typing import NamedTuple
+from uuid import uuid4
+
+from app.app_layer.interfaces.services.csv_normalization import (
+    CsvDeltaBaseNotFoundError,
+    CsvNormalizationError,
+    DeltaMode,
+)
+from app.app_layer.services.csv_normalization.batch import NormalizedBatch, NormalizedColumns, RowBatch, SkippedRow
+from app.app_layer.services.csv_normalization.dedup import IdHashIndex
+from app.app_layer.services.csv_normalization.normalizer import DataNormalizer
+from app.configs.base import settings
+
+# Part of every row digest; bump it when a change of the normalizer changes outputs of the same row
+DELTA_VERSION = 1
+
+_DELTA_ID_PATTERN = compile_pattern(r"[0-9a-f]{32}")
+
+
+class DeltaIndex:
+    """Normalized values of the rows of one normalization, by a 64-bit digest of their raw values.
+
+    A row's digest covers its id, phone, date of birth and country together with everything else
+    that shapes its output, so a row found again by digest normalizes to the stored values. Rows
+    are looked up through an ``IdHashIndex`` of digests, about 21 bytes each, next to their values.
+    """
+
+    def __init__(self, *, max_rows: int | None = None) -> None:
+        self.max_rows = max_rows or settings.normalizer.delta_max_rows
+        self.digests = array("Q")
+        # ``phone;dob`` of every row, followed by ``;confidence`` when it was asked for
+        self.values: list[str] = []
+        self._positions = IdHashIndex(max_entries=self.max_rows, with_values=True)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def get(self, digest: int) -> str | None:
+        position = self._positions.get(digest)
+        return None if position is None else self.values[position]
+
+    def add(self, digest: int, value: str) -> None:
+        if len(self.values) >= self.max_rows:
+            raise CsvNormalizationError(
+                f"More than {self.max_rows} rows to index for a delta normalization, raise normalizer.delta_max_rows",
+            )
+        if self._positions.insert(digest, len(self.values)) is None:
+            self.digests.append(digest)
+            self.values.append(value)
+
+    def dump(self, path: Path) -> None:
+        with path.open("wb") as file:
+            file.write(len(self).to_bytes(8, "little"))
+            self.digests.tofile(file)
+            file.write("\n".join(self.values).encode("utf-8"))
+
+    @classmethod
+    def load(cls, path: Path, *, max_rows: int | None = None) -> "DeltaIndex":
+        with path.open("rb") as file:
+            count = int.from_bytes(file.read(8), "little")
+            digests = array("Q")
+            digests.fromfile(file, count)
+            values = file.read().decode("utf-8").split("\n") if count else []
+
+        index = cls(max_rows=max(max_rows or settings.normalizer.delta_max_rows, count))
+        for digest, value in zip(digests, values, strict=True):
+            index.add(digest, value)
+        return index
+
+
+class CsvDeltaIndexStore:
+    """Delta indexes on local disk, removed once older than the TTL."""
+
+    def __init__(self, *, index_dir: Path | None = None, ttl_seconds: int | None = None) -> None:
+        self.index_dir = index_dir or settings.normalizer.delta_index_dir
+        self.ttl_seconds = settings.normalizer.delta_index_ttl_seconds if ttl_seconds is None else ttl_seconds
+
+    def create(self) -> tuple[str, Path]:
+        """Reserve an index id and the path its index is written to."""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.cleanup()
+        delta_id = uuid4().hex
+        return delta_id, self.index_dir / f"{delta_id}.index"
+
+    def load(self, delta_id: str) -> DeltaIndex:
+        """Read a finished index; unknown, expired and unfinished ones raise ``CsvDeltaBaseNotFoundError``."""
+        if not _DELTA_ID_PATTERN.fullmatch(delta_id):
+            raise CsvDeltaBaseNotFoundError(delta_id)
+        try:
+            return DeltaIndex.load(self.index_dir / f"{delta_id}.index")
+        except FileNotFoundError as exc:
+            raise CsvDeltaBaseNotFoundError(delta_id) from exc
+
+    @staticmethod
+    def save(index: DeltaIndex, path: Path) -> None:
+        partial = path.with_name(f"{path.name}.part")
+        index.dump(partial)
+        partial.replace(path)
+
+    def cleanup(self) -> None:
+        stale_before = time() - self.ttl_seconds
+        for path in self.index_dir.iterdir():
+            with suppress(FileNotFoundError):
+                if path.stat().st_mtime < stale_before:
+                    path.unlink()
+
+
+class _Split(NamedTuple):
+    """Rows of a batch, split into those passed on to the normalizer and those taken from the base."""
+
+    processed_rows: int
+    # File line and digest of every row passed on, by its offset in the batch passed on
+    row_numbers: list[int]
+    digests: list[int]
+    # Offsets of rows passed on although found in the base, which happens in the first batch only
+    known: set[int]
+    # File line, digest, id and stored values of every row taken from the base
+    unchanged: list[tuple[int, int, str, str]]
+
+
+class DeltaNormalization:
+    """Normalize only the rows that are new or changed since a base normalization.
+
+    ``split`` drops the rows found in the base from every batch before it is normalized, and
+    ``merge`` puts them back, with their stored values, once the batch comes back normalized in
+    the same order; with ``DIFF`` only the new and changed rows are written. Every written row is
+    recorded in ``index``, the base of the next delta normalization.
+
+    The first batch is always normalized whole, so the date layouts are detected from the same
+    sample as without a base. Those layouts are part of every digest, as are the normalizer settings.
+    """
+
+    def __init__(
+        self,
+        mode: DeltaMode,
+        base: DeltaIndex | None,
+        *,
+        normalizer: DataNormalizer,
+        confidence: bool = False,
+    ) -> None:
+        self.mode = mode
+        self.base = base
+        self.normalizer = normalizer
+        self.confidence = confidence
+        self.index = DeltaIndex()
+        self._key: bytes | None = None
+        self._splits: deque[_Split] = deque()
+
+    def split(self, batch: RowBatch) -> RowBatch:
+        first = self._key is None
+        if first:
+            profile = self.normalizer.detect_dob_layouts(batch.dobs)
+            options = (
+                DELTA_VERSION,
+                self.normalizer.phone_cache_namespace,
+                self.normalizer.dob_cache_namespace,
+                profile.layouts,
+                self.confidence,
+            )
+            self._key = blake2b(repr(options).encode()).digest()
+
+        countries = batch.countries if isinstance(batch.countries, list) else [batch.countries] * len(batch.ids)
+        changed = RowBatch(
+            first_row_number=0,
+            ids=[],
+            phones=[],
+            dobs=[],
+            countries=[] if isinstance(batch.countries, list) else batch.countries,
+        )
+        split = _Split(processed_rows=len(batch.ids), row_numbers=[], digests=[], known=set(), unchanged=[])
+        base = self.base
+
+        rows = zip(batch.ids, batch.phones, batch.dobs, countries, strict=True)
+        for row_number, (row_id, phone, dob, country) in enumerate(rows, start=batch.first_row_number):
+            digest = self._digest(row_id, phone, dob, country)
+            value = None if base is None else base.get(digest)
+            if value is not None and first:
+                split.known.add(len(changed.ids))
+            elif value is not None:
+                # Ids are part of the digest, so a row found in the base has one
+                split.unchanged.append((row_number, digest, row_id, value))  # type: ignore[arg-type]
+                continue
+            changed.ids.append(row_id)
+            changed.phones.append(phone)
+            changed.dobs.append(dob)
+            if isinstance(changed.countries, list):
+                changed.countries.append(country)
+            split.row_numbers.append(row_number)
+            split.digests.append(digest)
+
+        self._splits.append(split)
+        return changed
+
+    def merge(self, batch: NormalizedBatch) -> NormalizedBatch:
+        """Restore file lines and unchanged rows of ``batch``, normalized with ``keep_columns`` from ``split``."""
+        split = self._splits.popleft()
+        columns = batch.columns or NormalizedColumns(ids=[], phones=[], dobs=[], row_numbers=[])
+        row_numbers = split.row_numbers
+        skipped = [SkippedRow(row_numbers[item.row_number], item.reason) for item in batch.skipped]
+
+        changed = NormalizedColumns(
+            ids=[],
+            phones=[],
+            dobs=[],
+            row_numbers=[],
+            confidence=None if columns.confidence is None else [],
+        )
+        for position, offset in enumerate(columns.row_numbers):
+            value = f"{columns.phones[position]};{columns.dobs[position]}"
+            if columns.confidence is not None:
+                value = f"{value};{columns.confidence[position]}"
+            self.index.add(split.digests[offset], value)
+            if self.mode is DeltaMode.FULL or offset not in split.known:
+                self._append(changed, columns, position, row_numbers[offset])
+        for _, digest, _, value in split.unchanged:
+            self.index.add(digest, value)
+
+        merged = changed if self.mode is DeltaMode.DIFF else self._merge_unchanged(changed, split.unchanged)
+        return batch._replace(
+            processed_rows=split.processed_rows,
+            skipped=skipped,
+            columns=merged,
+            unchanged_rows=len(split.known) + len(split.unchanged),
+        )
+
+    def _merge_unchanged(
+        self,
+        changed: NormalizedColumns,
+        unchanged: list[tuple[int, int, str, str]],
+    ) -> NormalizedColumns:
+        """Interleave the normalized rows with the unchanged ones, both in file order."""
+        if not unchanged:
+            return changed
+
+        merged = NormalizedColumns(
+            ids=[],
+            phones=[],
+            dobs=[],
+            row_numbers=[],
+            confidence=[] if self.confidence else None,
+        )
+        position = 0
+        for row_number, _, row_id, value in unchanged:
+            while position < len(changed.row_numbers) and changed.row_numbers[position] < row_number:
+                self._append(merged, changed, position, changed.row_numbers[position])
+                position += 1
+            phone, dob, *confidence = value.split(";")
+            merged.ids.append(row_id)
+            merged.phones.append(phone)
+            merged.dobs.append(dob)
+            merged.row_numbers.append(row_number)
+            if merged.confidence is not None:
+                merged.confidence.append(confidence[0])
+        for rest in range(position, len(changed.row_numbers)):
+            self._append(merged, changed, rest, changed.row_numbers[rest])
+        return merged
+
+    @staticmethod
+    def _append(target: NormalizedColumns, columns: NormalizedColumns, position: int, row_number: int) -> None:
+        target.ids.append(columns.ids[position])
+        target.phones.append(columns.phones[position])
+        target.dobs.append(columns.dobs[position])
+        target.row_numbers.append(row_number)
+        if target.confidence is not None and columns.confidence is not None:
+            target.confidence.append(columns.confidence[position])
+
+    def _digest(self, *fields: str | None) -> int:
+        digest = blake2b(key=self._key or b"", digest_size=8)
+        digest.update("\x1f".join("\x00" if field is None else field for field in fields).encode("utf-8"))
+        return int.from_bytes(digest.digest(), "little")
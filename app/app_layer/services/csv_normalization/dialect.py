@@ -0,0 +1,96 @@
+from codecs import BOM_UTF8, BOM_UTF16_BE, BOM_UTF16_LE, BOM_UTF32_BE, BOM_UTF32_LE, getincrementaldecoder
+from csv import Error as CsvError, Sniffer, reader
+from typing import NamedTuple
+
+from app.app_layer.interfaces.services.csv_normalization import CsvNormalizationError
+
+# Tried in this order, so ties go to the semicolon the service always used
+DELIMITERS = (";", ",", "\t", "|")
+REQUIRED_COLUMNS = frozenset({"id", "phone", "dob"})
+ENCODING_LABELS = {
+    "utf-8": "UTF-8",
+    "utf-8-sig": "UTF-8",
+    "utf-16": "UTF-16",
+    "utf-16-le": "UTF-16",
+    "utf-16-be": "UTF-16",
+    "cp1252": "cp1252",
+}
+
+# Share of NUL bytes in one byte lane above which BOM-less text is taken for UTF-16
+_UTF16_NUL_SHARE = 0.3
+
+
+class CsvDialect(NamedTuple):
+    """How an upload is decoded and split into fields."""
+
+    encoding: str
+    delimiter: str
+    quotechar: str = '"'
+
+
+def sniff_dialect(sample: bytes, *, final: bool) -> CsvDialect:
+    """Choose the encoding, delimiter and quote character of a CSV from its first bytes.
+
+    ``final`` tells that ``sample`` is the whole file rather than a prefix possibly cut inside a
+    character.
+    """
+    encoding = sniff_encoding(sample, final=final)
+    text = sample.decode(encoding, errors="ignore")
+    # Only complete lines are sniffed, the last one may be cut short
+    if not final and "\n" in text:
+        text = text[: text.rfind("\n") + 1]
+    delimiter = _sniff_delimiter(text)
+    return CsvDialect(encoding=encoding, delimiter=delimiter, quotechar=_sniff_quotechar(text, delimiter))
+
+
+def sniff_encoding(sample: bytes, *, final: bool) -> str:
+    """Tell UTF-8, UTF-16 and cp1252 apart by byte order mark, NUL byte pattern and strict decoding."""
+    if sample.startswith((BOM_UTF32_LE, BOM_UTF32_BE)):
+        raise CsvNormalizationError("CSV must be encoded as UTF-8, UTF-16 or cp1252")
+    if sample.startswith(BOM_UTF8):
+        return "utf-8-sig"
+    if sample.startswith((BOM_UTF16_LE, BOM_UTF16_BE)):
+        return "utf-16"
+
+    if b"\x00" in sample:
+        half = len(sample) / 2
+        if sample[1::2].count(0) > half * _UTF16_NUL_SHARE:
+            return "utf-16-le"
+        if sample[0::2].count(0) > half * _UTF16_NUL_SHARE:
+            return "utf-16-be"
+
+    for encoding in ("utf-8", "cp1252"):
+        try:
+            # A prefix may end inside a multibyte character, only the complete ones have to decode
+            getincrementaldecoder(encoding)().decode(sample, final=final)
+        except UnicodeDecodeError:
+            continue
+        return encoding
+    raise CsvNormalizationError("CSV must be encoded as UTF-8, UTF-16 or cp1252")
+
+
+def _sniff_delimiter(text: str) -> str:
+    # The header names the required columns, so the right delimiter is the one that splits them apart
+    header = text.partition("\n")[0]
+    matches = {delimiter: _count_required_columns(header, delimiter) for delimiter in DELIMITERS}
+    best = max(DELIMITERS, key=lambda delimiter: matches[delimiter])
+    if matches[best]:
+        return best
+
+    try:
+        return Sniffer().sniff(text, delimiters="".join(DELIMITERS)).delimiter
+    except CsvError:
+        return DELIMITERS[0]
+
+
+def _count_required_columns(header: str, delimiter: str) -> int:
+    fields = next(reader([header], delimiter=delimiter), [])
+    return len(REQUIRED_COLUMNS & {field.strip().lower() for field in fields})
+
+
+def _sniff_quotechar(text: str, delimiter: str) -> str:
+    try:
+        dialect = Sniffer().sniff(text, delimiters=delimiter)
+    except CsvError:
+        return '"'
+    return dialect.quotechar or '"'
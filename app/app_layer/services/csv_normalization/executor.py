@@ -0,0 +1,34 @@
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from app.app_layer.services.csv_normalization.batch import init_worker
+from app.app_layer.services.csv_normalization.normalizer import DataNormalizer
+from app.app_layer.services.csv_normalization.service import CSVService
+from app.configs.base import settings
+
+
+def init_normalization_executor(
+    normalizer: DataNormalizer,
+    max_workers: int | None = None,
+) -> Iterator[ProcessPoolExecutor]:
+    """Provide the process pool used to normalize large uploads in parallel.
+
+    Workers are spawned rather than forked because the server process runs threads. Each one gets
+    ``normalizer`` once, when it starts, and is only sent batches afterwards.
+    """
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers or settings.normalizer.parallel_worker_count,
+        mp_context=get_context("spawn"),
+        initializer=init_worker,
+        initargs=(normalizer,),
+    )
+    try:
+        yield executor
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def warm_up_normalization(service: CSVService) -> None:
+    """Warm up the shared service while the application starts, before it accepts requests."""
+    await service.warm_up()
@@ -0,0 +1,287 @@
+from asyncio import CancelledError, Semaphore, Task, create_task, sleep
+from collections.abc import AsyncIterator, Callable
+from contextlib import suppress
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from logging import getLogger
+from pathlib import Path
+from time import monotonic, time
+from typing import BinaryIO
+from uuid import uuid4
+
+from starlette.datastructures import Headers, UploadFile
+
+from app.app_layer.interfaces.services.csv_normalization import (
+    CsvFileError,
+    CsvJobNotFoundError,
+    CsvJobNotReadyError,
+    CsvJobQueueFullError,
+    CsvJobStatus,
+    CsvNormalizationError,
+    CsvNormalizationJobDTO,
+    CsvUploadSessionDTO,
+    CsvUploadTooLargeError,
+    DedupPolicy,
+)
+from app.app_layer.interfaces.services.csv_normalization.jobs import AbstractCsvJobManager
+from app.app_layer.services.csv_normalization.service import CSVService
+from app.app_layer.services.csv_normalization.uploads import SessionUploadFile, UploadSession
+from app.configs.base import settings
+from app.configs.jobs import CsvJobSettings
+
+logger = getLogger(__name__)
+
+
+class CsvJobManager(AbstractCsvJobManager):
+    """Run normalizations in the background and keep their results on local disk for a while."""
+
+    def __init__(
+        self,
+        service_factory: Callable[[], CSVService],
+        *,
+        job_settings: CsvJobSettings | None = None,
+    ) -> None:
+        job_settings = job_settings or settings.jobs
+        self.service_factory = service_factory
+        self.results_dir = job_settings.results_dir
+        self.max_queued_jobs = job_settings.max_queued_jobs
+        self.result_ttl = timedelta(seconds=job_settings.result_ttl_seconds)
+        self.cleanup_interval = job_settings.cleanup_interval_seconds
+        self.upload_idle_timeout = job_settings.upload_idle_timeout_seconds
+        self.max_upload_bytes = job_settings.max_upload_bytes
+        self.upload_start_bytes = job_settings.upload_start_bytes
+        self._slots = Semaphore(job_settings.max_concurrent_jobs)
+        self._jobs: dict[str, CsvNormalizationJobDTO] = {}
+        self._sessions: dict[str, UploadSession] = {}
+        self._tasks: set[Task[None]] = set()
+        self._cleanup_task: Task[None] | None = None
+
+    async def start(self) -> None:
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        self._cleanup_task = create_task(self._cleanup_periodically())
+
+    async def stop(self) -> None:
+        tasks = [*self._tasks, *([self._cleanup_task] if self._cleanup_task else [])]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with suppress(CancelledError):
+                await task
+
+    async def submit(
+        self,
+        file: UploadFile,
+        *,
+        country: str | None = None,
+        dedup: DedupPolicy | None = None,
+        confidence: bool = False,
+    ) -> CsvNormalizationJobDTO:
+        """Copy the upload to disk and queue it; the job id is returned before normalization starts."""
+        self._check_queue()
+        job_id = uuid4().hex
+        upload_path = self._upload_path(job_id)
+        size = await self._copy_upload(file, upload_path)
+        if not size:
+            upload_path.unlink(missing_ok=True)
+            raise CsvFileError("Uploaded file is empty")
+
+        job = CsvNormalizationJobDTO(job_id=job_id, filename=file.filename or "", created_at=datetime.now(UTC))
+        # The original upload only lends its name and headers, which tell its compression
+        open_upload = partial(_open_copied_upload, filename=file.filename, size=size, headers=file.headers)
+        self._start(job, open_upload, country, dedup, confidence=confidence)
+        return job
+
+    async def create_upload(
+        self,
+        filename: str,
+        size: int,
+        *,
+        country: str | None = None,
+        dedup: DedupPolicy | None = None,
+        confidence: bool = False,
+    ) -> CsvUploadSessionDTO:
+        """Open a chunked upload of ``size`` bytes and queue its job right away.
+
+        The job takes a running slot once ``upload_start_bytes`` leading bytes, or the whole file,
+        arrived, so stalled uploads do not block other jobs. From then on it normalizes bytes as they
+        arrive, so transfer and normalization overlap.
+        """
+        if size <= 0:
+            raise CsvFileError("Uploaded file is empty")
+        if size > self.max_upload_bytes:
+            raise CsvUploadTooLargeError(f"Upload of {size} bytes is larger than the {self.max_upload_bytes} allowed")
+        self._check_queue()
+        job_id = uuid4().hex
+        session = UploadSession(job_id, self._upload_path(job_id), filename=filename, size=size)
+        self._sessions[job_id] = session
+
+        job = CsvNormalizationJobDTO(job_id=job_id, filename=filename, created_at=datetime.now(UTC))
+        self._start(job, partial(SessionUploadFile, session), country, dedup, confidence=confidence)
+        return session.to_dto()
+
+    async def write_upload(
+        self,
+        job_id: str,
+        first: int,
+        last: int,
+        chunks: AsyncIterator[bytes],
+    ) -> CsvUploadSessionDTO:
+        """Store bytes ``first`` to ``last`` of a chunked upload; resent ranges overwrite the same bytes."""
+        session = self._get_session(job_id)
+        await session.write(first, last, chunks)
+        return session.to_dto()
+
+    def get_upload(self, job_id: str) -> CsvUploadSessionDTO:
+        return self._get_session(job_id).to_dto()
+
+    async def finalize_upload(self, job_id: str) -> CsvNormalizationJobDTO:
+        """Confirm that every byte of a chunked upload arrived; the job may be done already by then."""
+        await self._get_session(job_id).finalize()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> CsvNormalizationJobDTO:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise CsvJobNotFoundError(job_id)
+        return job
+
+    def result_path(self, job_id: str) -> Path:
+        job = self.get(job_id)
+        if job.status is not CsvJobStatus.COMPLETED:
+            raise CsvJobNotReadyError(f"Job {job_id} is {job.status}")
+        return self._result_path(job_id)
+
+    def _check_queue(self) -> None:
+        queued = sum(job.status is CsvJobStatus.PENDING for job in self._jobs.values())
+        if queued >= self.max_queued_jobs:
+            raise CsvJobQueueFullError("Too many normalization jobs are queued, retry later")
+
+    def _start(
+        self,
+        job: CsvNormalizationJobDTO,
+        open_upload: Callable[[BinaryIO], UploadFile],
+        country: str | None,
+        dedup: DedupPolicy | None,
+        *,
+        confidence: bool,
+    ) -> None:
+        self._jobs[job.job_id] = job
+        task = create_task(self._run(job, open_upload, country, dedup, confidence=confidence))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _get_session(self, job_id: str) -> UploadSession:
+        session = self._sessions.get(job_id)
+        if session is None:
+            raise CsvJobNotFoundError(job_id)
+        return session
+
+    async def _run(
+        self,
+        job: CsvNormalizationJobDTO,
+        open_upload: Callable[[BinaryIO], UploadFile],
+        country: str | None,
+        dedup: DedupPolicy | None,
+        *,
+        confidence: bool,
+    ) -> None:
+        upload_path = self._upload_path(job.job_id)
+        session = self._sessions.get(job.job_id)
+        try:
+            if session is not None:
+                await session.wait_for(min(session.size, self.upload_start_bytes) - 1)
+            async with self._slots:
+                job.status = CsvJobStatus.RUNNING
+                with upload_path.open("rb") as source, self._result_path(job.job_id).open("wb") as target:
+                    result = await self.service_factory().stream(
+                        open_upload(source),
+                        skip_report=True,
+                        country=country,
+                        dedup=dedup,
+                        confidence=confidence,
+                    )
+                    job.filename = result.filename
+                    async for chunk in result.content:
+                        target.write(chunk)
+                        job.processed_rows = result.summary.processed_rows
+                        job.normalized_rows = result.summary.normalized_rows
+                        job.skipped_rows = result.summary.skipped_rows
+                    job.skipped = result.summary.skipped
+                    job.skip_report_id = result.summary.skip_report_id
+        except CsvNormalizationError as exc:
+            self._fail(job, str(exc))
+        except Exception:
+            logger.exception(f"CSV normalization job {job.job_id} failed")
+            self._fail(job, "Unexpected error during normalization")
+        else:
+            job.status = CsvJobStatus.COMPLETED
+        finally:
+            job.finished_at = datetime.now(UTC)
+            upload_path.unlink(missing_ok=True)
+            if session is not None:
+                await session.close(f"Job {job.job_id} is {job.status}")
+
+    def _fail(self, job: CsvNormalizationJobDTO, error: str) -> None:
+        job.status = CsvJobStatus.FAILED
+        job.error = error
+        self._result_path(job.job_id).unlink(missing_ok=True)
+
+    async def _cleanup_periodically(self) -> None:
+        while True:
+            await self.cleanup()
+            await sleep(self.cleanup_interval)
+
+    async def cleanup(self) -> None:
+        """Forget expired jobs and remove their result files, and other workers' leftovers older than the TTL.
+
+        Files of jobs this manager still knows are left alone, however old: a queued job only opens
+        its upload once it gets a slot.
+
+        Chunked uploads that received nothing for ``upload_idle_timeout`` are given up, failing their jobs.
+        """
+        idle_before = monotonic() - self.upload_idle_timeout
+        for session in list(self._sessions.values()):
+            if session.closed_reason is None and session.touched_at < idle_before:
+                await session.close("Upload received no bytes for too long")
+
+        expired_before = datetime.now(UTC) - self.result_ttl
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and job.finished_at < expired_before:
+                del self._jobs[job_id]
+                self._sessions.pop(job_id, None)
+                self._result_path(job_id).unlink(missing_ok=True)
+
+        stale_before = time() - self.result_ttl.total_seconds()
+        for path in self.results_dir.iterdir():
+            if path.suffix not in {".csv", ".upload"} or path.stem in self._jobs:
+                continue
+            with suppress(FileNotFoundError):
+                if path.stat().st_mtime < stale_before:
+                    path.unlink()
+
+    async def _copy_upload(self, file: UploadFile, path: Path) -> int:
+        size = 0
+        with path.open("wb") as target:
+            while chunk := await file.read(settings.normalizer.stream_chunk_size):
+                target.write(chunk)
+                size += len(chunk)
+        return size
+
+    def _upload_path(self, job_id: str) -> Path:
+        return self.results_dir / f"{job_id}.upload"
+
+    def _result_path(self, job_id: str) -> Path:
+        return self.results_dir / f"{job_id}.csv"
+
+
+def _open_copied_upload(source: BinaryIO, *, filename: str | None, size: int, headers: Headers) -> UploadFile:
+    return UploadFile(file=source, filename=filename, size=size, headers=headers)
+
+
+async def init_job_manager(service_factory: Callable[[], CSVService]) -> AsyncIterator[CsvJobManager]:
+    manager = CsvJobManager(service_factory)
+    await manager.start()
+    try:
+        yield manager
+    finally:
+        await manager.stop()
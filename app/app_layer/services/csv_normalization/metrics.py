@@ -0,0 +1,128 @@
+from collections import Counter
+from collections.abc import Sequence
+from time import perf_counter
+
+from app.app_layer.interfaces.services.csv_normalization import CsvNormalizationSummaryDTO
+from app.app_layer.services.csv_normalization.batch import SkippedRow
+from app.app_layer.services.metrics.http import DURATION_BUCKETS
+from app.app_layer.services.metrics.registry import MetricsRegistry
+
+STAGES = ("read", "parse", "phone", "dob", "write")
+
+UPLOAD_BYTES_BUCKETS = tuple(1024 * 4**power for power in range(11))  # 1 KiB .. 1 GiB
+ROWS_PER_SECOND_BUCKETS = (1_000, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000, 1_000_000)
+
+
+class NormalizationRun:
+    """Totals of one normalization, accumulated once per chunk or batch rather than per row.
+
+    Stages running in worker processes report CPU time summed over the workers, which can exceed
+    the wall time of the whole run.
+    """
+
+    __slots__ = ("stage_seconds", "started", "upload_bytes")
+
+    def __init__(self) -> None:
+        self.started = perf_counter()
+        self.stage_seconds = dict.fromkeys(STAGES, 0.0)
+        self.upload_bytes = 0
+
+    def add_stage_seconds(self, stage_seconds: dict[str, float]) -> None:
+        for stage, seconds in stage_seconds.items():
+            self.stage_seconds[stage] += seconds
+
+
+class CsvNormalizationMetrics:
+    """Throughput, stage timings and skip reasons of CSV normalizations, streamed and background alike."""
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        self.in_flight = registry.gauge(
+            "csv_normalizations_in_flight",
+            "CSV normalizations currently producing rows.",
+        )
+        self.normalizations = registry.counter(
+            "csv_normalizations_total",
+            "Finished CSV normalizations by outcome: completed, rejected, failed or cancelled.",
+            ("outcome",),
+        )
+        self.rows = registry.counter(
+            "csv_normalization_rows_total",
+            "CSV rows processed, by whether they were normalized or skipped.",
+            ("result",),
+        )
+        self.skipped_rows = registry.counter(
+            "csv_normalization_skipped_rows_total",
+            "Skipped CSV rows by reason.",
+            ("reason",),
+        )
+        self.duration = registry.histogram(
+            "csv_normalization_duration_seconds",
+            "Wall time of a CSV normalization, from reading the header to writing the last row.",
+            buckets=DURATION_BUCKETS,
+        )
+        self.stage_duration = registry.histogram(
+            "csv_normalization_stage_duration_seconds",
+            "Time a CSV normalization spent per stage: read, parse, phone, dob and write.",
+            ("stage",),
+            buckets=DURATION_BUCKETS,
+        )
+        self.upload_bytes = registry.histogram(
+            "csv_normalization_upload_bytes",
+            "Size of normalized CSV uploads.",
+            buckets=UPLOAD_BYTES_BUCKETS,
+        )
+        self.rows_per_second = registry.histogram(
+            "csv_normalization_rows_per_second",
+            "Rows processed per second of wall time by a completed CSV normalization.",
+            buckets=ROWS_PER_SECOND_BUCKETS,
+        )
+        self.admission_queue_depth = registry.gauge(
+            "csv_admission_queue_depth",
+            "Uploads waiting for the in-flight budget of the normalize endpoint.",
+        )
+        self.admission_in_flight_bytes = registry.gauge(
+            "csv_admission_in_flight_bytes",
+            "Upload bytes admitted by the normalize endpoint and not answered yet.",
+        )
+        self.admission_in_flight_rows = registry.gauge(
+            "csv_admission_in_flight_rows",
+            "Rows, estimated from upload sizes, admitted by the normalize endpoint and not answered yet.",
+        )
+        self.admission_wait = registry.histogram(
+            "csv_admission_wait_seconds",
+            "Time uploads waited for the in-flight budget before they were admitted.",
+            buckets=DURATION_BUCKETS,
+        )
+        self.admission_rejections = registry.counter(
+            "csv_admission_rejections_total",
+            "Uploads rejected by the normalize endpoint's admission control, by reason: queue_full or timeout.",
+            ("reason",),
+        )
+        self.result_cache_lookups = registry.counter(
+            "csv_result_cache_lookups_total",
+            "Lookups of earlier outputs for identical uploads to the normalize endpoint, by result: hit or miss.",
+            ("result",),
+        )
+        self.result_cache_bytes = registry.gauge(
+            "csv_result_cache_bytes",
+            "Bytes of normalized outputs kept on disk for identical uploads.",
+        )
+
+    def observe_batch(self, processed_rows: int, skipped: Sequence[SkippedRow]) -> None:
+        self.rows.inc(processed_rows - len(skipped), result="normalized")
+        if not skipped:
+            return
+
+        self.rows.inc(len(skipped), result="skipped")
+        for reason, count in Counter(item.reason for item in skipped).items():
+            self.skipped_rows.inc(count, reason=reason or "unspecified")
+
+    def observe_run(self, run: NormalizationRun, summary: CsvNormalizationSummaryDTO, *, outcome: str) -> None:
+        elapsed = perf_counter() - run.started
+        self.normalizations.inc(outcome=outcome)
+        self.duration.observe(elapsed)
+        self.upload_bytes.observe(run.upload_bytes)
+        for stage, seconds in run.stage_seconds.items():
+            self.stage_duration.observe(seconds, stage=stage)
+        if outcome == "completed" and elapsed > 0:
+            self.rows_per_second.observe(summary.processed_rows / elapsed)
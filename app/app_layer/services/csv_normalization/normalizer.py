@@ -1,9 +1,55 @@
 from calendar import monthrange
-from re import IGNORECASE, findall, split, sub
+from collections.abc import Callable, Hashable, Sequence
+from re import IGNORECASE, compile as compile_pattern
 
-from app.app_layer.interfaces.services.csv_normalization.normalizer import AbstractDataNormalizer
+from app.app_layer.interfaces.services.csv_normalization.normalizer import (
+    AbstractDataNormalizer,
+    DateLayoutProfile,
+    NormalizedColumn,
+    RowFlag,
+)
+from app.app_layer.services.csv_normalization.cache import CacheEntry, NormalizationCache, process_cache
+from app.app_layer.services.csv_normalization.date_layouts import (
+    DATE_LAYOUTS,
+    LayoutParser,
+    detect_layouts,
+    is_valid_date,
+)
+from app.app_layer.services.csv_normalization.numbering_plan import (
+    BUNDLED_NUMBERING_PLANS,
+    CountryPlan,
+    NumberingPlans,
+    load_numbering_plans,
+)
 from app.configs.base import settings
 
+COLUMN_SEPARATOR = "\x00"
+NO_FLAGS = RowFlag(0)
+
+# Values covering the numbering plan, generic phone rules and every date layout, run once at start-up
+WARM_UP_PHONES = ("+971 50 123 4567", "050-123-4567", "00447911123456", "o501234567", "+1 (415) 555-2671", "12", None)
+WARM_UP_DOBS = (
+    "02.01.1990",
+    "5.22.1997",
+    "1990/01/02",
+    "19900102",
+    "02011990",
+    "020190",
+    "5 Apr 2004",
+    "Apr-05-2004",
+    "2004 April 5",
+    "April 5th, 2004",
+    "",
+)
+
+
+def _phone_flags(raw: str, digits_only: str, normalized: str) -> RowFlag:
+    # Dialed numbers, with their calling code or an international prefix, come out as long as
+    # their digits at most; longer, different digits got the calling code of the plan
+    if len(normalized) > len(digits_only) and normalized[1:] != digits_only and raw[0] != "+":
+        return RowFlag.PHONE_COUNTRY_DEFAULTED
+    return NO_FLAGS
+
 
 class DataNormalizer(AbstractDataNormalizer):
     """Normalize phone numbers and birth dates."""
@@ -13,17 +59,328 @@ class DataNormalizer(AbstractDataNormalizer):
         *,
         default_country_code: str | None = None,
         pivot_year: int | None = None,
+        cache: NormalizationCache | None = None,
+        numbering_plans: NumberingPlans | None = None,
+        strict_phone_numbering: bool | None = None,
     ):
         self.default_country_code = default_country_code or settings.normalizer.default_country_code
+        self.numbering_plans = numbering_plans or load_numbering_plans(
+            settings.normalizer.numbering_plans_path or BUNDLED_NUMBERING_PLANS,
+        )
+        # Without a plan for the default country its local numbers only get the generic rules
+        self.default_plan = self.numbering_plans.resolve(self.default_country_code)
+        self.strict_phone_numbering = (
+            settings.normalizer.strict_phone_numbering if strict_phone_numbering is None else strict_phone_numbering
+        )
+        # Numbering plan formatters per calling code; closures, so worker processes build their own
+        self._phone_formatters: dict[str | None, Callable[[str, bool], str | None]] = {}
         self.pivot_year = pivot_year or settings.normalizer.default_year_pivot
         self.phone_translation = str.maketrans({"o": "0", "O": "0"})
         self.month_map = settings.normalizer.month_map
-        self.non_digit_pattern = r"\D"
-        self.digit_group_pattern = r"\d+"
-        self.token_split_pattern = r"[\s,._/:;-]+"  # noqa: S105
-        self.ordinal_suffix_pattern = r"(?<=\d)(st|nd|rd|th)\b"
+        self.base_year = settings.normalizer.base_year
+        self.dob_sample_rows = settings.normalizer.dob_sample_rows
+        self.dob_layout_min_share = settings.normalizer.dob_layout_min_share
+        self.non_digit_pattern = compile_pattern(r"\D")
+        # Same as ``non_digit_pattern`` but keeps the separator of a joined column
+        self.column_non_digit_pattern = compile_pattern(rf"[^\d{COLUMN_SEPARATOR}]")
+        self.digit_group_pattern = compile_pattern(r"\d+")
+        self.token_split_pattern = compile_pattern(r"[\s,._/:;-]+")
+        self.ordinal_suffix_pattern = compile_pattern(r"(?<=\d)(st|nd|rd|th)\b", IGNORECASE)
+        # Cached outcomes depend on the raw value and on the settings used to normalize it
+        self.cache = cache
+        self.phone_cache_namespace = (
+            "phone",
+            self.default_country_code,
+            self.strict_phone_numbering,
+            self.numbering_plans.fingerprint,
+        )
+        self.dob_cache_namespace = ("dob", self.pivot_year, self.base_year)
+
+    def __getstate__(self) -> dict:
+        # Worker processes use their own cache instead of receiving a copy of this one
+        state = self.__dict__.copy()
+        state["cache"] = None if self.cache is None else self.cache.max_entries
+        state["_phone_formatters"] = {}
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        max_entries = state.pop("cache")
+        self.__dict__.update(state)
+        self.cache = None if max_entries is None else process_cache(max_entries)
 
     async def get_date_of_birth(self, dob: str | None) -> str:
+        return self._cached(self.dob_cache_namespace, dob, self._parse_date_of_birth)
+
+    async def get_phone(self, phone: str | None, country: str | None = None) -> str:
+        if not country:
+            return self._cached(self.phone_cache_namespace, phone, self._normalize_phone_value)
+
+        plan = self._phone_plan(country)
+        return self._cached(
+            self._phone_namespace(plan),
+            phone,
+            lambda value: self._normalize_phone_value(value, plan),
+        )
+
+    def detect_dob_layouts(self, sample: Sequence[str | None]) -> DateLayoutProfile:
+        return detect_layouts(
+            sample[: self.dob_sample_rows],
+            base_year=self.base_year,
+            min_share=self.dob_layout_min_share,
+        )
+
+    def normalize_dobs(
+        self,
+        dobs: Sequence[str | None],
+        profile: DateLayoutProfile | None = None,
+    ) -> NormalizedColumn:
+        # Layouts other than month first give the same values as the generic parser, so they share its entries
+        namespace = self.dob_cache_namespace
+        if profile is not None and profile.month_first:
+            namespace = (self.dob_cache_namespace, "month-first")
+
+        return self._cached_column(namespace, dobs, lambda values: self._normalize_dob_column(values, profile))
+
+    def normalize_phones(
+        self,
+        phones: Sequence[str | None],
+        countries: Sequence[str | None] | str | None = None,
+    ) -> NormalizedColumn:
+        if countries is None or isinstance(countries, str):
+            try:
+                plan = self._phone_plan(countries)
+            except ValueError as exc:
+                return NormalizedColumn([None] * len(phones), dict.fromkeys(range(len(phones)), str(exc)), {})
+            return self._cached_column(
+                self._phone_namespace(plan),
+                phones,
+                lambda values: self._normalize_phone_column(values, plan),
+            )
+
+        # Rows are normalized per hinted country, a handful of groups in practice
+        groups: dict[str | None, list[int]] = {}
+        for index, country in enumerate(countries):
+            groups.setdefault(country.strip() if country else None, []).append(index)
+        if len(groups) == 1:
+            return self.normalize_phones(phones, next(iter(groups)))
+
+        values: list[str | None] = [None] * len(phones)
+        errors: dict[int, str] = {}
+        flags: dict[int, RowFlag] = {}
+        for country, indexes in groups.items():
+            column = self.normalize_phones([phones[index] for index in indexes], country)
+            for position, index in enumerate(indexes):
+                values[index] = column.values[position]
+                if position in column.errors:
+                    errors[index] = column.errors[position]
+                elif position in column.flags:
+                    flags[index] = column.flags[position]
+
+        return NormalizedColumn(values, errors, flags)
+
+    def has_phone_plan(self, country: str) -> bool:
+        return self.numbering_plans.resolve(country) is not None
+
+    def warm_up(self) -> None:
+        # The cache is bypassed, so that its entries and statistics only reflect uploads
+        self._normalize_phone_column(WARM_UP_PHONES, self.default_plan)
+        self._normalize_phone_value(WARM_UP_PHONES[0])
+        self._normalize_dob_column(WARM_UP_DOBS, self.detect_dob_layouts(WARM_UP_DOBS))
+        self._normalize_dob_column(WARM_UP_DOBS)
+
+    def _phone_formatter(self, plan: CountryPlan | None) -> Callable[[str, bool], str | None]:
+        """Return the numbering plan formatter of ``plan``, the default plan when ``None``; built once per plan."""
+        key = None if plan is None else plan.calling_code
+        formatter = self._phone_formatters.get(key)
+        if formatter is None:
+            formatter = self._phone_formatters[key] = self.numbering_plans.formatter(plan or self.default_plan)
+        return formatter
+
+    def _phone_namespace(self, plan: CountryPlan | None) -> Hashable:
+        # Keys are hashed per value, so the default plan keeps the flat namespace
+        if plan is self.default_plan:
+            return self.phone_cache_namespace
+        return (*self.phone_cache_namespace, None if plan is None else plan.calling_code)
+
+    def _phone_plan(self, country: str | None) -> CountryPlan | None:
+        if not country:
+            return self.default_plan
+        plan = self.numbering_plans.resolve(country)
+        if plan is None:
+            raise ValueError("Unknown country hint")
+        return plan
+
+    def _cached(
+        self,
+        namespace: Hashable,
+        raw: str | None,
+        normalize: Callable[[str | None], tuple[str, RowFlag]],
+    ) -> str:
+        """Serve one value from the entries ``_cached_column`` shares, which is why its flags are stored too."""
+        if self.cache is None:
+            return normalize(raw)[0]
+
+        key = (namespace, raw)
+        entry = self.cache.get(key)
+        if entry is None:
+            try:
+                value, flags = normalize(raw)
+                entry = (value, None, flags)
+            except ValueError as exc:
+                entry = (None, str(exc), NO_FLAGS)
+            self.cache.put(key, entry)
+
+        value, error, _ = entry
+        if error is not None:
+            raise ValueError(error)
+        return value  # type: ignore[return-value]
+
+    def _cached_column(  # noqa: C901
+        self,
+        namespace: Hashable,
+        raw_values: Sequence[str | None],
+        normalize: Callable[[Sequence[str | None]], NormalizedColumn],
+    ) -> NormalizedColumn:
+        """Serve cached outcomes and normalize the distinct missing values as one smaller column."""
+        if self.cache is None:
+            return normalize(raw_values)
+
+        values: list[str | None] = []
+        errors: dict[int, str] = {}
+        flags: dict[int, RowFlag] = {}
+        missing: dict[str | None, list[int]] = {}
+        get = self.cache.get
+
+        for index, raw in enumerate(raw_values):
+            entry = get((namespace, raw))
+            if entry is None:
+                missing.setdefault(raw, []).append(index)
+                values.append(None)
+                continue
+
+            values.append(entry[0])
+            if entry[1] is not None:
+                errors[index] = entry[1]
+            elif entry[2]:
+                flags[index] = entry[2]
+
+        if missing:
+            distinct = list(missing)
+            computed = normalize(distinct)
+            for position, raw in enumerate(distinct):
+                entry: CacheEntry = (
+                    computed.values[position],
+                    computed.errors.get(position),
+                    computed.flags.get(position, NO_FLAGS),
+                )
+                self.cache.put((namespace, raw), entry)
+                for index in missing[raw]:
+                    values[index] = entry[0]
+                    if entry[1] is not None:
+                        errors[index] = entry[1]
+                    elif entry[2]:
+                        flags[index] = entry[2]
+
+        return NormalizedColumn(values, errors, flags)
+
+    def _normalize_phone_value(self, phone: str | None, plan: CountryPlan | None = None) -> tuple[str, RowFlag]:
+        raw = "" if phone is None else str(phone).strip()
+        digits_only = self.non_digit_pattern.sub("", raw.translate(self.phone_translation))
+        normalized = self._phone_formatter(plan)(digits_only, raw[0] == "+") if digits_only else None
+        if normalized is None:
+            normalized = self._normalize_phone(raw, digits_only, plan)
+        return normalized, _phone_flags(raw, digits_only, normalized)
+
+    def _normalize_dob_column(
+        self,
+        dobs: Sequence[str | None],
+        profile: DateLayoutProfile | None = None,
+    ) -> NormalizedColumn:
+        values: list[str | None] = []
+        errors: dict[int, str] = {}
+        flags: dict[int, RowFlag] = {}
+        parsers = (
+            [LayoutParser(DATE_LAYOUTS[name], self.month_map, self.base_year) for name in profile.layouts]
+            if profile
+            else []
+        )
+        normalize = self._parse_date_of_birth
+        expand_year = self._expand_year
+
+        for index, dob in enumerate(dobs):
+            raw = "" if dob is None else str(dob).strip()
+            for parse in parsers:
+                parsed = parse(raw)
+                if parsed is None:
+                    continue
+                year, month, day = parsed
+                century_inferred = year < 100
+                if century_inferred:
+                    year = expand_year(year)
+                if is_valid_date(year, month, day):
+                    values.append(f"{year:04d}-{month:02d}-{day:02d}")
+                    if century_inferred:
+                        flags[index] = RowFlag.DOB_CENTURY_INFERRED
+                    break
+            else:
+                # Outliers take the generic path, including its day/month swap
+                try:
+                    value, value_flags = normalize(raw)
+                except ValueError as exc:
+                    values.append(None)
+                    errors[index] = str(exc)
+                    continue
+                values.append(value)
+                if value_flags:
+                    flags[index] = value_flags
+
+        return NormalizedColumn(values, errors, flags)
+
+    def _normalize_phone_column(self, phones: Sequence[str | None], plan: CountryPlan | None) -> NormalizedColumn:
+        stripped = self._strip_column(phones)
+        values: list[str | None] = []
+        append = values.append
+        errors: dict[int, str] = {}
+        flags: dict[int, RowFlag] = {}
+        to_e164 = self._phone_formatter(plan)
+        normalize = self._normalize_phone
+
+        for index, (raw, digits_only) in enumerate(zip(stripped, self._column_digits(stripped), strict=True)):
+            # Numbers the plans accept skip the error checks and generic rules of ``_normalize_phone``
+            normalized = to_e164(digits_only, raw[0] == "+") if digits_only else None
+            if normalized is None:
+                try:
+                    normalized = normalize(raw, digits_only, plan)
+                except ValueError as exc:
+                    append(None)
+                    errors[index] = str(exc)
+                    continue
+            append(normalized)
+            flag = _phone_flags(raw, digits_only, normalized)
+            if flag:
+                flags[index] = flag
+
+        return NormalizedColumn(values, errors, flags)
+
+    @staticmethod
+    def _strip_column(values: Sequence[str | None]) -> list[str]:
+        """Strip a column in one ``map`` call, falling back per value when it holds missing or non-string values."""
+        try:
+            return list(map(str.strip, values))  # type: ignore[arg-type]
+        except TypeError:
+            return ["" if value is None else str(value).strip() for value in values]
+
+    def _column_digits(self, values: list[str]) -> list[str]:
+        """Strip non-digits from every value with a single translate and regex pass over the joined column."""
+        joined = COLUMN_SEPARATOR.join(values)
+        if joined.count(COLUMN_SEPARATOR) != len(values) - 1:
+            # A value contains the separator itself, so the joined column cannot be split back
+            return [self.non_digit_pattern.sub("", value.translate(self.phone_translation)) for value in values]
+
+        return self.column_non_digit_pattern.sub("", joined.translate(self.phone_translation)).split(COLUMN_SEPARATOR)
+
+    def _parse_date_of_birth(self, dob: str | None) -> tuple[str, RowFlag]:
+        """Normalize ``dob`` and tell whether its century was inferred or its day and month swapped."""
         raw = "" if dob is None else str(dob).strip()
         if not raw:
             raise ValueError("Missing date of birth value")
@@ -34,54 +391,64 @@ class DataNormalizer(AbstractDataNormalizer):
         else:
             year, month, day = self._parse_numeric_date(raw)
 
-        year, month, day = self._validate_or_swap(year, month, day)
-        return f"{year:04d}-{month:02d}-{day:02d}"
+        flags = NO_FLAGS
+        if year < 100:
+            year = self._expand_year(year)
+            flags |= RowFlag.DOB_CENTURY_INFERRED
+        valid_year, valid_month, valid_day = self._validate_or_swap(year, month, day)
+        if valid_month != month:
+            flags |= RowFlag.DOB_SWAPPED
+        return f"{valid_year:04d}-{valid_month:02d}-{valid_day:02d}", flags
 
-    async def get_phone(self, phone: str | None) -> str:
-        raw = "" if phone is None else str(phone).strip()
+    def _normalize_phone(self, raw: str, digits_only: str, plan: CountryPlan | None) -> str:
+        """Normalize a phone number no numbering plan accepts."""
         if not raw:
             raise ValueError("Missing phone value")
 
-        normalized_input = raw.translate(self.phone_translation)
-        digits_only = sub(self.non_digit_pattern, "", normalized_input)
         if not digits_only:
             raise ValueError("Input phone value must contain digits")
 
-        if raw.startswith("+"):
-            normalized = digits_only
-        elif digits_only.startswith("00"):
-            normalized = digits_only[2:]
-        elif digits_only.startswith(self.default_country_code):
-            normalized = digits_only
-        elif digits_only.startswith("0"):
-            normalized = self.default_country_code + digits_only[1:]
-        elif len(digits_only) in (9, 10):
-            normalized = self.default_country_code + digits_only
-        else:
-            normalized = digits_only
+        if self.strict_phone_numbering:
+            raise ValueError("Phone value does not match any numbering plan")
 
+        country_code = self.default_country_code if plan is None else plan.calling_code
+        normalized = self._apply_generic_phone_rules(digits_only, country_code, international=raw.startswith("+"))
         if len(normalized) < 6:
             raise ValueError("Phone value is too short for E.164 format")
 
         return f"+{normalized}"
 
+    @staticmethod
+    def _apply_generic_phone_rules(digits: str, country_code: str, *, international: bool) -> str:
+        """Format numbers of unknown plans: local-looking numbers get ``country_code``, others are kept."""
+        if international:
+            return digits
+        if digits.startswith("00"):
+            return digits[2:]
+        if digits.startswith(country_code):
+            return digits
+        if digits.startswith("0"):
+            return country_code + digits[1:]
+        if len(digits) in (9, 10):
+            return country_code + digits
+        return digits
+
     def _parse_numeric_date(self, raw: str) -> tuple[int, int, int]:
-        parts = findall(self.digit_group_pattern, raw)
-        digits_only = sub(self.non_digit_pattern, "", raw)
+        """Split ``raw`` into year, month and day, the year as written."""
+        parts = self.digit_group_pattern.findall(raw)
+        digits_only = self.non_digit_pattern.sub("", raw)
 
         if len(parts) == 3:
             first, second, third = map(int, parts)
             if first >= 1000:
                 year, month, day = first, second, third
             else:
+                # Day first; a month past 12 is swapped back by ``_validate_or_swap``
                 day, month, year = first, second, third
-                if month > 12 and day <= 12:
-                    day, month = month, day
-            year = self._expand_year(year)
         elif len(parts) == 1 and len(digits_only) in (6, 8):
             if len(digits_only) == 8:
                 leading = int(digits_only[:4])
-                if leading >= settings.normalizer.base_year:
+                if leading >= self.base_year:
                     year = leading
                     month = int(digits_only[4:6])
                     day = int(digits_only[6:8])
@@ -93,7 +460,6 @@ class DataNormalizer(AbstractDataNormalizer):
                 day = int(digits_only[:2])
                 month = int(digits_only[2:4])
                 year = int(digits_only[4:6])
-            year = self._expand_year(year)
         else:
             raise ValueError
 
@@ -101,8 +467,8 @@ class DataNormalizer(AbstractDataNormalizer):
 
     def _parse_with_month_names(self, raw: str) -> tuple[int, int, int]:  # noqa: C901
         # Cleaning from 1st, 2nd, 3rd and etc.
-        cleaned = sub(self.ordinal_suffix_pattern, "", raw, flags=IGNORECASE)
-        tokens = [token for token in split(self.token_split_pattern, cleaned) if token]
+        cleaned = self.ordinal_suffix_pattern.sub("", raw)
+        tokens = [token for token in self.token_split_pattern.split(cleaned) if token]
 
         month_index = None
         month_value = None
@@ -110,11 +476,11 @@ class DataNormalizer(AbstractDataNormalizer):
 
         for index, token in enumerate(tokens):
             lookup_key = token.lower()
-            if lookup_key in settings.normalizer.month_map:
+            if lookup_key in self.month_map:
                 if month_index is not None:
                     raise ValueError("Ambiguous month tokens in date of birth value")
                 month_index = index
-                month_value = settings.normalizer.month_map[lookup_key]
+                month_value = self.month_map[lookup_key]
             elif token.isdigit():
                 numeric_tokens.append((index, int(token)))
             else:
@@ -125,8 +491,7 @@ class DataNormalizer(AbstractDataNormalizer):
         if len(numeric_tokens) < 2:
             raise ValueError
 
-        year_index, year_value = self._select_year(month_index, numeric_tokens)
-        year = self._expand_year(year_value)
+        year_index, year = self._select_year(month_index, numeric_tokens)
 
         remaining = [(idx, value) for idx, value in numeric_tokens if idx != year_index]
         left = [item for item in remaining if item[0] < month_index]
@@ -159,7 +524,7 @@ class DataNormalizer(AbstractDataNormalizer):
 
     def _expand_year(self, year: int) -> int:
         if year < 100:
-            base_century = settings.normalizer.base_year
+            base_century = self.base_year
             next_century = base_century + 100
             return (next_century + year) if year <= self.pivot_year else (base_century + year)
         return year
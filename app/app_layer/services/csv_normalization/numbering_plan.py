@@ -0,0 +1,169 @@
+from collections.abc import Callable, Iterable
+from functools import cache
+from hashlib import blake2b
+import json
+from pathlib import Path
+from typing import NamedTuple
+
+BUNDLED_NUMBERING_PLANS = Path(__file__).resolve().parent / "data" / "numbering_plans.json"
+
+# Country calling codes are at most three digits long
+_MAX_CALLING_CODE_LENGTH = 3
+
+# Trie node: the next digit maps to a deeper node or, calling codes being prefix free, to a plan
+_Node = dict[str, "_Node | CountryPlan"]
+
+
+class CountryPlan(NamedTuple):
+    """Numbering plan of a country calling code, shared by every region dialed through it."""
+
+    calling_code: str
+    regions: tuple[str, ...]
+    trunk_prefix: str
+    national_lengths: frozenset[int]
+    # National significant numbers start with 0 only in a handful of plans, such as Italy's
+    leading_zero: bool = False
+
+    def is_national(self, digits: str) -> bool:
+        """Whether ``digits`` fit this plan as a national significant number."""
+        return len(digits) in self.national_lengths and (self.leading_zero or digits[:1] != "0")
+
+
+class NumberingPlans:
+    """Country calling codes in a prefix trie, classifying a number in time linear in its length."""
+
+    def __init__(self, plans: Iterable[CountryPlan]) -> None:
+        plans = list(plans)
+        self._trie: _Node = {}
+        self._hints: dict[str, CountryPlan] = {}
+        # Tells plans apart wherever outputs of other plans must not be reused, such as cache keys
+        entries = sorted(
+            (plan.calling_code, plan.regions, plan.trunk_prefix, sorted(plan.national_lengths), plan.leading_zero)
+            for plan in plans
+        )
+        self.fingerprint = blake2b(repr(entries).encode(), digest_size=8).hexdigest()
+
+        for plan in plans:
+            node = self._trie
+            for digit in plan.calling_code[:-1]:
+                child = node.setdefault(digit, {})
+                if isinstance(child, dict):
+                    node = child
+                    continue
+                raise ValueError(f"Calling code {plan.calling_code} extends calling code {child.calling_code}")
+            if plan.calling_code[-1] in node:
+                raise ValueError(f"Calling code {plan.calling_code} is ambiguous")
+            node[plan.calling_code[-1]] = plan
+
+            self._hints[plan.calling_code] = plan
+            for region in plan.regions:
+                self._hints[region.upper()] = plan
+
+    @classmethod
+    def from_file(cls, path: Path) -> "NumberingPlans":
+        try:
+            entries = json.loads(path.read_text(encoding="utf-8"))
+            return cls(
+                CountryPlan(
+                    calling_code=entry["calling_code"],
+                    regions=tuple(entry["regions"]),
+                    trunk_prefix=entry.get("trunk_prefix", ""),
+                    national_lengths=frozenset(entry["national_lengths"]),
+                    leading_zero=entry.get("leading_zero", False),
+                )
+                for entry in entries
+            )
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            raise ValueError(f"Invalid numbering plan data at {path}") from exc
+
+    def resolve(self, hint: str) -> CountryPlan | None:
+        """Find the plan of an ISO 3166 alpha-2 region or a calling code such as ``+44``."""
+        return self._hints.get(hint.strip().removeprefix("+").upper())
+
+    def match(self, digits: str) -> CountryPlan | None:
+        """Return the plan whose calling code starts ``digits``."""
+        node = self._trie
+        for digit in digits[:_MAX_CALLING_CODE_LENGTH]:
+            child = node.get(digit)
+            if child is None or isinstance(child, CountryPlan):
+                return child
+            node = child
+        return None
+
+    def to_e164(self, digits: str, *, international: bool, plan: CountryPlan | None) -> str | None:
+        """Return a number in E.164 form, or ``None`` when no plan accepts it.
+
+        ``international`` tells that the number was written with a leading ``+``; a ``00`` prefix
+        is recognized from the digits themselves.
+        """
+        return self.formatter(plan)(digits, international)
+
+    def formatter(self, plan: CountryPlan | None) -> Callable[[str, bool], str | None]:
+        """Build ``to_e164`` for numbers dialed from ``plan``, with everything but the digits bound to locals.
+
+        Numbers dialed without an international prefix are first read in ``plan``: as a bare
+        national number, with its trunk prefix or with its calling code. Anything else must start
+        with a known calling code; a trunk prefix kept after it, as in ``+44 (0)20``, is dropped.
+        """
+        trie = self._trie
+        if plan is None:
+            calling_code, trunk_prefix, lengths, leading_zero = "", "", frozenset[int](), False
+        else:
+            calling_code, trunk_prefix = plan.calling_code, plan.trunk_prefix
+            lengths, leading_zero = plan.national_lengths, plan.leading_zero
+        code_length, trunk_length = len(calling_code), len(trunk_prefix)
+        # National significant numbers start with any of these digits
+        first_digits = "0123456789" if leading_zero else "123456789"
+        trunk_lengths = {trunk_length + length for length in lengths} if trunk_prefix else set()
+        trunk_prefixes = {trunk_prefix + digit for digit in first_digits}
+        e164_lengths = {code_length + length for length in lengths}
+        e164_prefixes = {calling_code + digit for digit in first_digits}
+
+        def to_e164(digits: str, international: bool) -> str | None:  # noqa: FBT001
+            if international:
+                pass
+            elif digits[:2] == "00":
+                digits = digits[2:]
+            else:
+                length = len(digits)
+                if length in lengths and digits[0] in first_digits:
+                    return f"+{calling_code}{digits}"
+                if length in trunk_lengths and digits[: trunk_length + 1] in trunk_prefixes:
+                    return f"+{calling_code}{digits[trunk_length:]}"
+
+            # Numbers of the plan itself are the common case and skip the trie
+            if len(digits) in e164_lengths and digits[: code_length + 1] in e164_prefixes:
+                return f"+{digits}"
+
+            return _international_e164(trie, digits)
+
+        return to_e164
+
+
+def _international_e164(trie: _Node, digits: str) -> str | None:
+    # Calling codes are prefix free, so the first plan reached in the trie is the match
+    node = trie
+    for digit in digits[:_MAX_CALLING_CODE_LENGTH]:
+        child = node.get(digit)
+        if child is None:
+            return None
+        if type(child) is dict:
+            node = child
+            continue
+
+        plan: CountryPlan = child  # type: ignore[assignment]
+        national = digits[len(plan.calling_code) :]
+        if plan.is_national(national):
+            return f"+{digits}"
+        if plan.trunk_prefix and national.startswith(plan.trunk_prefix):
+            national = national[len(plan.trunk_prefix) :]
+            if plan.is_national(national):
+                return f"+{plan.calling_code}{national}"
+        return None
+    return None
+
+
+@cache
+def load_numbering_plans(path: Path = BUNDLED_NUMBERING_PLANS) -> NumberingPlans:
+    """Load numbering plans once per process."""
+    return NumberingPlans.from_file(path)
@@ -0,0 +1,168 @@
+from abc import ABC, abstractmethod
+from importlib import import_module
+from io import BytesIO
+from types import ModuleType
+from typing import Any
+
+from app.app_layer.interfaces.services.csv_normalization import OutputFormat, UnsupportedOutputFormatError
+from app.app_layer.services.csv_normalization.batch import CONFIDENCE_FIELDNAME, OUTPUT_FIELDNAMES, NormalizedBatch
+
+MEDIA_TYPES = {
+    OutputFormat.CSV: "text/csv",
+    OutputFormat.ARROW: "application/vnd.apache.arrow.stream",
+    OutputFormat.PARQUET: "application/vnd.apache.parquet",
+}
+EXTENSIONS = {
+    OutputFormat.CSV: ".csv",
+    OutputFormat.ARROW: ".arrow",
+    OutputFormat.PARQUET: ".parquet",
+}
+
+
+class OutputWriter(ABC):
+    """Encode the normalized batches of one normalization into a single byte stream.
+
+    ``header`` is sent before the first batch is normalized, ``write`` once per batch and ``close``
+    after the last one; each returns the bytes to send next, possibly none. With ``confidence`` the
+    output has a last column with the confidence flags of every row.
+    """
+
+    def __init__(self, output_format: OutputFormat, *, confidence: bool = False) -> None:
+        self.media_type = MEDIA_TYPES[output_format]
+        self.extension = EXTENSIONS[output_format]
+        self.confidence = confidence
+
+    def header(self) -> bytes:
+        return b""
+
+    @abstractmethod
+    def write(self, batch: NormalizedBatch) -> bytes: ...
+
+    def close(self) -> bytes:
+        return b""
+
+
+class CsvOutputWriter(OutputWriter):
+    """Semicolon CSV; batches arrive already formatted by ``normalize_batch``."""
+
+    def __init__(self, *, confidence: bool = False) -> None:
+        super().__init__(OutputFormat.CSV, confidence=confidence)
+
+    def header(self) -> bytes:
+        fieldnames = (*OUTPUT_FIELDNAMES, CONFIDENCE_FIELDNAME) if self.confidence else OUTPUT_FIELDNAMES
+        return (";".join(fieldnames) + "\n").encode("utf-8")
+
+    def write(self, batch: NormalizedBatch) -> bytes:
+        return batch.content.encode("utf-8")
+
+
+class _ColumnarOutputWriter(OutputWriter):
+    """Base of the Arrow based formats: batches become record batches with a typed ``dob`` column."""
+
+    def __init__(self, output_format: OutputFormat, *, confidence: bool = False) -> None:
+        super().__init__(output_format, confidence=confidence)
+        self.pa = _import_pyarrow(output_format)
+        fields = [("id", self.pa.string()), ("phone", self.pa.string()), ("dob", self.pa.date32())]
+        if confidence:
+            fields.append((CONFIDENCE_FIELDNAME, self.pa.string()))
+        self.schema = self.pa.schema(fields)
+        self._sink = BytesIO()
+
+    def _record_batch(self, batch: NormalizedBatch) -> Any:
+        ids, phones, dobs, _, confidence = batch.columns or ([], [], [], [], None)
+        # ISO dates are cast in one vectorized step rather than parsed value by value
+        arrays = [
+            self.pa.array(ids, self.pa.string()),
+            self.pa.array(phones, self.pa.string()),
+            self.pa.array(dobs).cast(self.pa.date32()),
+        ]
+        if self.confidence:
+            arrays.append(self.pa.array(confidence or [], self.pa.string()))
+        return self.pa.record_batch(arrays, schema=self.schema)
+
+    def _drain(self) -> bytes:
+        content = self._sink.getvalue()
+        self._sink.seek(0)
+        self._sink.truncate()
+        return content
+
+
+class ArrowOutputWriter(_ColumnarOutputWriter):
+    """Arrow IPC stream, one record batch per normalized batch."""
+
+    def __init__(self, *, confidence: bool = False) -> None:
+        super().__init__(OutputFormat.ARROW, confidence=confidence)
+        self._writer = self.pa.ipc.new_stream(self._sink, self.schema)
+
+    def write(self, batch: NormalizedBatch) -> bytes:
+        if batch.columns and batch.columns.ids:
+            self._writer.write_batch(self._record_batch(batch))
+        return self._drain()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._drain()
+
+
+class ParquetOutputWriter(_ColumnarOutputWriter):
+    """Parquet file written row group by row group; readable once the footer is sent by ``close``."""
+
+    def __init__(self, row_group_rows: int, *, confidence: bool = False) -> None:
+        super().__init__(OutputFormat.PARQUET, confidence=confidence)
+        self.row_group_rows = row_group_rows
+        self._writer = _import_module("pyarrow.parquet", OutputFormat.PARQUET).ParquetWriter(
+            self._sink,
+            self.schema,
+            compression="zstd",
+        )
+        # Normalized batches are much smaller than a useful row group, so they are grouped first
+        self._pending: list[Any] = []
+        self._pending_rows = 0
+
+    def write(self, batch: NormalizedBatch) -> bytes:
+        if batch.columns and batch.columns.ids:
+            self._pending.append(self._record_batch(batch))
+            self._pending_rows += len(batch.columns.ids)
+        if self._pending_rows >= self.row_group_rows:
+            self._flush()
+        return self._drain()
+
+    def close(self) -> bytes:
+        self._flush()
+        self._writer.close()
+        return self._drain()
+
+    def _flush(self) -> None:
+        if self._pending:
+            self._writer.write_table(self.pa.Table.from_batches(self._pending, schema=self.schema))
+        self._pending = []
+        self._pending_rows = 0
+
+
+def create_output_writer(
+    output_format: OutputFormat,
+    *,
+    parquet_row_group_rows: int,
+    confidence: bool = False,
+) -> OutputWriter:
+    if output_format is OutputFormat.ARROW:
+        return ArrowOutputWriter(confidence=confidence)
+    if output_format is OutputFormat.PARQUET:
+        return ParquetOutputWriter(parquet_row_group_rows, confidence=confidence)
+    return CsvOutputWriter(confidence=confidence)
+
+
+def _import_pyarrow(output_format: OutputFormat) -> ModuleType:
+    pa = _import_module("pyarrow", output_format)
+    _import_module("pyarrow.ipc", output_format)
+    return pa
+
+
+def _import_module(name: str, output_format: OutputFormat) -> ModuleType:
+    # pyarrow is an optional dependency, only needed for the columnar output formats
+    try:
+        return import_module(name)
+    except ImportError as exc:
+        raise UnsupportedOutputFormatError(
+            f"{output_format} output needs pyarrow, install the 'arrow' extra",
+        ) from exc
@@ -0,0 +1,222 @@
+from codecs import getincrementaldecoder
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from csv import reader as csv_reader
+from functools import partial
+from importlib import import_module
+from io import StringIO
+from operator import itemgetter
+from time import perf_counter
+
+from app.app_layer.interfaces.services.csv_normalization import CsvNormalizationError, ParserEngine
+from app.app_layer.services.csv_normalization.dialect import ENCODING_LABELS, CsvDialect, sniff_dialect
+
+
+class _NeedMoreDataError(Exception):
+    """Raised by the line feed when the CSV reader outruns the decoded input."""
+
+
+class _LineFeed(Iterator[str]):
+    """Line iterator for ``csv`` readers that can replay a partially consumed record.
+
+    ``csv`` readers drop their parser state when the underlying iterator raises, so the lines
+    consumed since the last complete record are kept and pushed back once more input arrives.
+    """
+
+    def __init__(self) -> None:
+        self._pending: deque[str] = deque()
+        self._consumed: list[str] = []
+        self.exhausted = False
+
+    def __next__(self) -> str:
+        if self._pending:
+            line = self._pending.popleft()
+            self._consumed.append(line)
+            return line
+        if self.exhausted:
+            raise StopIteration
+        raise _NeedMoreDataError
+
+    def extend(self, text: str) -> None:
+        self._pending.extend(StringIO(text, newline=""))
+
+    def drain(self) -> str:
+        """Take the lines not read yet out of the feed."""
+        text = "".join(self._pending)
+        self._pending.clear()
+        return text
+
+    def commit(self) -> None:
+        self._consumed.clear()
+
+    def rewind(self) -> None:
+        self._pending.extendleft(reversed(self._consumed))
+        self._consumed.clear()
+
+
+class IncrementalCsvReader:
+    """Parse CSV rows from an async stream of byte chunks.
+
+    Only the current chunk, the undecoded tail of the previous one and the rows of the current
+    batch are held in memory, so the payload never has to be buffered as a whole. Rows are the
+    lists of fields ``csv.reader`` produces, read by column position; blank lines are skipped.
+
+    Unless ``dialect`` is given, the encoding, delimiter and quote character are sniffed from the
+    first ``sniff_size`` bytes, so that a file in an unsupported encoding is rejected before the
+    rest of it is read.
+
+    ``read_seconds`` and ``parse_seconds`` add up the time spent awaiting and decoding chunks and
+    turning lines into rows.
+
+    This is the ``stdlib`` parser engine; ``csv_reader_factory`` opens readers of any engine.
+    """
+
+    def __init__(
+        self,
+        chunks: AsyncIterator[bytes],
+        *,
+        dialect: CsvDialect | None = None,
+        sniff_size: int = 16 * 1024,
+    ) -> None:
+        self._chunks = chunks
+        self.dialect = dialect
+        self.sniff_size = sniff_size
+        self._feed = _LineFeed()
+        self._reader: Iterator[list[str]] | None = None
+        self._fieldnames: list[str] | None = None
+        self._header_read = False
+        self._tail = ""
+        self.read_seconds = 0.0
+        self.parse_seconds = 0.0
+
+    async def fieldnames(self) -> list[str] | None:
+        """Return the first row, ``None`` for an empty file."""
+        reader = self._reader or await self._start()
+        while not self._header_read:
+            try:
+                self._fieldnames = next(reader)
+            except _NeedMoreDataError:
+                self._feed.rewind()
+                await self._fill()
+                continue
+            except StopIteration:
+                pass
+
+            self._feed.commit()
+            self._header_read = True
+        return self._fieldnames
+
+    async def batches(self) -> AsyncIterator[list[list[str]]]:
+        """Yield the rows after the header decoded from each chunk as one batch."""
+        await self.fieldnames()
+        reader = self._reader or await self._start()
+        exhausted = False
+
+        while not exhausted:
+            rows: list[list[str]] = []
+            started = perf_counter()
+            while True:
+                try:
+                    row = next(reader)
+                except _NeedMoreDataError:
+                    self._feed.rewind()
+                    break
+                except StopIteration:
+                    exhausted = True
+                    break
+                self._feed.commit()
+                if row:
+                    rows.append(row)
+            self.parse_seconds += perf_counter() - started
+
+            if rows:
+                yield rows
+            if not exhausted:
+                await self._fill()
+
+    async def column_batches(self, indexes: Sequence[int]) -> AsyncIterator[list[list[str | None]]]:
+        """Yield the values of the columns at ``indexes`` of every batch of rows, one list per index."""
+        async for rows in self.batches():
+            started = perf_counter()
+            columns = split_columns(rows, indexes)
+            self.parse_seconds += perf_counter() - started
+            yield columns
+
+    async def _start(self) -> Iterator[list[str]]:
+        started = perf_counter()
+        sample = b""
+        final = False
+        while len(sample) < self.sniff_size:
+            chunk = await anext(self._chunks, None)
+            if chunk is None:
+                final = True
+                break
+            sample += chunk
+        self.read_seconds += perf_counter() - started
+
+        if self.dialect is None:
+            self.dialect = sniff_dialect(sample, final=final)
+        self._decoder = getincrementaldecoder(self.dialect.encoding)()
+        self._encoding_label = ENCODING_LABELS.get(self.dialect.encoding, self.dialect.encoding)
+        self._reader = csv_reader(self._feed, delimiter=self.dialect.delimiter, quotechar=self.dialect.quotechar)
+        self._decode(sample, final=final)
+        return self._reader
+
+    async def _fill(self) -> None:
+        started = perf_counter()
+        chunk = await anext(self._chunks, None)
+        try:
+            self._decode(chunk or b"", final=chunk is None)
+        finally:
+            self.read_seconds += perf_counter() - started
+
+    def _decode(self, chunk: bytes, *, final: bool) -> None:
+        try:
+            text = self._decoder.decode(chunk, final=final)
+        except UnicodeDecodeError as exc:
+            raise CsvNormalizationError(f"CSV is not valid {self._encoding_label}") from exc
+
+        text = self._tail + text
+        if final:
+            self._tail = ""
+            self._push(text)
+            self._feed.exhausted = True
+            return
+
+        # Keep the trailing partial line (and a possibly split ``\r\n``) for the next chunk.
+        cut = text.rfind("\n") + 1
+        self._tail = text[cut:]
+        self._push(text[:cut])
+
+    def _push(self, text: str) -> None:
+        """Hand whole lines of decoded text over to parsing."""
+        self._feed.extend(text)
+
+
+def split_columns(rows: list[list[str]], indexes: Sequence[int]) -> list[list[str | None]]:
+    """Pick the columns at ``indexes`` out of ``rows``; fields missing from the end of short rows read as ``None``."""
+    width = 1 + max(indexes)
+    if min(map(len, rows), default=width) < width:
+        for row in rows:
+            row.extend([None] * (width - len(row)))  # type: ignore[list-item]
+    return [list(map(itemgetter(index), rows)) for index in indexes]
+
+
+def csv_reader_factory(
+    engine: ParserEngine,
+    *,
+    sniff_size: int,
+    block_size: int,
+) -> Callable[[AsyncIterator[bytes]], IncrementalCsvReader]:
+    """Return what opens a reader of ``engine`` over a stream of chunks.
+
+    An engine whose optional dependency is missing fails here, once, rather than on every upload.
+    """
+    if engine is ParserEngine.PYARROW:
+        # pyarrow is an optional dependency, only needed for its parser engine
+        try:
+            reader_class = import_module("app.app_layer.services.csv_normalization.arrow_reader").ArrowCsvReader
+        except ImportError as exc:
+            raise CsvNormalizationError("The pyarrow parser engine needs pyarrow, install the 'arrow' extra") from exc
+        return partial(reader_class, sniff_size=sniff_size, block_size=block_size)
+    return partial(IncrementalCsvReader, sniff_size=sniff_size)
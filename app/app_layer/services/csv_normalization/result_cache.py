@@ -0,0 +1,202 @@
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Hashable
+from contextlib import suppress
+from hashlib import blake2b
+from os import utime
+from pathlib import Path
+from re import compile as compile_pattern
+from typing import BinaryIO
+from uuid import uuid4
+
+from pydantic import BaseModel
+from starlette.datastructures import UploadFile
+
+from app.app_layer.interfaces.services.csv_normalization import CsvNormalizationSummaryDTO
+from app.app_layer.services.csv_normalization.metrics import CsvNormalizationMetrics
+from app.app_layer.services.csv_normalization.normalizer import DataNormalizer
+from app.configs.base import settings
+
+# Part of every key; bump it when a change of the normalizer changes outputs of the same upload
+RESULT_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_KEY_PATTERN = compile_pattern(r"[0-9a-f]{32}")
+
+
+class CachedResult(BaseModel):
+    """What is served with a cached output besides its bytes."""
+
+    content_type: str
+    summary: CsvNormalizationSummaryDTO
+
+
+class CsvResultCache:
+    """Normalized outputs on local disk, keyed by a hash of the upload and of everything shaping its output.
+
+    The least recently used outputs are evicted once they take more than ``max_bytes``. An output
+    is written under a temporary name and only cached once it was written whole, so a client that
+    disconnects or a normalization that fails leaves nothing behind.
+    """
+
+    def __init__(
+        self,
+        normalizer: DataNormalizer,
+        *,
+        metrics: CsvNormalizationMetrics | None = None,
+        cache_dir: Path | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        self.normalizer = normalizer
+        self.metrics = metrics
+        self.cache_dir = cache_dir or settings.normalizer.result_cache_dir
+        self.max_bytes = settings.normalizer.result_cache_max_bytes if max_bytes is None else max_bytes
+        # Output sizes, least recently used first
+        self._sizes: OrderedDict[str, int] = OrderedDict()
+        if self.enabled:
+            self._load()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @property
+    def size(self) -> int:
+        return sum(self._sizes.values())
+
+    async def key(self, file: UploadFile, options: Hashable) -> str:
+        """Hash the bytes of ``file``, rewinding it afterwards, with the request's ``options``.
+
+        The normalizer settings, including its numbering plans and how date layouts are detected,
+        the file name and its ``Content-Encoding`` are part of the key too, as they change the output
+        of the same bytes.
+        """
+        digest = blake2b(digest_size=16)
+        digest.update(
+            repr(
+                (
+                    RESULT_VERSION,
+                    self.normalizer.phone_cache_namespace,
+                    self.normalizer.dob_cache_namespace,
+                    self.normalizer.dob_sample_rows,
+                    self.normalizer.dob_layout_min_share,
+                    file.filename,
+                    file.headers.get("content-encoding"),
+                    options,
+                ),
+            ).encode(),
+        )
+        while chunk := await file.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        await file.seek(0)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> CachedResult | None:
+        """Return what is served with the output of ``key``, found at ``content_path``, if it is cached."""
+        if not _KEY_PATTERN.fullmatch(key):
+            self._observe_lookup("miss")
+            return None
+        try:
+            cached = CachedResult.model_validate_json(self._result_path(key).read_bytes())
+            # Recency survives restarts as the modification time
+            utime(self._result_path(key))
+            # Outputs cached by other processes sharing the directory count from their first hit here
+            self._sizes[key] = self.content_path(key).stat().st_size
+        except FileNotFoundError:
+            # Evicted by another process sharing the directory, or removed by hand
+            self._sizes.pop(key, None)
+            self._observe_size()
+            self._observe_lookup("miss")
+            return None
+
+        self._sizes.move_to_end(key)
+        self._observe_lookup("hit")
+        return cached
+
+    def content_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.out"
+
+    def put(self, key: str, content: bytes, summary: CsvNormalizationSummaryDTO, content_type: str) -> None:
+        partial = self._partial_path(key)
+        try:
+            partial.write_bytes(content)
+            self._add(key, partial, CachedResult(content_type=content_type, summary=summary))
+        finally:
+            partial.unlink(missing_ok=True)
+
+    async def store(
+        self,
+        key: str,
+        content: AsyncIterator[bytes],
+        summary: CsvNormalizationSummaryDTO,
+        content_type: str,
+    ) -> AsyncIterator[bytes]:
+        """Pass ``content`` through, caching a copy of it once it was read to the end.
+
+        ``summary`` is cached as it is then, since the summary of a stream is only complete at its end.
+        """
+        partial = self._partial_path(key)
+        copy: BinaryIO | None = partial.open("wb")
+        try:
+            async for chunk in content:
+                if copy is not None:
+                    try:
+                        copy.write(chunk)
+                    except OSError:
+                        # A full disk costs the cache entry, not the response
+                        copy.close()
+                        copy = None
+                yield chunk
+
+            if copy is not None:
+                copy.close()
+                copy = None
+                self._add(key, partial, CachedResult(content_type=content_type, summary=summary))
+        finally:
+            if copy is not None:
+                copy.close()
+            partial.unlink(missing_ok=True)
+
+    def _load(self) -> None:
+        """Take over the outputs cached by earlier processes, least recently used first."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            with suppress(FileNotFoundError):
+                entries.append((path.stat().st_mtime, path.stem, self.content_path(path.stem).stat().st_size))
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+        self._observe_size()
+
+    def _add(self, key: str, partial: Path, cached: CachedResult) -> None:
+        size = partial.stat().st_size
+        if size > self.max_bytes:
+            return
+        # The output is in place before its result, as only keys with a result are looked up
+        partial.replace(self.content_path(key))
+        self._result_path(key).write_text(cached.model_dump_json(), encoding="utf-8")
+        self._sizes[key] = size
+        self._sizes.move_to_end(key)
+
+        total = self.size
+        while total > self.max_bytes:
+            evicted, evicted_size = self._sizes.popitem(last=False)
+            self._result_path(evicted).unlink(missing_ok=True)
+            self.content_path(evicted).unlink(missing_ok=True)
+            total -= evicted_size
+        self._observe_size()
+
+    def _observe_lookup(self, result: str) -> None:
+        if self.metrics is not None:
+            self.metrics.result_cache_lookups.inc(result=result)
+
+    def _observe_size(self) -> None:
+        if self.metrics is not None:
+            self.metrics.result_cache_bytes.set(self.size)
+
+    def _result_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _partial_path(self, key: str) -> Path:
+        # Unique, as identical uploads may be normalized at the same time
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        return self.cache_dir / f"{key}.{uuid4().hex}.part"
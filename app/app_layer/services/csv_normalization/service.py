@@ -1,6 +1,12 @@
-from csv import DictReader, DictWriter
-from io import StringIO
+from asyncio import CancelledError, Future, gather, get_running_loop
+from collections import deque
+from collections.abc import AsyncIterator, Mapping
+from concurrent.futures import Executor
+from functools import partial
+from io import BytesIO
 from logging import getLogger
+from pathlib import Path
+from time import perf_counter
 
 from starlette.datastructures import UploadFile
 
@@ -8,109 +14,557 @@ from app.app_layer.interfaces.services.csv_normalization import (
     CsvFileError,
     CsvNormalizationDTO,
     CsvNormalizationError,
-    CsvSkippedRow,
+    CsvNormalizationStreamDTO,
+    CsvNormalizationSummaryDTO,
+    DedupPolicy,
+    DeltaMode,
     MissingColumnError,
+    OutputFormat,
+    ParserEngine,
 )
 from app.app_layer.interfaces.services.csv_normalization.service import AbstractCSVService
+from app.app_layer.services.csv_normalization.batch import (
+    NormalizedBatch,
+    RowBatch,
+    format_csv,
+    normalize_batch,
+    normalize_in_worker,
+    warm_up_worker,
+)
+from app.app_layer.services.csv_normalization.compression import (
+    decompress_chunks,
+    detect_compression,
+    strip_compression_suffix,
+)
+from app.app_layer.services.csv_normalization.dedup import Deduplicator, IdHashIndex
+from app.app_layer.services.csv_normalization.delta import CsvDeltaIndexStore, DeltaIndex, DeltaNormalization
+from app.app_layer.services.csv_normalization.metrics import CsvNormalizationMetrics, NormalizationRun
 from app.app_layer.services.csv_normalization.normalizer import DataNormalizer
+from app.app_layer.services.csv_normalization.output import OutputWriter, create_output_writer
+from app.app_layer.services.csv_normalization.reader import IncrementalCsvReader, csv_reader_factory
+from app.app_layer.services.csv_normalization.skip_report import CsvSkipReportStore, SkipReport
+from app.configs.base import settings
+from app.configs.data_normalizer import DataNormalizerSettings
 
 logger = getLogger(__name__)
 
+WARM_UP_CSV = b"id;phone;dob\nW001;+971 50 123 4567;02.01.1990\nW002;050-123-4567;Apr-05-2004\n"
+
 
 class CSVService(AbstractCSVService):
-    """Service responsible for normalizing contact data stored in CSV uploads."""
+    """Service responsible for normalizing contact data stored in CSV uploads.
+
+    Every normalization keeps its state in the generators it creates, so a single instance serves
+    all requests of the process.
+    """
 
-    def __init__(self, normalizer: DataNormalizer) -> None:
+    def __init__(  # noqa: PLR0913
+        self,
+        normalizer: DataNormalizer,
+        *,
+        executor: Executor | None = None,
+        metrics: CsvNormalizationMetrics | None = None,
+        skip_reports: CsvSkipReportStore | None = None,
+        delta_indexes: CsvDeltaIndexStore | None = None,
+        normalizer_settings: DataNormalizerSettings | None = None,
+    ) -> None:
+        normalizer_settings = normalizer_settings or settings.normalizer
         self.normalizer = normalizer
+        # Its workers got ``normalizer`` from the ``init_worker`` initializer, batches are sent without it
+        self.executor = executor
+        self.metrics = metrics
+        self.skip_reports = skip_reports
+        self.delta_indexes = delta_indexes
+        self.chunk_size = normalizer_settings.stream_chunk_size
+        self.open_reader = csv_reader_factory(
+            ParserEngine(normalizer_settings.parser_engine),
+            sniff_size=normalizer_settings.sniff_size,
+            block_size=normalizer_settings.parser_block_size,
+        )
+        self.parquet_row_group_rows = normalizer_settings.parquet_row_group_rows
+        self.dedup_max_ids = normalizer_settings.dedup_max_ids
+        self.parallel_threshold = normalizer_settings.parallel_threshold_bytes
+        self.parallel_batch_rows = normalizer_settings.parallel_batch_rows
+        self.parallel_worker_count = normalizer_settings.parallel_worker_count
+        self.prestart_workers = normalizer_settings.prestart_workers
+        # Enough queued batches to keep every worker busy while results are written out in order
+        self.max_pending_batches = 2 * self.parallel_worker_count
+
+    async def process(  # noqa: PLR0913
+        self,
+        file: UploadFile,
+        *,
+        skip_report: bool = False,
+        country: str | None = None,
+        output_format: OutputFormat = OutputFormat.CSV,
+        dedup: DedupPolicy | None = None,
+        confidence: bool = False,
+        delta: DeltaMode | None = None,
+        delta_base: str | None = None,
+    ) -> CsvNormalizationDTO:
+        result = await self.stream(
+            file,
+            skip_report=skip_report,
+            country=country,
+            output_format=output_format,
+            dedup=dedup,
+            confidence=confidence,
+            delta=delta,
+            delta_base=delta_base,
+        )
+        content = b"".join([chunk async for chunk in result.content])
+
+        return CsvNormalizationDTO(
+            content=content,
+            content_type=result.content_type,
+            **result.summary.model_dump(),
+        )
+
+    async def stream(  # noqa: PLR0913
+        self,
+        file: UploadFile,
+        *,
+        skip_report: bool = False,
+        country: str | None = None,
+        output_format: OutputFormat = OutputFormat.CSV,
+        dedup: DedupPolicy | None = None,
+        confidence: bool = False,
+        delta: DeltaMode | None = None,
+        delta_base: str | None = None,
+    ) -> CsvNormalizationStreamDTO:
+        """Validate the CSV header and return the normalized rows as a lazily produced byte stream.
+
+        With ``skip_report`` every skipped row is also written to a report of the skip report store,
+        available under ``summary.skip_report_id`` once the stream is exhausted. Phone numbers are
+        read in the numbering plan of their row's ``country`` column or else of ``country``, an ISO
+        region or a calling code, falling back to the default country. Rows are written as CSV or,
+        with ``output_format``, as an Arrow IPC stream or a Parquet file.
+
+        Uploads compressed with gzip, zstd or bzip2, as told by their ``Content-Encoding``, media type
+        or file suffix, are decompressed on the fly. The encoding (UTF-8, UTF-16 or cp1252), delimiter
+        and quote character are sniffed from the first ``sniff_size`` bytes.
+
+        With ``dedup`` only one row per id is written, the others are skipped as duplicates. The
+        ``LAST`` policy keeps the last row of every id, even when that row is then skipped as invalid,
+        and reads the upload twice, so the file has to be seekable.
+
+        With ``confidence`` every row gets a last ``confidence`` column naming what the normalizer
+        inferred for it: ``dob_swapped``, ``dob_century_inferred`` and ``phone_country_defaulted``
+        joined by ``|``, or ``exact``.
 
-    async def process(self, file: UploadFile) -> CsvNormalizationDTO:
-        text = await self._read_payload(file)
-        filename = await self._format_output_filename(file.filename)
-        reader = DictReader(StringIO(text), delimiter=";")
+        With ``delta`` the normalized values of every row are indexed under ``summary.delta_id``, and
+        with ``delta_base``, the ``delta_id`` of an earlier normalization, only rows that are new or
+        changed since then are normalized. The others are written with their earlier values in the
+        ``FULL`` mode and left out in the ``DIFF`` mode; rows removed since then are not reported.
+        """
+        run = NormalizationRun()
+        try:
+            self._check_country(country)
+            delta_run = await self._start_delta(delta, delta_base, dedup=dedup, confidence=confidence)
+            writer = create_output_writer(
+                output_format,
+                parquet_row_group_rows=self.parquet_row_group_rows,
+                confidence=confidence,
+            )
+            last_rows = await self._index_last_rows(file, run) if dedup is DedupPolicy.LAST else None
+            reader = self.open_reader(self._upload_chunks(file, run))
+            columns = await self._read_header(reader)
+        except CsvNormalizationError:
+            if self.metrics is not None:
+                self.metrics.normalizations.inc(outcome="rejected")
+            raise
+
+        parallel = self.executor is not None and file.size is not None and file.size >= self.parallel_threshold
+        batches = self._row_batches(
+            reader,
+            columns,
+            run,
+            min_rows=self.parallel_batch_rows if parallel else 1,
+            country=country or None,
+        )
+        if delta_run is not None:
+            batches = self._split_delta(batches, delta_run, run)
+        normalize = self._normalize_in_executor if parallel else self._normalize_inline
+        normalized_batches = normalize(
+            batches,
+            output_format,
+            keep_columns=dedup is not None or delta_run is not None,
+            confidence=confidence,
+        )
+        if delta_run is not None:
+            delta_id, index_path = self.delta_indexes.create()  # type: ignore[union-attr]
+            normalized_batches = self._merge_delta(normalized_batches, delta_run, output_format, index_path, run)
+        if dedup is not None:
+            deduplicator = Deduplicator(dedup, max_ids=self.dedup_max_ids, last_rows=last_rows)
+            normalized_batches = self._deduplicate(normalized_batches, deduplicator, output_format, run)
+        filename = await self._format_output_filename(
+            strip_compression_suffix(file.filename or ""),
+            writer.extension,
+        )
+
+        summary = CsvNormalizationSummaryDTO(filename=filename)
+        report = SkipReport()
+        if skip_report and self.skip_reports is not None:
+            summary.skip_report_id, report.spill_path = self.skip_reports.create()
+        if delta_run is not None:
+            summary.delta_id = delta_id
+
+        return CsvNormalizationStreamDTO(
+            filename=filename,
+            content=self._normalize_rows(reader, self._encode(normalized_batches, writer, run), summary, run, report),
+            content_type=writer.media_type,
+            summary=summary,
+        )
+
+    async def warm_up(self) -> None:
+        """Parse a small sample and run the normalizer's hot paths before the first upload arrives.
+
+        With ``prestart_workers`` every worker process is started as well and warms up its own copy
+        of the normalizer, instead of the first large upload waiting for them to spawn.
+        """
+        started = perf_counter()
+        workers = []
+        if self.executor is not None and self.prestart_workers:
+            loop = get_running_loop()
+            workers = [loop.run_in_executor(self.executor, warm_up_worker) for _ in range(self.parallel_worker_count)]
+        self.normalizer.warm_up()
+        run = NormalizationRun()
+        reader = self.open_reader(self._read_chunks(UploadFile(file=BytesIO(WARM_UP_CSV), filename="warm-up.csv"), run))
+        columns = await self._read_header(reader)
+        async for _ in self._row_batches(reader, columns, run, min_rows=1, country=None):
+            pass
+        await gather(*workers)
+        logger.info(f"CSV normalization warmed up in {perf_counter() - started:.3f}s")
+
+    def _check_country(self, country: str | None) -> None:
+        if country and not self.normalizer.has_phone_plan(country):
+            raise CsvNormalizationError(f"Unknown country hint: {country}")
+
+    @staticmethod
+    async def _read_header(reader: IncrementalCsvReader) -> dict[str, int]:
+        """Resolve the position of every named column; of columns named alike, the last one is read."""
+        fieldnames = await reader.fieldnames()
 
-        if reader.fieldnames is None:
+        if fieldnames is None:
             raise CsvNormalizationError("CSV header is missing")
 
-        header_lookup = {name.strip().lower(): name for name in reader.fieldnames if name}
-        missing = sorted({"id", "phone", "dob"} - set(header_lookup))
+        columns = {name.strip().lower(): index for index, name in enumerate(fieldnames) if name}
+        missing = sorted({"id", "phone", "dob"} - set(columns))
         if missing:
             raise MissingColumnError(missing)
 
-        buffer = StringIO()
-        writer = DictWriter(
-            buffer,
-            fieldnames=("id", "phone", "dob"),
-            delimiter=";",
-            lineterminator="\n",
+        return columns
+
+    async def _normalize_rows(
+        self,
+        reader: IncrementalCsvReader,
+        encoded_batches: AsyncIterator[tuple[NormalizedBatch | None, bytes]],
+        summary: CsvNormalizationSummaryDTO,
+        run: NormalizationRun,
+        report: SkipReport,
+    ) -> AsyncIterator[bytes]:
+        if self.metrics is not None:
+            self.metrics.in_flight.inc()
+        outcome = "failed"
+        try:
+            async for normalized, content in encoded_batches:
+                if normalized is not None:
+                    report.add(normalized.skipped)
+                    summary.processed_rows += normalized.processed_rows
+                    summary.unchanged_rows += normalized.unchanged_rows
+                    summary.skipped_rows = report.total
+                    summary.normalized_rows = summary.processed_rows - report.total
+                    run.add_stage_seconds(normalized.stage_seconds)
+                    if self.metrics is not None:
+                        self.metrics.observe_batch(normalized.processed_rows, normalized.skipped)
+                if content:
+                    yield content
+            outcome = "completed"
+        except (CancelledError, GeneratorExit):
+            outcome = "cancelled"
+            raise
+        finally:
+            if outcome == "completed":
+                report.close()
+            else:
+                report.discard()
+                summary.skip_report_id = None
+            run.stage_seconds["read"] = reader.read_seconds
+            run.stage_seconds["parse"] += reader.parse_seconds
+            if self.metrics is not None:
+                self.metrics.in_flight.dec()
+                self.metrics.observe_run(run, summary, outcome=outcome)
+
+        summary.skipped = report.reasons()
+
+        stats = (
+            f"processed={summary.processed_rows}, normalized={summary.normalized_rows}, skipped={summary.skipped_rows}"
         )
-        writer.writeheader()
+        details = report.details() or None
+        dialect = reader.dialect
 
-        processed_rows = 0
-        normalized_rows = 0
-        skipped_rows: list[CsvSkippedRow] = []
+        logger.info(f"CSV normalization {stats=}, {dialect=}, {details=}")
 
-        for index, row in enumerate(reader, start=2):
-            # Starting from 2 because of DictReader
-            # consumes the header as the first line
-            # and the second line is the file
-            processed_rows += 1
-            as_is_id = row.get(header_lookup["id"])
+    async def _index_last_rows(self, file: UploadFile, run: NormalizationRun) -> IdHashIndex:
+        """Read the upload once for the last row number of every id, then rewind it for normalizing."""
+        started = perf_counter()
+        index = IdHashIndex(max_entries=self.dedup_max_ids, with_values=True)
+        # Bytes and parse time of this pass are not the normalization's own
+        scan = NormalizationRun()
+        reader = self.open_reader(self._upload_chunks(file, scan))
+        columns = await self._read_header(reader)
+        async for batch in self._row_batches(reader, columns, scan, min_rows=1, country=None):
+            for row_number, row_id in enumerate(batch.ids, start=batch.first_row_number):
+                if row_id:
+                    index.put(row_id, row_number)
 
-            if not as_is_id:
-                skipped_rows.append(CsvSkippedRow(row_number=index, reason="ID value is missing"))
-                continue
+        await file.seek(0)
+        run.stage_seconds["dedup"] = perf_counter() - started
+        return index
 
-            try:
-                normalized_phone = await self.normalizer.get_phone(
-                    row.get(header_lookup["phone"]),
-                )
-                normalized_dob = await self.normalizer.get_date_of_birth(row.get(header_lookup["dob"]))
-            except ValueError as exc:
-                skipped_rows.append(CsvSkippedRow(row_number=index, reason=str(exc)))
-                continue
+    async def _start_delta(
+        self,
+        delta: DeltaMode | None,
+        delta_base: str | None,
+        *,
+        dedup: DedupPolicy | None,
+        confidence: bool,
+    ) -> DeltaNormalization | None:
+        if delta is None:
+            if delta_base:
+                raise CsvNormalizationError("A delta base is only used by a delta normalization")
+            return None
+        if dedup is not None:
+            raise CsvNormalizationError("Delta normalization can not be combined with dedup")
+        if self.delta_indexes is None:
+            raise CsvNormalizationError("Delta normalization is not available")
 
-            writer.writerow({"id": as_is_id, "phone": normalized_phone, "dob": normalized_dob})
-            normalized_rows += 1
+        base: DeltaIndex | None = None
+        if delta_base:
+            # Reading millions of digests back is left to a thread, off the event loop
+            base = await get_running_loop().run_in_executor(None, self.delta_indexes.load, delta_base)
+        return DeltaNormalization(delta, base, normalizer=self.normalizer, confidence=confidence)
 
-        summary = f"processed={processed_rows}, normalized={normalized_rows}, skipped={len(skipped_rows)}"
-        details = None
-        if skipped_rows:
-            details = "; ".join(f"row {item.row_number}: {item.reason}" for item in skipped_rows) or ""
+    @staticmethod
+    async def _split_delta(
+        batches: AsyncIterator[RowBatch],
+        delta_run: DeltaNormalization,
+        run: NormalizationRun,
+    ) -> AsyncIterator[RowBatch]:
+        """Pass on the rows of every batch that are not found unchanged in the delta base."""
+        run.stage_seconds.setdefault("delta", 0.0)
+        async for batch in batches:
+            started = perf_counter()
+            changed = delta_run.split(batch)
+            run.stage_seconds["delta"] += perf_counter() - started
+            yield changed
 
-        logger.info(f"CSV normalization {summary=}, {details=}")
+    async def _merge_delta(
+        self,
+        normalized_batches: AsyncIterator[NormalizedBatch],
+        delta_run: DeltaNormalization,
+        output_format: OutputFormat,
+        index_path: Path,
+        run: NormalizationRun,
+    ) -> AsyncIterator[NormalizedBatch]:
+        """Put the unchanged rows back into batches normalized with ``keep_columns``, then write CSV text.
 
-        return CsvNormalizationDTO(
-            filename=filename,
-            content=buffer.getvalue().encode("utf-8"),
-            processed_rows=processed_rows,
-            normalized_rows=normalized_rows,
-            skipped_rows=len(skipped_rows),
-            skipped=skipped_rows,
-        )
+        The index of the written rows appears under ``index_path`` once the last batch went through.
+        """
+        async for normalized in normalized_batches:
+            started = perf_counter()
+            merged = delta_run.merge(normalized)
+            merged_at = perf_counter()
+            run.stage_seconds["delta"] += merged_at - started
+            if output_format is OutputFormat.CSV and merged.columns is not None:
+                merged = merged._replace(content=format_csv(merged.columns), columns=None)
+                run.stage_seconds["write"] += perf_counter() - merged_at
+            yield merged
+
+        started = perf_counter()
+        await get_running_loop().run_in_executor(None, self.delta_indexes.save, delta_run.index, index_path)  # type: ignore[union-attr]
+        run.stage_seconds["delta"] += perf_counter() - started
 
     @staticmethod
-    async def _read_payload(file: UploadFile) -> str:
-        try:
-            content = await file.read()
-        except Exception as exc:  # pragma: no cover
-            raise CsvFileError("Failed to read uploaded file") from exc
+    async def _deduplicate(
+        normalized_batches: AsyncIterator[NormalizedBatch],
+        deduplicator: Deduplicator,
+        output_format: OutputFormat,
+        run: NormalizationRun,
+    ) -> AsyncIterator[NormalizedBatch]:
+        """Drop duplicate ids from batches normalized with ``keep_columns``, then write CSV text."""
+        run.stage_seconds.setdefault("dedup", 0.0)
+        async for normalized in normalized_batches:
+            started = perf_counter()
+            deduplicated = deduplicator.apply(normalized)
+            filtered = perf_counter()
+            run.stage_seconds["dedup"] += filtered - started
+            if output_format is OutputFormat.CSV and deduplicated.columns is not None:
+                deduplicated = deduplicated._replace(content=format_csv(deduplicated.columns), columns=None)
+                run.stage_seconds["write"] += perf_counter() - filtered
+            yield deduplicated
 
-        if not content:
-            raise CsvFileError("Uploaded file is empty")
+    @staticmethod
+    async def _encode(
+        normalized_batches: AsyncIterator[NormalizedBatch],
+        writer: OutputWriter,
+        run: NormalizationRun,
+    ) -> AsyncIterator[tuple[NormalizedBatch | None, bytes]]:
+        """Pair every batch with its encoded bytes; the header comes first, before any batch is awaited."""
+        yield None, writer.header()
+        async for normalized in normalized_batches:
+            started = perf_counter()
+            content = writer.write(normalized)
+            run.stage_seconds["write"] += perf_counter() - started
+            yield normalized, content
+
+        started = perf_counter()
+        content = writer.close()
+        run.stage_seconds["write"] += perf_counter() - started
+        yield None, content
+
+    async def _row_batches(
+        self,
+        reader: IncrementalCsvReader,
+        columns: Mapping[str, int],
+        run: NormalizationRun,
+        *,
+        min_rows: int,
+        country: str | None,
+    ) -> AsyncIterator[RowBatch]:
+        indexes = [columns["id"], columns["phone"], columns["dob"]]
+        # The optional country column overrides the upload's hint, row by row
+        country_index = columns.get("country")
+        if country_index is not None:
+            indexes.append(country_index)
+        # Starting from 2 because the header
+        # is consumed as the first line
+        # and the second line is the first row
+        batch = RowBatch(
+            first_row_number=2,
+            ids=[],
+            phones=[],
+            dobs=[],
+            countries=[] if country_index is not None else country,
+        )
+        # The first batch carries the whole sample for date layout detection, whatever the batch size
+        batch_rows = max(min_rows, self.normalizer.dob_sample_rows)
+
+        async for ids, phones, dobs, *row_countries in reader.column_batches(indexes):
+            started = perf_counter()
+            batch.ids.extend(ids)
+            batch.phones.extend(phones)
+            batch.dobs.extend(dobs)
+            if row_countries:
+                batch.countries.extend(value or country for value in row_countries[0])  # type: ignore[union-attr]
+            run.stage_seconds["parse"] += perf_counter() - started
+            if len(batch.ids) >= batch_rows:
+                yield batch
+                batch_rows = min_rows
+                batch = RowBatch(
+                    first_row_number=batch.first_row_number + len(batch.ids),
+                    ids=[],
+                    phones=[],
+                    dobs=[],
+                    countries=[] if country_index is not None else country,
+                )
+
+        if batch.ids:
+            yield batch
+
+    async def _normalize_inline(
+        self,
+        batches: AsyncIterator[RowBatch],
+        output_format: OutputFormat,
+        *,
+        keep_columns: bool = False,
+        confidence: bool = False,
+    ) -> AsyncIterator[NormalizedBatch]:
+        dob_profile = None
+        async for batch in batches:
+            if dob_profile is None:
+                dob_profile = self.normalizer.detect_dob_layouts(batch.dobs)
+            yield normalize_batch(
+                self.normalizer,
+                batch,
+                dob_profile,
+                output_format,
+                keep_columns=keep_columns,
+                confidence=confidence,
+            )
+
+    async def _normalize_in_executor(
+        self,
+        batches: AsyncIterator[RowBatch],
+        output_format: OutputFormat,
+        *,
+        keep_columns: bool = False,
+        confidence: bool = False,
+    ) -> AsyncIterator[NormalizedBatch]:
+        """Normalize batches in worker processes, yielding results in the original row order."""
+        loop = get_running_loop()
+        pending: deque[Future[NormalizedBatch]] = deque()
+        dob_profile = None
 
         try:
-            decoded = content.decode("utf-8")
-        except UnicodeDecodeError as exc:
-            raise CsvNormalizationError("CSV must be encoded as UTF-8") from exc
+            async for batch in batches:
+                if dob_profile is None:
+                    dob_profile = self.normalizer.detect_dob_layouts(batch.dobs)
+                pending.append(
+                    loop.run_in_executor(
+                        self.executor,
+                        partial(
+                            normalize_in_worker,
+                            batch,
+                            dob_profile,
+                            output_format,
+                            keep_columns=keep_columns,
+                            confidence=confidence,
+                        ),
+                    ),
+                )
+                if len(pending) >= self.max_pending_batches:
+                    yield await pending.popleft()
+
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for future in pending:
+                future.cancel()
 
-        return decoded
+    def _upload_chunks(self, file: UploadFile, run: NormalizationRun) -> AsyncIterator[bytes]:
+        chunks = self._read_chunks(file, run)
+        compression = detect_compression(file.filename, file.headers)
+        if compression is None:
+            return chunks
+        return decompress_chunks(chunks, compression, max_chunk_size=self.chunk_size)
+
+    async def _read_chunks(self, file: UploadFile, run: NormalizationRun) -> AsyncIterator[bytes]:
+        received = False
+        while True:
+            try:
+                chunk = await file.read(self.chunk_size)
+            except CsvNormalizationError:
+                raise
+            except Exception as exc:  # pragma: no cover
+                raise CsvFileError("Failed to read uploaded file") from exc
+
+            if not chunk:
+                break
+            received = True
+            run.upload_bytes += len(chunk)
+            yield chunk
+
+        if not received:
+            raise CsvFileError("Uploaded file is empty")
 
     @staticmethod
-    async def _format_output_filename(original: str | None) -> str:
-        """Return a deterministic CSV filename prefixed with ``normalized-``."""
+    async def _format_output_filename(original: str | None, extension: str = ".csv") -> str:
+        """Return a deterministic filename prefixed with ``normalized-``, with ``extension`` replacing ``.csv``."""
         base = (original or "contacts.csv").strip() or "contacts.csv"
         if not base.lower().startswith("normalized-"):
             base = f"normalized-{base}"
-        if not base.lower().endswith(".csv"):
-            base = f"{base}.csv"
+        if not base.lower().endswith(extension):
+            stem = base[:-4] if base.lower().endswith(".csv") else base
+            base = f"{stem}{extension}"
         return base
@@ -0,0 +1,112 @@
+from collections import Counter
+from collections.abc import Sequence
+from contextlib import suppress
+from csv import writer as csv_writer
+from pathlib import Path
+from re import compile as compile_pattern
+from time import time
+from typing import TextIO
+from uuid import uuid4
+
+from app.app_layer.interfaces.services.csv_normalization import CsvSkipReason
+from app.app_layer.services.csv_normalization.batch import SkippedRow
+from app.configs.base import settings
+
+_REPORT_ID_PATTERN = compile_pattern(r"[0-9a-f]{32}")
+
+
+class SkipReport:
+    """Aggregate skipped rows by reason, keeping counts and the first row numbers of every reason.
+
+    Memory stays bounded by the number of distinct reasons; the complete list of skipped rows is
+    only written to ``spill_path`` when one is given, and that file appears once the report is closed.
+    """
+
+    def __init__(self, *, sample_size: int | None = None, spill_path: Path | None = None) -> None:
+        self.sample_size = settings.normalizer.skip_sample_rows if sample_size is None else sample_size
+        self.spill_path = spill_path
+        self.total = 0
+        self._counts: Counter[str] = Counter()
+        self._samples: dict[str, list[int]] = {}
+        self._spill: TextIO | None = None
+
+    def add(self, skipped: Sequence[SkippedRow]) -> None:
+        if not skipped:
+            return
+
+        self.total += len(skipped)
+        for item in skipped:
+            self._counts[item.reason] += 1
+            sample = self._samples.setdefault(item.reason, [])
+            if len(sample) < self.sample_size:
+                sample.append(item.row_number)
+
+        if self.spill_path is not None:
+            if self._spill is None:
+                self._spill = self._open_spill(self.spill_path)
+            csv_writer(self._spill, delimiter=";", lineterminator="\n").writerows(
+                (item.row_number, item.reason) for item in skipped
+            )
+
+    def reasons(self) -> list[CsvSkipReason]:
+        return [
+            CsvSkipReason(reason=reason, count=count, row_numbers=self._samples[reason])
+            for reason, count in self._counts.most_common()
+        ]
+
+    def details(self) -> str:
+        """One line aggregate for logs."""
+        return "; ".join(f"{reason}: {count}" for reason, count in self._counts.most_common())
+
+    def close(self) -> None:
+        if self.spill_path is None:
+            return
+        if self._spill is None:
+            self._spill = self._open_spill(self.spill_path)
+        self._spill.close()
+        self._partial_path(self.spill_path).replace(self.spill_path)
+
+    def discard(self) -> None:
+        if self._spill is not None:
+            self._spill.close()
+        if self.spill_path is not None:
+            self._partial_path(self.spill_path).unlink(missing_ok=True)
+
+    def _open_spill(self, path: Path) -> TextIO:
+        spill = self._partial_path(path).open("w", encoding="utf-8", newline="")
+        spill.write("row_number;reason\n")
+        return spill
+
+    @staticmethod
+    def _partial_path(path: Path) -> Path:
+        return path.with_name(f"{path.name}.part")
+
+
+class CsvSkipReportStore:
+    """Skip reports on local disk, removed once older than the TTL."""
+
+    def __init__(self, *, reports_dir: Path | None = None, ttl_seconds: int | None = None) -> None:
+        self.reports_dir = reports_dir or settings.normalizer.skip_report_dir
+        self.ttl_seconds = settings.normalizer.skip_report_ttl_seconds if ttl_seconds is None else ttl_seconds
+
+    def create(self) -> tuple[str, Path]:
+        """Reserve a report id and the path its report is written to."""
+        self.reports_dir.mkdir(parents=True, exist_ok=True)
+        self.cleanup()
+        report_id = uuid4().hex
+        return report_id, self.reports_dir / f"{report_id}.csv"
+
+    def path(self, report_id: str) -> Path | None:
+        """Return the finished report, or ``None`` when it is unknown, expired or still being written."""
+        if not _REPORT_ID_PATTERN.fullmatch(report_id):
+            return None
+        path = self.reports_dir / f"{report_id}.csv"
+        return path if path.is_file() else None
+
+    def cleanup(self) -> None:
+        stale_before = time() - self.ttl_seconds
+        for path in self.reports_dir.iterdir():
+            # Reports still being written keep a fresh modification time
+            with suppress(FileNotFoundError):
+                if path.stat().st_mtime < stale_before:
+                    path.unlink()
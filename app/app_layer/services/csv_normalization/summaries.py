@@ -0,0 +1,21 @@
+from collections import OrderedDict
+
+from app.app_layer.interfaces.services.csv_normalization import CsvNormalizationSummaryDTO
+from app.configs.base import settings
+
+
+class CsvSummaryStore:
+    """Keep the most recent streaming summaries, evicting the oldest beyond ``max_entries``."""
+
+    def __init__(self, *, max_entries: int | None = None) -> None:
+        self.max_entries = max_entries or settings.normalizer.summary_store_size
+        self._summaries: OrderedDict[str, CsvNormalizationSummaryDTO] = OrderedDict()
+
+    def save(self, summary_id: str, summary: CsvNormalizationSummaryDTO) -> None:
+        self._summaries[summary_id] = summary
+        self._summaries.move_to_end(summary_id)
+        while len(self._summaries) > self.max_entries:
+            self._summaries.popitem(last=False)
+
+    def get(self, summary_id: str) -> CsvNormalizationSummaryDTO | None:
+        return self._summaries.get(summary_id)
@@ -0,0 +1,157 @@
+from asyncio import Condition
+from collections.abc import AsyncIterator
+from os import pread
+from pathlib import Path
+from time import monotonic
+from typing import BinaryIO
+
+from starlette.datastructures import Headers, UploadFile
+
+from app.app_layer.interfaces.services.csv_normalization import (
+    CsvFileError,
+    CsvUploadIncompleteError,
+    CsvUploadRangeError,
+    CsvUploadSessionDTO,
+)
+
+
+class UploadSession:
+    """Chunks of one resumable upload, written in any order into a file of the declared size.
+
+    Received bytes are tracked as merged ``[start, end)`` ranges. Readers wait for the range that
+    starts at byte zero to grow, so normalizing starts with the first chunk rather than the last.
+    """
+
+    def __init__(self, job_id: str, path: Path, *, filename: str, size: int) -> None:
+        self.job_id = job_id
+        self.path = path
+        self.filename = filename
+        self.size = size
+        self.ranges: list[tuple[int, int]] = []
+        self.finalized = False
+        self.touched_at = monotonic()
+        # Set once the job is done with the file, or with the reason it has to give up waiting
+        self.closed_reason: str | None = None
+        self._changed = Condition()
+        with path.open("wb") as target:
+            target.truncate(size)
+
+    @property
+    def received_bytes(self) -> int:
+        return sum(end - start for start, end in self.ranges)
+
+    @property
+    def contiguous_bytes(self) -> int:
+        """Bytes received in one piece from the start of the file, the part normalizing may read."""
+        if self.ranges and self.ranges[0][0] == 0:
+            return self.ranges[0][1]
+        return 0
+
+    def missing_ranges(self) -> list[tuple[int, int]]:
+        missing = []
+        position = 0
+        for start, end in [*self.ranges, (self.size, self.size)]:
+            if start > position:
+                missing.append((position, start - 1))
+            position = end
+        return missing
+
+    async def write(self, first: int, last: int, chunks: AsyncIterator[bytes]) -> int:
+        """Write ``chunks`` as bytes ``first`` to ``last`` and return how many bytes were written.
+
+        Every chunk is recorded as it lands, so a dropped connection keeps what arrived.
+        """
+        self._check_open()
+        if not 0 <= first <= last < self.size:
+            raise CsvUploadRangeError(f"Bytes {first}-{last} are outside an upload of {self.size} bytes")
+        position = first
+        with self.path.open("r+b") as target:
+            target.seek(first)
+            async for chunk in chunks:
+                self._check_open()
+                if position + len(chunk) > last + 1:
+                    raise CsvUploadRangeError(f"Body is longer than bytes {first}-{last}")
+                target.write(chunk)
+                # Readers open the file on their own, the bytes have to leave this buffer first
+                target.flush()
+                self._add_range(position, position + len(chunk))
+                position += len(chunk)
+                await self._notify()
+        return position - first
+
+    async def finalize(self) -> None:
+        missing = self.size - self.received_bytes
+        if missing:
+            raise CsvUploadIncompleteError(f"Upload is missing {missing} of {self.size} bytes")
+        self.finalized = True
+        await self._notify()
+
+    async def wait_for(self, offset: int) -> int:
+        """Wait until bytes past ``offset`` can be read, then return where the readable part ends."""
+        async with self._changed:
+            await self._changed.wait_for(
+                lambda: self.contiguous_bytes > offset or offset >= self.size or self.closed_reason is not None,
+            )
+        if self.contiguous_bytes <= offset < self.size:
+            raise CsvFileError(self.closed_reason or "Upload was closed")
+        return self.contiguous_bytes
+
+    async def close(self, reason: str) -> None:
+        if self.closed_reason is None:
+            self.closed_reason = reason
+            await self._notify()
+
+    def to_dto(self) -> CsvUploadSessionDTO:
+        missing = self.missing_ranges()
+        return CsvUploadSessionDTO(
+            job_id=self.job_id,
+            filename=self.filename,
+            size=self.size,
+            received_bytes=self.received_bytes,
+            next_offset=missing[0][0] if missing else self.size,
+            missing_ranges=missing,
+            finalized=self.finalized,
+        )
+
+    def _check_open(self) -> None:
+        if self.closed_reason is not None:
+            raise CsvUploadRangeError(f"Upload no longer accepts bytes: {self.closed_reason}")
+
+    def _add_range(self, start: int, end: int) -> None:
+        merged: list[tuple[int, int]] = []
+        for range_start, range_end in sorted([*self.ranges, (start, end)]):
+            if merged and range_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], range_end))
+            else:
+                merged.append((range_start, range_end))
+        self.ranges = merged
+        self.touched_at = monotonic()
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+
+class SessionUploadFile(UploadFile):
+    """Upload read from a session's file while it is still being written.
+
+    Reads wait for more bytes instead of ending early, and end once all ``size`` bytes were read.
+    """
+
+    def __init__(self, session: UploadSession, file: BinaryIO) -> None:
+        # No headers: the compression of a chunked upload is told by its file name
+        super().__init__(file=file, size=session.size, filename=session.filename, headers=Headers())
+        self.session = session
+        self.position = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        available = await self.session.wait_for(self.position)
+        if size < 0 or self.position + size > available:
+            size = available - self.position
+        # Positional reads, as a buffered read ahead would keep the zeros of bytes not written yet
+        chunk = pread(self.file.fileno(), size, self.position)
+        self.position += len(chunk)
+        return chunk
+
+    async def seek(self, offset: int) -> None:
+        self.position = offset
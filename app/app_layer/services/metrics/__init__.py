@@ -0,0 +1,11 @@
+from .http import HttpMetrics
+from .registry import CONTENT_TYPE, Counter, Gauge, Histogram, MetricsRegistry
+
+__all__ = [
+    "CONTENT_TYPE",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "HttpMetrics",
+    "MetricsRegistry",
+]
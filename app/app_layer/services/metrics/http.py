@@ -0,0 +1,19 @@
+from app.app_layer.services.metrics.registry import MetricsRegistry
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class HttpMetrics:
+    """Request rate, latency and concurrency of the HTTP API."""
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        self.in_flight = registry.gauge(
+            "http_requests_in_flight",
+            "HTTP requests currently being handled, response body included.",
+        )
+        self.duration = registry.histogram(
+            "http_request_duration_seconds",
+            "Time from receiving an HTTP request until its response body is sent.",
+            ("method", "route", "status"),
+            buckets=DURATION_BUCKETS,
+        )
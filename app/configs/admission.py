@@ -0,0 +1,29 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class AdmissionSettings(BaseSettings):
+    max_in_flight_bytes: int = Field(
+        default=512 * 1024 * 1024,
+        description="Upload bytes the normalize endpoint handles at once; further uploads wait or are rejected.",
+    )
+    max_in_flight_rows: int = Field(
+        default=10_000_000,
+        description="Rows the normalize endpoint handles at once, estimated from upload sizes.",
+    )
+    estimated_row_bytes: int = Field(
+        default=32,
+        description="Bytes per row assumed when estimating the rows of an upload from its size.",
+    )
+    max_queued_requests: int = Field(
+        default=32,
+        description="Uploads waiting for the in-flight budget before new ones are rejected with 429.",
+    )
+    queue_timeout_seconds: float = Field(
+        default=30.0,
+        description="Seconds an upload waits for the in-flight budget before it is rejected with 503.",
+    )
+    retry_after_seconds: int = Field(
+        default=10,
+        description="Seconds sent in the Retry-After header of rejected uploads.",
+    )
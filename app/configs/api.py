@@ -7,5 +7,13 @@ class APISettings(BaseSettings):
     internal_prefix: str = "/api/internal"
     docs_enabled: bool = True
     docs_version: str = Field("unknown", validation_alias="VERSION")
+    response_compression: bool = Field(
+        default=True,
+        description="Compress responses with zstd or gzip when the client's Accept-Encoding allows it.",
+    )
+    response_compression_min_size: int = Field(
+        default=1024,
+        description="Responses smaller than this many bytes are sent uncompressed.",
+    )
 
     model_config = SettingsConfigDict(env_prefix="API__", extra="ignore")
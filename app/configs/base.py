@@ -1,39 +1,27 @@
-import json
-from pathlib import Path
+from functools import cache
+from typing import TYPE_CHECKING, Any, cast
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+if TYPE_CHECKING:
+    from app.configs.settings import Settings
 
-from app.configs.api import APISettings
-from app.configs.data_normalizer import DataNormalizerSettings
-from app.configs.logging import configure_logging
-from app.configs.uvicorn import UvicornSettings
 
-CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.json"
+@cache
+def get_settings() -> "Settings":
+    """Read ``config.json`` and build the settings on first use rather than on import.
 
+    Building them imports pydantic-settings, which alone takes longer than most CLI commands and
+    worker processes need to start.
+    """
+    from app.configs.settings import Settings  # noqa: PLC0415
 
-class Settings(BaseSettings):
-    api: APISettings = APISettings()
-    uvicorn: UvicornSettings = UvicornSettings()
-    normalizer: DataNormalizerSettings = DataNormalizerSettings()
+    return Settings.load()
 
-    model_config = SettingsConfigDict(env_nested_delimiter="__", extra="ignore")
 
-    @classmethod
-    def load(cls, path: Path = CONFIG_PATH) -> "Settings":
-        if not path.exists():
-            return cls()
+class _LazySettings:
+    """Stand-in for the settings that builds them on the first attribute read."""
 
-        try:
-            raw = path.read_text(encoding="utf-8")
-            payload = json.loads(raw) if raw.strip() else {}
-        except json.JSONDecodeError as exc:
-            raise ValueError(f"Invalid JSON configuration at {path}") from exc
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
 
-        if not payload:
-            raise ValueError("config.json was not found.")
 
-        return cls(**payload)
-
-
-settings = Settings.load()
-configure_logging()
+settings = cast("Settings", _LazySettings())
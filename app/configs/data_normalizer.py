@@ -1,3 +1,8 @@
+from os import cpu_count
+from pathlib import Path
+from tempfile import gettempdir
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -38,10 +43,114 @@ class DataNormalizerSettings(BaseSettings):
         default=25,
         description="Two-digit birth years <= pivot map to 20xx, otherwise to 19xx.",
     )
+    numbering_plans_path: Path | None = Field(
+        default=None,
+        description="JSON file of country calling codes and national number lengths; defaults to the bundled one.",
+    )
+    strict_phone_numbering: bool = Field(
+        default=False,
+        description="Reject phone numbers no numbering plan accepts instead of formatting them with generic rules.",
+    )
     base_year: int = Field(
         default=1900,
         description="Lower bound for interpreting four-digit birth years.",
     )
+    stream_chunk_size: int = Field(
+        default=64 * 1024,
+        description="Number of bytes read from an upload per step while streaming normalization.",
+    )
+    sniff_size: int = Field(
+        default=16 * 1024,
+        description="Leading bytes of an upload inspected to detect its encoding, delimiter and quote character.",
+    )
+    parser_engine: Literal["stdlib", "pyarrow"] = Field(
+        default="stdlib",
+        description="Engine splitting uploads into fields; pyarrow parses faster and needs the 'arrow' extra.",
+    )
+    parser_block_size: int = Field(
+        default=4 * 1024 * 1024,
+        description="Characters of an upload the pyarrow parser engine parses per call, on several threads.",
+    )
+    parquet_row_group_rows: int = Field(
+        default=128 * 1024,
+        description="Rows buffered into one Parquet row group when normalizing to Parquet.",
+    )
+    summary_store_size: int = Field(
+        default=1024,
+        description="Number of completed streaming summaries kept in memory for the summary endpoint.",
+    )
+    dob_sample_rows: int = Field(
+        default=1000,
+        description="Leading values of a file sampled to detect its date-of-birth layouts.",
+    )
+    dob_layout_min_share: float = Field(
+        default=0.05,
+        description="Share of the sample a date-of-birth layout must cover to get a fast parser.",
+    )
+    cache_size: int = Field(
+        default=100_000,
+        description="Normalized phone and DOB values kept in the shared LRU cache; 0 disables caching.",
+    )
+    parallel_workers: int | None = Field(
+        default=None,
+        description="Processes normalizing large uploads in parallel; defaults to the number of CPU cores.",
+    )
+    prestart_workers: bool = Field(
+        default=True,
+        description="Start and warm up the worker processes with the application instead of on the first large upload.",
+    )
+    parallel_threshold_bytes: int = Field(
+        default=8 * 1024 * 1024,
+        description="Uploads of at least this size are normalized in the process pool, smaller ones inline.",
+    )
+    parallel_batch_rows: int = Field(
+        default=20_000,
+        description="Rows sent to a worker process per task.",
+    )
+    dedup_max_ids: int = Field(
+        default=20_000_000,
+        description="Distinct ids one deduplicated upload may hold, about 21 bytes of memory each.",
+    )
+    archive_concurrency: int = Field(
+        default=4,
+        description="Files of one bulk upload or zip archive normalized at the same time.",
+    )
+    skip_sample_rows: int = Field(
+        default=10,
+        description="Row numbers listed per skip reason in summaries; the full list goes to skip reports.",
+    )
+    skip_report_dir: Path = Field(
+        default=Path(gettempdir()) / "csv-normalization-skip-reports",
+        description="Local directory holding reports of every skipped row.",
+    )
+    skip_report_ttl_seconds: int = Field(
+        default=3600,
+        description="Seconds a skip report is kept.",
+    )
+    delta_index_dir: Path = Field(
+        default=Path(gettempdir()) / "csv-normalization-delta-indexes",
+        description="Local directory holding the row digests and values later delta normalizations compare against.",
+    )
+    delta_index_ttl_seconds: int = Field(
+        default=3 * 24 * 3600,
+        description="Seconds a delta index is kept, long enough to skip a day of daily exports.",
+    )
+    delta_max_rows: int = Field(
+        default=10_000_000,
+        description="Rows one delta index may hold, about 60 bytes of memory each plus their normalized values.",
+    )
+    result_cache_dir: Path = Field(
+        default=Path(gettempdir()) / "csv-normalization-results",
+        description="Local directory holding normalized outputs of earlier uploads, served again for identical ones.",
+    )
+    result_cache_max_bytes: int = Field(
+        default=1024 * 1024 * 1024,
+        description="Bytes of cached outputs kept on disk, least recently used evicted first; 0 disables the cache.",
+    )
+
+    @property
+    def parallel_worker_count(self) -> int:
+        return self.parallel_workers or cpu_count() or 1
 
     @property
     def month_map(self) -> dict[str, int]:
@@ -0,0 +1,40 @@
+from pathlib import Path
+from tempfile import gettempdir
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class CsvJobSettings(BaseSettings):
+    results_dir: Path = Field(
+        default=Path(gettempdir()) / "csv-normalization-jobs",
+        description="Local directory holding uploads and results of background normalization jobs.",
+    )
+    max_concurrent_jobs: int = Field(
+        default=2,
+        description="Jobs normalized at the same time; further jobs wait in the queue.",
+    )
+    max_queued_jobs: int = Field(
+        default=32,
+        description="Jobs waiting to start before new submissions are rejected.",
+    )
+    result_ttl_seconds: int = Field(
+        default=3600,
+        description="Seconds a finished job and its result file are kept.",
+    )
+    cleanup_interval_seconds: int = Field(
+        default=60,
+        description="Seconds between sweeps removing expired jobs and result files.",
+    )
+    upload_idle_timeout_seconds: int = Field(
+        default=900,
+        description="Seconds a chunked upload may go without receiving bytes before its job fails.",
+    )
+    max_upload_bytes: int = Field(
+        default=8 * 1024**3,
+        description="Largest size a chunked upload may declare; its file is allocated at that size up front.",
+    )
+    upload_start_bytes: int = Field(
+        default=64 * 1024**2,
+        description="Leading bytes a chunked upload needs, or all of them, before its job takes a running slot.",
+    )
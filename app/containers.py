@@ -1,12 +1,57 @@
 from dependency_injector import containers, providers
 
-from app.app_layer.services.csv_normalization import CSVService, DataNormalizer
+from app.app_layer.services.csv_normalization import (
+    CsvAdmissionController,
+    CsvArchiveService,
+    CsvDeltaIndexStore,
+    CsvResultCache,
+    CSVService,
+    CsvSkipReportStore,
+    CsvSummaryStore,
+    DataNormalizer,
+    NormalizationCache,
+)
+from app.app_layer.services.csv_normalization.executor import init_normalization_executor, warm_up_normalization
+from app.app_layer.services.csv_normalization.jobs import init_job_manager
+from app.app_layer.services.csv_normalization.metrics import CsvNormalizationMetrics
+from app.app_layer.services.metrics import HttpMetrics, MetricsRegistry
 
 
 class Container(containers.DeclarativeContainer):
+    # app_layer: shared state
+    normalization_cache = providers.Singleton(NormalizationCache)
+    csv_skip_report_store = providers.Singleton(CsvSkipReportStore)
+    csv_delta_index_store = providers.Singleton(CsvDeltaIndexStore)
+
+    # app_layer: metrics
+    metrics_registry = providers.Singleton(MetricsRegistry)
+    http_metrics = providers.Singleton(HttpMetrics, registry=metrics_registry)
+    csv_normalization_metrics = providers.Singleton(CsvNormalizationMetrics, registry=metrics_registry)
+
     # app_layer: services
-    data_normalizer = providers.Factory(DataNormalizer)
-    get_csv_normalization_service = providers.Factory(
+    # Built once per process; their lookup tables, formatters and cache are shared by every request
+    data_normalizer = providers.Singleton(DataNormalizer, cache=normalization_cache)
+    normalization_executor = providers.Resource(init_normalization_executor, normalizer=data_normalizer)
+    get_csv_normalization_service = providers.Singleton(
         CSVService,
         normalizer=data_normalizer,
+        executor=normalization_executor,
+        metrics=csv_normalization_metrics,
+        skip_reports=csv_skip_report_store,
+        delta_indexes=csv_delta_index_store,
+    )
+    csv_archive_service = providers.Singleton(CsvArchiveService, service=get_csv_normalization_service)
+    csv_summary_store = providers.Singleton(CsvSummaryStore)
+    csv_result_cache = providers.Singleton(
+        CsvResultCache,
+        normalizer=data_normalizer,
+        metrics=csv_normalization_metrics,
+    )
+    csv_admission_controller = providers.Singleton(CsvAdmissionController, metrics=csv_normalization_metrics)
+    normalization_warm_up = providers.Resource(warm_up_normalization, service=get_csv_normalization_service)
+
+    # app_layer: background jobs
+    csv_job_manager = providers.Resource(
+        init_job_manager,
+        service_factory=get_csv_normalization_service.provider,
     )
@@ -8,6 +8,7 @@ from fastapi import FastAPI
 from app.api import rest
 from app.api.rest.controllers import init_rest_api
 from app.configs.base import settings
+from app.configs.logging import configure_logging
 from app.containers import Container
 
 logger = getLogger(__name__)
@@ -45,6 +46,7 @@ def init_api_docs(app: FastAPI, *, show_docs: bool, api_root: str) -> None:
     app.setup()
 
 
+configure_logging()
 app = FastAPI(version=settings.api.docs_version, lifespan=lifespan)
 
 init_api_docs(app, show_docs=settings.api.docs_enabled, api_root=settings.api.public_prefix)
@@ -0,0 +1,4 @@
+from benchmarks.datasets import PROFILES, write_dataset
+from benchmarks.runner import TARGETS, run_benchmarks
+
+__all__ = ["PROFILES", "TARGETS", "run_benchmarks", "write_dataset"]
@@ -0,0 +1,120 @@
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from random import Random
+
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+_FULL_MONTHS = (
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+)
+
+
+def _date(rng: Random) -> tuple[int, int, int]:
+    return rng.randint(1940, 2010), rng.randint(1, 12), rng.randint(1, 28)
+
+
+def _local_number(rng: Random) -> str:
+    return f"5{rng.randint(0, 9)}{rng.randint(0, 9_999_999):07d}"
+
+
+def _clean_row(rng: Random, index: int) -> str:
+    year, month, day = _date(rng)
+    return f"U{index};+971{_local_number(rng)};{year:04d}-{month:02d}-{day:02d}"
+
+
+def _dirty_row(rng: Random, index: int) -> str:
+    year, month, day = _date(rng)
+    number = _local_number(rng)
+    phone = rng.choice(
+        (
+            f"0{number}",
+            f"971{number}",
+            f"00971{number}",
+            f"+971 {number[:2]} {number[2:5]} {number[5:]}",
+            f"0{number[:2]}_{number[2:5]}_{number[5:]}",
+            f"({number[:3]}) {number[3:6]}-{number[6:]}",
+        ),
+    )
+    dob = rng.choice(
+        (
+            f"{day:02d}.{month:02d}.{year}",
+            f"{day}/{month}/{year % 100:02d}",
+            f"{year}/{month}/{day}",
+            f"{day:02d}-{month:02d}-{year}",
+            f"{year}{month:02d}{day:02d}",
+            f"{day:02d}_{month:02d}_{year}",
+        ),
+    )
+    return f"U{index};{phone};{dob}"
+
+
+def _month_names_row(rng: Random, index: int) -> str:
+    year, month, day = _date(rng)
+    dob = rng.choice(
+        (
+            f"{day} {_MONTHS[month - 1]} {year}",
+            f"{_MONTHS[month - 1]}-{day:02d}-{year}",
+            f"{_FULL_MONTHS[month - 1]} {day}, {year}",
+            f"{day:02d}-{_MONTHS[month - 1].upper()}-{year % 100:02d}",
+            f"{year} {_MONTHS[month - 1]} {day}",
+        ),
+    )
+    return f"U{index};0{_local_number(rng)};{dob}"
+
+
+def _high_skip_row(rng: Random, index: int) -> str:
+    if rng.random() >= 0.5:
+        return _dirty_row(rng, index)
+
+    year, month, day = _date(rng)
+    return rng.choice(
+        (
+            f";0{_local_number(rng)};{year}-{month:02d}-{day:02d}",
+            f"U{index};;{year}-{month:02d}-{day:02d}",
+            f"U{index};12;{year}-{month:02d}-{day:02d}",
+            f"U{index};0{_local_number(rng)};",
+            f"U{index};0{_local_number(rng)};31/31/{year}",
+            f"U{index};0{_local_number(rng)};not a date",
+        ),
+    )
+
+
+PROFILES: dict[str, Callable[[Random, int], str]] = {
+    "clean": _clean_row,
+    "dirty": _dirty_row,
+    "month-names": _month_names_row,
+    "high-skip": _high_skip_row,
+}
+
+
+def iter_rows(profile: str, rows: int, *, seed: int = 42) -> Iterator[str]:
+    """Yield ``rows`` deterministic CSV lines of ``profile`` without the header."""
+    make_row = PROFILES[profile]
+    rng = Random(seed)  # noqa: S311
+    for index in range(1, rows + 1):
+        yield make_row(rng, index)
+
+
+def write_dataset(path: Path, profile: str, rows: int, *, seed: int = 42) -> Path:
+    """Write a semicolon CSV with ``rows`` data rows, streaming it to disk in blocks."""
+    with path.open("w", encoding="utf-8", newline="") as target:
+        target.write("id;phone;dob\n")
+        block: list[str] = []
+        for line in iter_rows(profile, rows, seed=seed):
+            block.append(line)
+            if len(block) >= 10_000:
+                target.write("\n".join(block) + "\n")
+                block.clear()
+        if block:
+            target.write("\n".join(block) + "\n")
+    return path
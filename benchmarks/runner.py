@@ -0,0 +1,214 @@
+from asyncio import run
+from collections.abc import Callable, Coroutine, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from csv import reader
+from datetime import UTC, datetime
+import gc
+from multiprocessing import get_context
+from os import cpu_count, fstat
+from pathlib import Path
+from platform import platform, python_version
+from resource import RUSAGE_SELF, getrusage
+from statistics import quantiles
+from tempfile import TemporaryDirectory
+from time import perf_counter, perf_counter_ns
+from typing import Any, Self
+
+from starlette.datastructures import UploadFile
+
+from app.app_layer.services.csv_normalization import DataNormalizer
+from benchmarks.datasets import PROFILES, write_dataset
+
+# Per-value latencies are recorded for about this many calls to bound the benchmark's own memory use
+_LATENCY_SAMPLES = 100_000
+
+
+def _percentiles(samples_ms: list[float]) -> tuple[float, float]:
+    if len(samples_ms) < 2:
+        value = samples_ms[0] if samples_ms else 0.0
+        return value, value
+    cuts = quantiles(samples_ms, n=100, method="inclusive")
+    return cuts[49], cuts[98]
+
+
+async def _bench_normalizer(path: Path, repeat: int) -> dict[str, Any]:
+    with path.open(encoding="utf-8", newline="") as source:
+        rows = list(reader(source, delimiter=";"))[1:]
+    phones = [row[1] for row in rows]
+    dobs = [row[2] for row in rows]
+    step = max(1, len(rows) // _LATENCY_SAMPLES)
+
+    normalizer = DataNormalizer()
+    durations: list[float] = []
+    latencies_ms: list[float] = []
+    for _ in range(repeat):
+        started = perf_counter()
+        for index, (phone, dob) in enumerate(zip(phones, dobs, strict=True)):
+            call_started = perf_counter_ns()
+            for call in (normalizer.get_phone(phone), normalizer.get_date_of_birth(dob)):
+                with suppress(ValueError):
+                    await call
+            if index % step == 0:
+                latencies_ms.append((perf_counter_ns() - call_started) / 1e6)
+        durations.append(perf_counter() - started)
+
+    return {"durations": durations, "latencies_ms": latencies_ms}
+
+
+async def _bench_normalizer_batch(path: Path, repeat: int) -> dict[str, Any]:
+    with path.open(encoding="utf-8", newline="") as source:
+        rows = list(reader(source, delimiter=";"))[1:]
+    phones = [row[1] for row in rows]
+    dobs = [row[2] for row in rows]
+
+    normalizer = DataNormalizer()
+    durations: list[float] = []
+    for _ in range(repeat):
+        started = perf_counter()
+        normalizer.normalize_phones(phones)
+        normalizer.normalize_dobs(dobs, normalizer.detect_dob_layouts(dobs))
+        durations.append(perf_counter() - started)
+
+    return {"durations": durations, "latencies_ms": [duration * 1000 for duration in durations]}
+
+
+async def _bench_service(path: Path, repeat: int) -> dict[str, Any]:
+    # The container and the application are only imported by the targets using them, to keep the CLI quick
+    from app.containers import Container  # noqa: PLC0415
+
+    container = Container()
+    durations: list[float] = []
+    try:
+        service = container.get_csv_normalization_service()
+        for _ in range(repeat):
+            with path.open("rb") as source:
+                upload = UploadFile(file=source, filename=path.name, size=fstat(source.fileno()).st_size)
+                started = perf_counter()
+                result = await service.stream(upload)
+                async for _chunk in result.content:
+                    pass
+                durations.append(perf_counter() - started)
+    finally:
+        container.shutdown_resources()
+
+    return {"durations": durations, "latencies_ms": [duration * 1000 for duration in durations]}
+
+
+async def _bench_http(path: Path, repeat: int) -> dict[str, Any]:
+    # httpx is a development dependency, only needed for this target
+    from httpx import ASGITransport, AsyncClient  # noqa: PLC0415
+
+    from app.main import app  # noqa: PLC0415
+
+    durations: list[float] = []
+    async with app.router.lifespan_context(app):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench", timeout=3600) as client:
+            for _ in range(repeat):
+                with path.open("rb") as source:
+                    started = perf_counter()
+                    response = await client.post(
+                        "/api/internal/v1/upload/normalize",
+                        files={"file": (path.name, source, "text/csv")},
+                    )
+                    durations.append(perf_counter() - started)
+                response.raise_for_status()
+
+    return {"durations": durations, "latencies_ms": [duration * 1000 for duration in durations]}
+
+
+TARGETS: dict[str, Callable[[Path, int], Coroutine[Any, Any, dict[str, Any]]]] = {
+    "normalizer": _bench_normalizer,
+    "normalizer-batch": _bench_normalizer_batch,
+    "service": _bench_service,
+    "http": _bench_http,
+}
+
+
+class _GcWatch:
+    """Count the garbage collector's runs and the time they paused the benchmark for.
+
+    Collections of the youngest generation follow container allocations that are not freed right
+    away, such as rows and skip records held in a batch, so fewer of them per row means fewer allocations.
+    """
+
+    def __init__(self) -> None:
+        self.collections = 0
+        self.pause_seconds = 0.0
+        self._started = 0.0
+
+    def __enter__(self) -> Self:
+        gc.collect()
+        gc.callbacks.append(self._observe)
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        gc.callbacks.remove(self._observe)
+
+    def _observe(self, phase: str, _info: dict[str, int]) -> None:
+        if phase == "start":
+            self._started = perf_counter()
+        else:
+            self.collections += 1
+            self.pause_seconds += perf_counter() - self._started
+
+
+def run_scenario(target: str, profile: str, rows: int, path: Path, repeat: int) -> dict[str, Any]:
+    """Run one benchmark; meant to run in a fresh process so that peak RSS belongs to it alone."""
+    with _GcWatch() as gc_watch:
+        measured = run(TARGETS[target](path, repeat))
+    durations: list[float] = measured["durations"]
+    p50, p99 = _percentiles(measured["latencies_ms"])
+    best = min(durations)
+
+    return {
+        "target": target,
+        "profile": profile,
+        "rows": rows,
+        "repeat": repeat,
+        "seconds": [round(duration, 6) for duration in durations],
+        "rows_per_second": round(rows / best) if best else None,
+        "latency_p50_ms": round(p50, 6),
+        "latency_p99_ms": round(p99, 6),
+        "gc_collections_per_1k_rows": round(gc_watch.collections * 1000 / (rows * repeat), 3),
+        "gc_pause_ms": round(gc_watch.pause_seconds * 1000, 3),
+        # Linux reports kilobytes
+        "peak_rss_kb": getrusage(RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run_benchmarks(
+    *,
+    sizes: Iterable[int],
+    profiles: Iterable[str],
+    targets: Iterable[str],
+    repeat: int = 3,
+    isolate: bool = True,
+) -> dict[str, Any]:
+    """Benchmark every target on every profile and size, returning a JSON-serializable report."""
+    profiles, targets = list(profiles), list(targets)
+    unknown = sorted({*profiles} - PROFILES.keys()) + sorted({*targets} - TARGETS.keys())
+    if unknown:
+        raise ValueError(f"Unknown benchmark profile or target: {', '.join(unknown)}")
+
+    results: list[dict[str, Any]] = []
+    with TemporaryDirectory() as tmp:
+        for rows in sizes:
+            for profile in profiles:
+                path = write_dataset(Path(tmp) / f"{profile}-{rows}.csv", profile, rows)
+                for target in targets:
+                    if not isolate:
+                        results.append(run_scenario(target, profile, rows, path, repeat))
+                        continue
+                    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                        results.append(executor.submit(run_scenario, target, profile, rows, path, repeat).result())
+                path.unlink()
+
+    return {
+        "created_at": datetime.now(UTC).isoformat(),
+        "python": python_version(),
+        "platform": platform(),
+        "cpu_count": cpu_count(),
+        "results": results,
+    }
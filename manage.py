@@ -1,13 +1,18 @@
 import asyncio
 from collections.abc import Awaitable, Callable
 from functools import wraps
-from typing import ParamSpec, TypeVar
+from json import dumps
+from pathlib import Path
+from typing import Annotated, ParamSpec, TypeVar
 
-from typer import Typer
-import uvicorn
+from typer import Argument, BadParameter, Exit, Option, Typer, echo
 
 from app.configs.base import settings
-from app.containers import Container
+from app.configs.logging import configure_logging
+from benchmarks import PROFILES, TARGETS, run_benchmarks
+
+# Commands import the server, the services and the container when they run, so the CLI and the worker
+# processes re-importing this module start without them
 
 T = TypeVar("T")
 P = ParamSpec("P")
@@ -15,6 +20,11 @@ P = ParamSpec("P")
 app = Typer()
 
 
+@app.callback()
+def init() -> None:
+    configure_logging()
+
+
 def coro[**P, T](func: Callable[P, Awaitable[T]]) -> Callable[P, T]:
     """Make it possible to run async code in sync context."""
 
@@ -30,6 +40,8 @@ def coro[**P, T](func: Callable[P, Awaitable[T]]) -> Callable[P, T]:
 
 @app.command()
 def run_server() -> None:
+    import uvicorn  # noqa: PLC0415
+
     uvicorn_settings = settings.uvicorn
     uvicorn.run(**uvicorn_settings.dict())
 
@@ -41,8 +53,73 @@ async def cli_example_command() -> None:
     pass
 
 
-if __name__ == "__main__":
-    container = Container()
-    container.wire(modules=[__name__])
+def _split_option(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+@app.command(help="Benchmark the normalization pipeline on synthetic CSVs and print the results as JSON")
+def bench(
+    sizes: Annotated[str, Option(help="Comma separated row counts, e.g. 1000,100000,1000000,10000000")] = "1000,100000",
+    profiles: Annotated[str, Option(help=f"Comma separated datasets: {', '.join(PROFILES)}")] = ",".join(PROFILES),
+    targets: Annotated[str, Option(help=f"Comma separated targets: {', '.join(TARGETS)}")] = ",".join(TARGETS),
+    repeat: Annotated[int, Option(min=1, help="Runs per scenario; the fastest one gives rows/sec")] = 3,
+    output: Annotated[Path | None, Option(help="Write the JSON report to this file instead of stdout")] = None,
+) -> None:
+    try:
+        report = run_benchmarks(
+            sizes=[int(size) for size in _split_option(sizes)],
+            profiles=_split_option(profiles),
+            targets=_split_option(targets),
+            repeat=repeat,
+        )
+    except ValueError as exc:
+        raise BadParameter(str(exc)) from exc
+
+    payload = dumps(report, indent=2)
+    if output is None:
+        echo(payload)
+    else:
+        output.write_text(payload + "\n", encoding="utf-8")
+
+
+@app.command(help="Normalize local CSV files, directories or glob patterns from disk to disk and print a JSON summary")
+def normalize(
+    inputs: Annotated[list[str], Argument(help="CSV files, directories or glob patterns such as 'exports/**/*.csv'")],
+    output_dir: Annotated[Path, Option("--output-dir", "-o", help="Directory normalized files are written to")] = Path(
+        "normalized",
+    ),
+    country: Annotated[str | None, Option(help="ISO region or calling code of phone numbers without a country")] = None,
+    workers: Annotated[int | None, Option(min=1, help="Worker processes; defaults to normalizer settings")] = None,
+    summary: Annotated[Path | None, Option(help="Write the JSON summary to this file instead of stdout")] = None,
+) -> None:
+    from app.app_layer.services.csv_normalization import CsvBulkFileResultDTO, DataNormalizer  # noqa: PLC0415
+    from app.app_layer.services.csv_normalization.bulk import expand_inputs, normalize_files  # noqa: PLC0415
+
+    try:
+        bulk_inputs = expand_inputs(inputs)
+    except ValueError as exc:
+        raise BadParameter(str(exc)) from exc
+    if country and not DataNormalizer().has_phone_plan(country):
+        raise BadParameter(f"Unknown country hint: {country}")
+
+    finished = 0
+
+    def report_progress(result: CsvBulkFileResultDTO) -> None:
+        nonlocal finished
+        finished += 1
+        outcome = result.error or f"{result.processed_rows} rows, {result.skipped_rows} skipped -> {result.target}"
+        echo(f"[{finished}/{len(bulk_inputs)}] {result.source}: {outcome} ({result.seconds:.2f}s)", err=True)
+
+    report = normalize_files(bulk_inputs, output_dir, country=country, workers=workers, on_result=report_progress)
+
+    payload = report.model_dump_json(indent=2)
+    if summary is None:
+        echo(payload)
+    else:
+        summary.write_text(payload + "\n", encoding="utf-8")
+    if report.failed_files:
+        raise Exit(code=1)
+
 
+if __name__ == "__main__":
     app()
@@ -1,10 +1,12 @@
 from collections.abc import AsyncIterator
+from pathlib import Path
 
 from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
 import pytest
 import pytest_asyncio
 
+from app.configs.base import settings
 from app.main import app
 
 
@@ -14,7 +16,16 @@ def asgi_app() -> FastAPI:
 
 
 @pytest_asyncio.fixture
-async def http_client(asgi_app: FastAPI) -> AsyncIterator[AsyncClient]:
+async def http_client(
+    asgi_app: FastAPI,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> AsyncIterator[AsyncClient]:
+    # Spawning worker processes for every test application would dominate the suite's run time
+    monkeypatch.setattr(settings.normalizer, "prestart_workers", False)
+    # Outputs cached by an earlier test or run would be served instead of normalizing
+    monkeypatch.setattr(settings.normalizer, "result_cache_dir", tmp_path / "results")
+    monkeypatch.setattr(settings.normalizer, "delta_index_dir", tmp_path / "delta-indexes")
     async with asgi_app.router.lifespan_context(asgi_app):
         transport = ASGITransport(app=asgi_app)
         async with AsyncClient(transport=transport, base_url="http://test") as client:
@@ -0,0 +1,128 @@
+from asyncio import create_task, sleep
+
+from fastapi import FastAPI
+from httpx import AsyncClient
+import pytest
+
+from app.app_layer.services.csv_normalization import (
+    CsvAdmissionController,
+    CsvAdmissionQueueFullError,
+    CsvAdmissionTimeoutError,
+)
+from app.app_layer.services.csv_normalization.metrics import CsvNormalizationMetrics
+from app.app_layer.services.metrics import MetricsRegistry
+from app.configs.admission import AdmissionSettings
+
+NORMALIZE = "/api/internal/v1/upload/normalize"
+
+
+def _controller(**overrides: float) -> CsvAdmissionController:
+    admission_settings = AdmissionSettings(
+        max_in_flight_bytes=1000,
+        max_in_flight_rows=100,
+        estimated_row_bytes=10,
+        max_queued_requests=2,
+        queue_timeout_seconds=1,
+        retry_after_seconds=7,
+    ).model_copy(update=overrides)
+    return CsvAdmissionController(
+        metrics=CsvNormalizationMetrics(MetricsRegistry()),
+        admission_settings=admission_settings,
+    )
+
+
+async def test_uploads_over_budget_wait_in_arrival_order():
+    controller = _controller()
+    first = await controller.acquire(600)
+    large = create_task(controller.acquire(700))
+    small = create_task(controller.acquire(100))
+    await sleep(0)
+
+    assert controller.queue_depth == 2
+    assert controller.metrics is not None
+    assert controller.metrics.admission_queue_depth.value() == 2
+    assert not large.done()
+    assert not small.done()
+
+    controller.release(first)
+    admitted = await large
+    await sleep(0)
+
+    assert small.done()
+    assert controller.in_flight_bytes == 800
+    assert controller.in_flight_rows == 80
+    controller.release(admitted)
+    controller.release(admitted)
+    controller.release(await small)
+    assert (controller.in_flight, controller.in_flight_bytes, controller.in_flight_rows) == (0, 0, 0)
+
+
+async def test_upload_larger_than_the_budget_runs_alone():
+    controller = _controller()
+
+    admission = await controller.acquire(5000)
+
+    assert controller.in_flight_bytes == 5000
+    controller.release(admission)
+
+
+async def test_rows_budget_holds_back_uploads_of_many_small_rows():
+    controller = _controller(estimated_row_bytes=1, queue_timeout_seconds=0.01)
+    await controller.acquire(60)
+
+    with pytest.raises(CsvAdmissionTimeoutError):
+        await controller.acquire(60)
+
+
+async def test_uploads_are_rejected_when_the_queue_is_full_or_the_wait_too_long():
+    controller = _controller(max_queued_requests=1, queue_timeout_seconds=0.05)
+    admission = await controller.acquire(1000)
+    waiting = create_task(controller.acquire(10))
+    await sleep(0)
+
+    with pytest.raises(CsvAdmissionQueueFullError) as queue_full:
+        await controller.acquire(10)
+    with pytest.raises(CsvAdmissionTimeoutError):
+        await waiting
+
+    assert queue_full.value.retry_after == 7
+    assert controller.queue_depth == 0
+    assert controller.metrics is not None
+    assert controller.metrics.admission_rejections.value(reason="queue_full") == 1
+    assert controller.metrics.admission_rejections.value(reason="timeout") == 1
+    controller.release(admission)
+    assert controller.in_flight == 0
+
+
+async def test_cancelled_wait_leaves_the_queue():
+    controller = _controller()
+    admission = await controller.acquire(1000)
+    waiting = create_task(controller.acquire(10))
+    await sleep(0)
+
+    waiting.cancel()
+    await sleep(0)
+    controller.release(admission)
+
+    assert controller.queue_depth == 0
+    assert controller.in_flight == 0
+
+
+async def test_normalize_endpoint_answers_429_with_retry_after_when_over_budget(
+    http_client: AsyncClient,
+    asgi_app: FastAPI,
+):
+    controller = asgi_app.state.container.csv_admission_controller()
+    controller.max_queued_requests = 0
+    admission = await controller.acquire(None)
+
+    response = await http_client.post(NORMALIZE, files={"file": ("data.csv", b"id;phone;dob\n", "text/csv")})
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == str(controller.retry_after)
+    controller.release(admission)
+    response = await http_client.post(NORMALIZE, files={"file": ("data.csv", b"id;phone;dob\n", "text/csv")})
+    assert response.status_code == 200
+    assert controller.in_flight == 0
+    metrics = (await http_client.get("/metrics")).text
+    assert 'csv_admission_rejections_total{reason="queue_full"} 1' in metrics
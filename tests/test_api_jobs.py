@@ -0,0 +1,72 @@
+from asyncio import sleep
+from collections.abc import Callable
+from pathlib import Path
+
+from httpx import AsyncClient
+
+
+async def _wait_for_job(http_client: AsyncClient, location: str) -> dict:
+    for _ in range(100):
+        job = (await http_client.get(location)).json()
+        if job["status"] in {"completed", "failed"}:
+            return job
+        await sleep(0.01)
+    raise AssertionError("Job did not finish in time")
+
+
+async def test_job_normalizes_in_background(
+    http_client: AsyncClient,
+    input_csv_path: Path,
+    expected_csv_path: Path,
+    load_bytes: Callable[[Path], bytes],
+):
+    files = {"file": (input_csv_path.name, load_bytes(input_csv_path), "text/csv")}
+
+    response = await http_client.post("/api/internal/v1/jobs/normalize", files=files)
+
+    assert response.status_code == 202
+    assert response.json()["status"] in {"pending", "running", "completed"}
+    job = await _wait_for_job(http_client, response.headers["location"])
+    assert job["status"] == "completed"
+    assert job["processed_rows"] == 50
+    assert job["normalized_rows"] == 50
+    assert job["skipped_rows"] == 0
+
+    result = await http_client.get(f"/api/internal/v1/jobs/{job['job_id']}/result")
+
+    assert result.status_code == 200
+    assert result.content == load_bytes(expected_csv_path)
+    assert result.headers["content-disposition"] == 'attachment; filename="normalized-input_data.csv"'
+    assert result.headers["x-csv-processed"] == "50"
+
+    report = await http_client.get(f"/api/internal/v1/upload/normalize/skip-reports/{job['skip_report_id']}")
+
+    assert report.status_code == 200
+    assert report.text == "row_number;reason\n"
+
+
+async def test_failed_job_reports_error(http_client: AsyncClient):
+    files = {"file": ("data.csv", b"id;phone\nU1;0501234567\n", "text/csv")}
+
+    response = await http_client.post("/api/internal/v1/jobs/normalize", files=files)
+    job = await _wait_for_job(http_client, response.headers["location"])
+
+    assert job["status"] == "failed"
+    assert job["error"] == "Missing required column(s): dob"
+    result = await http_client.get(f"/api/internal/v1/jobs/{job['job_id']}/result")
+    assert result.status_code == 409
+
+
+async def test_job_rejects_empty_file(http_client: AsyncClient):
+    files = {"file": ("empty.csv", b"", "text/csv")}
+
+    response = await http_client.post("/api/internal/v1/jobs/normalize", files=files)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Uploaded file is empty"
+
+
+async def test_unknown_job(http_client: AsyncClient):
+    response = await http_client.get("/api/internal/v1/jobs/unknown")
+
+    assert response.status_code == 404
@@ -0,0 +1,59 @@
+from httpx import AsyncClient
+
+from app.app_layer.services.metrics import MetricsRegistry
+
+
+async def test_metrics_endpoint_exports_normalization_series(http_client: AsyncClient):
+    payload = b"id;phone;dob\nU1;0501234567;1990-01-02\n;0501234567;1990-01-02\nU3;abc;1990-01-02\n"
+    files = {"file": ("data.csv", payload, "text/csv")}
+
+    await http_client.post("/api/internal/v1/upload/normalize", files=files)
+    await http_client.post("/api/internal/v1/upload/normalize", files={"file": ("empty.csv", b"", "text/csv")})
+    response = await http_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
+    lines = set(response.text.splitlines())
+    assert 'csv_normalizations_total{outcome="completed"} 1' in lines
+    assert 'csv_normalizations_total{outcome="rejected"} 1' in lines
+    assert 'csv_normalization_rows_total{result="normalized"} 1' in lines
+    assert 'csv_normalization_rows_total{result="skipped"} 2' in lines
+    assert 'csv_normalization_skipped_rows_total{reason="ID value is missing"} 1' in lines
+    assert 'csv_normalization_skipped_rows_total{reason="Input phone value must contain digits"} 1' in lines
+    assert f"csv_normalization_upload_bytes_sum {len(payload)}" in lines
+    assert "csv_normalizations_in_flight 0" in lines
+    for stage in ("read", "parse", "phone", "dob", "write"):
+        assert f'csv_normalization_stage_duration_seconds_count{{stage="{stage}"}} 1' in lines
+    assert (
+        'http_request_duration_seconds_count{method="POST",route="/api/internal/v1/upload/normalize",status="400"} 1'
+        in lines
+    )
+
+
+async def test_metrics_endpoint_counts_streamed_normalization_once_body_is_sent(http_client: AsyncClient):
+    files = {"file": ("data.csv", b"id;phone;dob\nU1;0501234567;1990-01-02\n", "text/csv")}
+
+    response = await http_client.post("/api/internal/v1/upload/normalize", params={"stream": "true"}, files=files)
+    metrics = await http_client.get("/metrics")
+
+    assert response.status_code == 200
+    lines = set(metrics.text.splitlines())
+    assert 'csv_normalizations_total{outcome="completed"} 1' in lines
+    assert "http_requests_in_flight 1" in lines
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("upload_bytes", "Upload size.", ("kind",), buckets=(10, 100))
+    for value in (5, 10, 50, 500):
+        histogram.observe(value, kind='a"b')
+
+    assert registry.render().splitlines() == [
+        "# HELP upload_bytes Upload size.",
+        "# TYPE upload_bytes histogram",
+        'upload_bytes_bucket{kind="a\\"b",le="10"} 2',
+        'upload_bytes_bucket{kind="a\\"b",le="100"} 3',
+        'upload_bytes_bucket{kind="a\\"b",le="+Inf"} 4',
+        'upload_bytes_sum{kind="a\\"b"} 565',
+        'upload_bytes_count{kind="a\\"b"} 4',
+    ]
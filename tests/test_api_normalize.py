@@ -45,14 +45,100 @@ async def test_normalize_endpoint_rejects_empty_file(http_client: AsyncClient):
 @pytest.mark.parametrize(
     "payload",
     [
-        pytest.param(b"\xff\xfe\x00\x00", id="bom"),
-        pytest.param("ä".encode("latin-1"), id="latin-1"),
+        pytest.param(b"\xff\xfe\x00\x00", id="utf-32-bom"),
+        pytest.param(b"id;phone;dob\n\x81\x8d\x90", id="undefined-in-cp1252"),
     ],
 )
-async def test_normalize_endpoint_rejects_non_utf8(http_client: AsyncClient, payload: bytes):
+async def test_normalize_endpoint_rejects_unsupported_encoding(http_client: AsyncClient, payload: bytes):
     files: dict[str, tuple[str, bytes, str]] = {"file": ("data.csv", payload, "text/csv")}
 
     response = await http_client.post("/api/internal/v1/upload/normalize", files=files)
 
     assert response.status_code == 400
-    assert response.json()["detail"] == "CSV must be encoded as UTF-8"
+    assert response.json()["detail"] == "CSV must be encoded as UTF-8, UTF-16 or cp1252"
+
+
+async def test_normalize_endpoint_streams_csv(
+    http_client: AsyncClient,
+    input_csv_path: Path,
+    expected_csv_path: Path,
+    load_bytes: Callable[[Path], bytes],
+):
+    files = {"file": (input_csv_path.name, load_bytes(input_csv_path), "text/csv")}
+
+    response = await http_client.post("/api/internal/v1/upload/normalize", params={"stream": True}, files=files)
+
+    assert response.status_code == 200
+    assert response.content == load_bytes(expected_csv_path)
+    assert response.headers["content-disposition"] == 'attachment; filename="normalized-input_data.csv"'
+    assert "x-csv-processed" not in response.headers
+
+    summary_id = response.headers["x-csv-summary-id"]
+    summary = await http_client.get(f"/api/internal/v1/upload/normalize/summaries/{summary_id}")
+
+    assert summary.status_code == 200
+    assert summary.json()["processed_rows"] == 50
+    assert summary.json()["normalized_rows"] == 50
+    assert summary.json()["skipped_rows"] == 0
+
+
+async def test_normalize_endpoint_stream_rejects_empty_file(http_client: AsyncClient):
+    files: dict[str, tuple[str, bytes, str]] = {"file": ("empty.csv", b"", "text/csv")}
+
+    response = await http_client.post("/api/internal/v1/upload/normalize", params={"stream": True}, files=files)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Uploaded file is empty"
+
+
+async def test_normalize_summary_unknown_id(http_client: AsyncClient):
+    response = await http_client.get("/api/internal/v1/upload/normalize/summaries/unknown")
+
+    assert response.status_code == 404
+
+
+async def test_normalization_cache_stats(
+    http_client: AsyncClient,
+    input_csv_path: Path,
+    load_bytes: Callable[[Path], bytes],
+):
+    files = {"file": (input_csv_path.name, load_bytes(input_csv_path), "text/csv")}
+    await http_client.post("/api/internal/v1/upload/normalize", files=files)
+
+    response = await http_client.get("/api/internal/v1/upload/normalize/cache")
+
+    assert response.status_code == 200
+    assert response.json()["size"] > 0
+    assert response.json().keys() == {"max_entries", "size", "hits", "misses", "evictions"}
+
+
+async def test_normalize_endpoint_serves_skip_report_after_stream(http_client: AsyncClient):
+    payload = b"id;phone;dob\nU1;0501234567;1990-01-02\n;0501234567;1990-01-02\nU3;;1990-01-02\n"
+    files = {"file": ("data.csv", payload, "text/csv")}
+
+    response = await http_client.post(
+        "/api/internal/v1/upload/normalize",
+        params={"stream": True, "skip_report": True},
+        files=files,
+    )
+
+    assert response.status_code == 200
+    summary_id = response.headers["x-csv-summary-id"]
+    summary = (await http_client.get(f"/api/internal/v1/upload/normalize/summaries/{summary_id}")).json()
+    assert summary["skipped"] == [
+        {"reason": "ID value is missing", "count": 1, "row_numbers": [3]},
+        {"reason": "Missing phone value", "count": 1, "row_numbers": [4]},
+    ]
+
+    report_id = response.headers["x-csv-skip-report-id"]
+    assert summary["skip_report_id"] == report_id
+    report = await http_client.get(f"/api/internal/v1/upload/normalize/skip-reports/{report_id}")
+
+    assert report.status_code == 200
+    assert report.text == "row_number;reason\n3;ID value is missing\n4;Missing phone value\n"
+
+
+async def test_skip_report_unknown_id(http_client: AsyncClient):
+    response = await http_client.get("/api/internal/v1/upload/normalize/skip-reports/..%2Fconfig")
+
+    assert response.status_code == 404
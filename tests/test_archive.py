@@ -0,0 +1,102 @@
+from collections.abc import Callable
+import gzip
+from io import BytesIO
+import json
+from pathlib import Path
+from zipfile import ZipFile
+
+from httpx import AsyncClient
+import pytest
+
+BULK = "/api/internal/v1/upload/normalize/bulk"
+BRANCH = b"id;phone;dob\nU1;0501234567;1990-01-02\nU2;;1985-05-06\n"
+
+
+def _zip(members: dict[str, bytes]) -> bytes:
+    buffer = BytesIO()
+    with ZipFile(buffer, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+async def test_bulk_endpoint_normalizes_zip_members_into_a_zip(
+    http_client: AsyncClient,
+    input_csv_path: Path,
+    expected_csv_path: Path,
+    load_bytes: Callable[[Path], bytes],
+):
+    upload = _zip(
+        {
+            "branches/input_data.csv": load_bytes(input_csv_path),
+            "branches/dubai.csv.gz": gzip.compress(BRANCH),
+            "broken.csv": b"id;phone\nU1;0501234567\n",
+            "__MACOSX/branches/._dubai.csv": b"\x00",
+            "readme.txt": b"not a contact list",
+        },
+    )
+
+    response = await http_client.post(BULK, files={"files": ("branches.zip", upload, "application/zip")})
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="normalized-branches.zip"'
+    with ZipFile(BytesIO(response.content)) as archive:
+        assert archive.namelist() == [
+            "branches/normalized-input_data.csv",
+            "branches/normalized-dubai.csv",
+            "manifest.json",
+        ]
+        assert archive.read("branches/normalized-input_data.csv") == load_bytes(expected_csv_path)
+        assert archive.read("branches/normalized-dubai.csv") == b"id;phone;dob\nU1;+971501234567;1990-01-02\n"
+        manifest = json.loads(archive.read("manifest.json"))
+
+    assert manifest["failed_files"] == 1
+    assert [(item["source"], item["target"], item["error"]) for item in manifest["files"]] == [
+        ("branches/input_data.csv", "branches/normalized-input_data.csv", None),
+        ("branches/dubai.csv.gz", "branches/normalized-dubai.csv", None),
+        ("broken.csv", None, "Missing required column(s): dob"),
+    ]
+    assert manifest["files"][1]["skipped_rows"] == 1
+    assert manifest["processed_rows"] == sum(item["processed_rows"] for item in manifest["files"])
+
+
+async def test_bulk_endpoint_normalizes_many_uploaded_files(http_client: AsyncClient):
+    response = await http_client.post(
+        BULK,
+        params={"confidence": True},
+        files=[("files", (f"branch-{number}.csv", BRANCH, "text/csv")) for number in range(5)],
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="normalized.zip"'
+    with ZipFile(BytesIO(response.content)) as archive:
+        assert archive.namelist() == [*(f"normalized-branch-{number}.csv" for number in range(5)), "manifest.json"]
+        assert archive.read("normalized-branch-3.csv") == (
+            b"id;phone;dob;confidence\nU1;+971501234567;1990-01-02;phone_country_defaulted\n"
+        )
+        assert json.loads(archive.read("manifest.json"))["normalized_rows"] == 5
+
+
+@pytest.mark.parametrize(
+    ("files", "detail"),
+    [
+        ([("files", ("a.zip", b"not a zip", "application/zip"))], "Uploaded archive is not a valid zip file"),
+        ([("files", ("a.zip", _zip({"notes.txt": b""}), "application/zip"))], "Uploaded archive holds no CSV files"),
+        (
+            [
+                ("files", ("data.csv", BRANCH, "text/csv")),
+                ("files", ("DATA.csv.gz", gzip.compress(BRANCH), "text/csv")),
+            ],
+            "data.csv and DATA.csv.gz would be written to the same output file",
+        ),
+    ],
+)
+async def test_bulk_endpoint_rejects_unusable_uploads(
+    http_client: AsyncClient,
+    files: list[tuple[str, tuple[str, bytes, str]]],
+    detail: str,
+):
+    response = await http_client.post(BULK, files=files)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import pytest
+
+from benchmarks import PROFILES, TARGETS, run_benchmarks, write_dataset
+
+
+@pytest.mark.parametrize("profile", list(PROFILES))
+def test_write_dataset_is_deterministic(tmp_path: Path, profile: str):
+    first = write_dataset(tmp_path / "first.csv", profile, 25).read_bytes()
+    second = write_dataset(tmp_path / "second.csv", profile, 25).read_bytes()
+
+    assert first == second
+    assert first.count(b"\n") == 26
+    assert first.startswith(b"id;phone;dob\n")
+
+
+def test_run_benchmarks_reports_every_scenario():
+    report = run_benchmarks(
+        sizes=[20],
+        profiles=["clean", "high-skip"],
+        targets=list(TARGETS),
+        repeat=2,
+        isolate=False,
+    )
+
+    assert len(report["results"]) == 2 * len(TARGETS)
+    for result in report["results"]:
+        assert result["rows"] == 20
+        assert len(result["seconds"]) == 2
+        assert result["rows_per_second"] > 0
+        assert result["latency_p99_ms"] >= result["latency_p50_ms"] >= 0
+        assert result["peak_rss_kb"] > 0
+        assert result["gc_collections_per_1k_rows"] >= 0
+        assert result["gc_pause_ms"] >= 0
+
+
+def test_run_benchmarks_rejects_unknown_target():
+    with pytest.raises(ValueError, match="Unknown benchmark profile or target: gpu"):
+        run_benchmarks(sizes=[1], profiles=["clean"], targets=["gpu"])
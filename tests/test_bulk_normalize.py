@@ -0,0 +1,62 @@
+from collections.abc import Callable
+from pathlib import Path
+from shutil import copyfile
+
+import pytest
+
+from app.app_layer.services.csv_normalization.bulk import BulkInput, expand_inputs, normalize_files
+
+
+@pytest.fixture
+def input_dir(tmp_path: Path, input_csv_path: Path) -> Path:
+    directory = tmp_path / "exports"
+    (directory / "nested").mkdir(parents=True)
+    copyfile(input_csv_path, directory / "first.csv")
+    copyfile(input_csv_path, directory / "nested" / "second.csv")
+    (directory / "notes.txt").write_text("not a csv")
+    return directory
+
+
+def test_expand_inputs_resolves_directories_files_and_globs(input_dir: Path):
+    inputs = expand_inputs([str(input_dir), str(input_dir / "*.csv"), str(input_dir / "nested" / "second.csv")])
+
+    assert inputs == [
+        BulkInput(input_dir / "first.csv", Path()),
+        BulkInput(input_dir / "nested" / "second.csv", Path("nested")),
+    ]
+
+
+def test_expand_inputs_rejects_missing_and_colliding_files(input_dir: Path):
+    with pytest.raises(ValueError, match="No CSV files found"):
+        expand_inputs([str(input_dir / "missing-*.csv")])
+
+    copyfile(input_dir / "first.csv", input_dir / "nested" / "first.csv")
+    with pytest.raises(ValueError, match="would be written to the same output file"):
+        expand_inputs([str(input_dir / "**" / "first.csv")])
+
+
+@pytest.mark.parametrize("workers", [pytest.param(1, id="in-process"), pytest.param(2, id="per-file-workers")])
+def test_normalize_files_streams_every_file_to_disk(
+    tmp_path: Path,
+    input_dir: Path,
+    expected_csv_path: Path,
+    load_bytes: Callable[[Path], bytes],
+    workers: int,
+):
+    (input_dir / "empty.csv").touch()
+    inputs = expand_inputs([str(input_dir)])
+    finished: list[str] = []
+
+    report = normalize_files(
+        inputs, tmp_path / "out", workers=workers, on_result=lambda result: finished.append(result.source)
+    )
+
+    assert sorted(finished) == sorted(str(item.source) for item in inputs)
+    assert [result.source for result in report.files] == [str(item.source) for item in inputs]
+    assert load_bytes(tmp_path / "out" / "normalized-first.csv") == load_bytes(expected_csv_path)
+    assert load_bytes(tmp_path / "out" / "nested" / "normalized-second.csv") == load_bytes(expected_csv_path)
+    assert not list((tmp_path / "out").glob("*.part"))
+    assert report.failed_files == 1
+    assert report.files[0].error == "Uploaded file is empty"
+    assert report.files[0].target is None
+    assert (report.processed_rows, report.normalized_rows, report.skipped_rows) == (100, 100, 0)
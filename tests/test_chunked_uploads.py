@@ -0,0 +1,212 @@
+from asyncio import sleep
+from collections.abc import AsyncIterator, Callable
+from io import BytesIO
+from os import utime
+from pathlib import Path
+from time import time
+
+from httpx import AsyncClient
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.app_layer.services.csv_normalization import (
+    CsvJobManager,
+    CsvJobStatus,
+    CSVService,
+    CsvUploadIncompleteError,
+    CsvUploadRangeError,
+)
+from app.app_layer.services.csv_normalization.normalizer import DataNormalizer
+from app.configs.base import settings
+from app.configs.data_normalizer import DataNormalizerSettings
+from app.configs.jobs import CsvJobSettings
+
+UPLOADS = "/api/internal/v1/jobs/uploads"
+
+
+async def _chunks(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def _wait_for(condition: Callable[[], bool]) -> None:
+    for _ in range(200):
+        if condition():
+            return
+        await sleep(0.01)
+    raise AssertionError("Condition was not met in time")
+
+
+def _job_manager(
+    data_normalizer: DataNormalizer,
+    tmp_path: Path,
+    *,
+    idle_timeout: int = 900,
+    start_bytes: int = 1024,
+    max_concurrent_jobs: int = 2,
+) -> CsvJobManager:
+    service = CSVService(data_normalizer, normalizer_settings=DataNormalizerSettings(stream_chunk_size=1024))
+    job_settings = CsvJobSettings(
+        results_dir=tmp_path,
+        upload_idle_timeout_seconds=idle_timeout,
+        upload_start_bytes=start_bytes,
+        max_concurrent_jobs=max_concurrent_jobs,
+    )
+    return CsvJobManager(lambda: service, job_settings=job_settings)
+
+
+async def test_chunked_upload_resumes_out_of_order_ranges(
+    http_client: AsyncClient,
+    input_csv_path: Path,
+    expected_csv_path: Path,
+    load_bytes: Callable[[Path], bytes],
+):
+    payload = load_bytes(input_csv_path)
+    middle = len(payload) // 2
+
+    created = await http_client.post(UPLOADS, params={"filename": "input_data.csv", "size": len(payload)})
+    assert created.status_code == 201
+    location = created.headers["location"]
+
+    response = await http_client.put(
+        location,
+        content=payload[middle:],
+        headers={"Content-Range": f"bytes {middle}-{len(payload) - 1}/{len(payload)}"},
+    )
+    assert response.status_code == 200
+    assert response.json()["next_offset"] == 0
+    assert response.json()["missing_ranges"] == [[0, middle - 1]]
+
+    finalized = await http_client.post(f"{location}/finalize")
+    assert finalized.status_code == 409
+    assert finalized.json()["detail"] == f"Upload is missing {middle} of {len(payload)} bytes"
+
+    response = await http_client.put(
+        location,
+        content=payload[:middle],
+        headers={"Content-Range": f"bytes 0-{middle - 1}/*"},
+    )
+    assert response.json()["received_bytes"] == len(payload)
+
+    finalized = await http_client.post(f"{location}/finalize")
+    assert finalized.status_code == 202
+    job_location = finalized.headers["location"]
+
+    for _ in range(100):
+        job = (await http_client.get(job_location)).json()
+        if job["status"] == "completed":
+            break
+        await sleep(0.01)
+    assert job["status"] == "completed"
+    result = await http_client.get(f"{job_location}/result")
+    assert result.content == load_bytes(expected_csv_path)
+
+
+@pytest.mark.parametrize(
+    "content_range",
+    ["bytes 0-9/11", "bytes 5-20/*", "bytes 9-2/10", "0-9/10"],
+)
+async def test_chunked_upload_rejects_ranges_outside_the_file(http_client: AsyncClient, content_range: str):
+    created = (await http_client.post(UPLOADS, params={"filename": "data.csv", "size": 10})).json()
+
+    response = await http_client.put(
+        f"{UPLOADS}/{created['job_id']}",
+        content=b"0123456789",
+        headers={"Content-Range": content_range},
+    )
+
+    assert response.status_code == 409
+
+
+async def test_chunked_upload_larger_than_allowed_is_rejected(http_client: AsyncClient):
+    size = settings.jobs.max_upload_bytes + 1
+
+    response = await http_client.post(UPLOADS, params={"filename": "data.csv", "size": size})
+
+    assert response.status_code == 413
+    assert response.json()["detail"] == f"Upload of {size} bytes is larger than the {size - 1} allowed"
+
+
+async def test_stalled_upload_does_not_hold_a_running_slot(data_normalizer: DataNormalizer, tmp_path: Path):
+    jobs = _job_manager(data_normalizer, tmp_path, start_bytes=64, max_concurrent_jobs=1)
+    session = await jobs.create_upload("contacts.csv", 100)
+    await jobs.write_upload(session.job_id, 0, 12, _chunks(b"id;phone;dob\n"))
+
+    queued = await jobs.submit(
+        UploadFile(file=BytesIO(b"id;phone;dob\nU1;0501234567;1990-01-02\n"), filename="queued.csv"),
+    )
+    await _wait_for(lambda: queued.status is CsvJobStatus.COMPLETED)
+
+    assert jobs.get(session.job_id).status is CsvJobStatus.PENDING
+    await jobs.stop()
+
+
+async def test_job_normalizes_leading_bytes_before_upload_completes(data_normalizer: DataNormalizer, tmp_path: Path):
+    rows = b"".join(b"U%d;0501234567;1990-01-02\n" % number for number in range(3000))
+    payload = b"id;phone;dob\n" + rows
+    middle = len(payload) // 2
+    jobs = _job_manager(data_normalizer, tmp_path)
+
+    session = await jobs.create_upload("contacts.csv", len(payload))
+    await jobs.write_upload(session.job_id, 0, middle - 1, _chunks(payload[:middle]))
+    job = jobs.get(session.job_id)
+    await _wait_for(lambda: job.processed_rows > 0)
+
+    assert job.status is CsvJobStatus.RUNNING
+    with pytest.raises(CsvUploadIncompleteError):
+        await jobs.finalize_upload(session.job_id)
+
+    await jobs.write_upload(session.job_id, middle, len(payload) - 1, _chunks(payload[middle:]))
+    await _wait_for(lambda: job.status is CsvJobStatus.COMPLETED)
+
+    assert job.processed_rows == job.normalized_rows == 3000
+    assert (await jobs.finalize_upload(session.job_id)).status is CsvJobStatus.COMPLETED
+    with pytest.raises(CsvUploadRangeError, match="no longer accepts bytes"):
+        await jobs.write_upload(session.job_id, 0, 0, _chunks(b"i"))
+    await jobs.stop()
+
+
+async def test_idle_upload_fails_its_job(data_normalizer: DataNormalizer, tmp_path: Path):
+    jobs = _job_manager(data_normalizer, tmp_path, idle_timeout=0)
+
+    session = await jobs.create_upload("contacts.csv", 100)
+    await jobs.write_upload(session.job_id, 0, 12, _chunks(b"id;phone;dob\n"))
+    await jobs.cleanup()
+    job = jobs.get(session.job_id)
+    await _wait_for(lambda: job.status is CsvJobStatus.FAILED)
+
+    assert job.error == "Upload received no bytes for too long"
+    assert not (tmp_path / f"{session.job_id}.upload").exists()
+    await jobs.stop()
+
+
+async def test_cleanup_keeps_uploads_of_jobs_still_queued(data_normalizer: DataNormalizer, tmp_path: Path):
+    service = CSVService(data_normalizer)
+    job_settings = CsvJobSettings(
+        results_dir=tmp_path,
+        max_concurrent_jobs=1,
+        result_ttl_seconds=60,
+        upload_start_bytes=13,
+    )
+    jobs = CsvJobManager(lambda: service, job_settings=job_settings)
+    # A chunked upload started on its header holds the only slot while it waits for the rest
+    session = await jobs.create_upload("contacts.csv", 100)
+    await jobs.write_upload(session.job_id, 0, 12, _chunks(b"id;phone;dob\n"))
+    await _wait_for(lambda: jobs.get(session.job_id).status is CsvJobStatus.RUNNING)
+    queued = await jobs.submit(
+        UploadFile(file=BytesIO(b"id;phone;dob\nU1;0501234567;1990-01-02\n"), filename="queued.csv"),
+    )
+    orphan = tmp_path / f"{'0' * 32}.upload"
+    orphan.write_bytes(b"left behind by another worker")
+    an_hour_ago = time() - 3600
+    for path in (tmp_path / f"{queued.job_id}.upload", orphan):
+        utime(path, (an_hour_ago, an_hour_ago))
+
+    await jobs.cleanup()
+    await jobs.write_upload(session.job_id, 13, 99, _chunks(b"\n" * 87))
+    await _wait_for(lambda: queued.finished_at is not None)
+
+    assert queued.status is CsvJobStatus.COMPLETED
+    assert queued.normalized_rows == 1
+    assert not orphan.exists()
+    await jobs.stop()
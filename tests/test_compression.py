@@ -0,0 +1,135 @@
+from collections.abc import Callable
+import gzip
+from pathlib import Path
+
+from httpx import AsyncClient
+import pytest
+from starlette.datastructures import Headers, UploadFile
+
+from app.app_layer.services.csv_normalization import Compression, CsvFileError
+from app.app_layer.services.csv_normalization.compression import (
+    StreamCompressor,
+    StreamDecompressor,
+    detect_compression,
+    zstd_available,
+)
+from app.app_layer.services.csv_normalization.normalizer import DataNormalizer
+from app.app_layer.services.csv_normalization.service import CSVService
+from app.configs.data_normalizer import DataNormalizerSettings
+
+
+def _compress(compression: Compression, payload: bytes) -> bytes:
+    compressor = StreamCompressor(compression)
+    return compressor.compress(payload) + compressor.finish()
+
+
+CODECS = [
+    Compression.GZIP,
+    Compression.BZIP2,
+    pytest.param(
+        Compression.ZSTD,
+        marks=pytest.mark.skipif(not zstd_available(), reason="zstd needs the 'zstd' extra"),
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    ("filename", "headers", "expected"),
+    [
+        ("contacts.csv", {}, None),
+        ("contacts.csv.gz", {}, Compression.GZIP),
+        ("CONTACTS.CSV.ZST", {}, Compression.ZSTD),
+        ("contacts", {"content-type": "application/x-bzip2"}, Compression.BZIP2),
+        ("contacts.csv", {"content-encoding": "gzip"}, Compression.GZIP),
+        ("contacts.csv.gz", {"content-encoding": "identity"}, Compression.GZIP),
+    ],
+)
+def test_detect_compression(filename: str, headers: dict[str, str], expected: Compression | None):
+    assert detect_compression(filename, Headers(headers)) is expected
+
+
+@pytest.mark.parametrize("compression", CODECS)
+def test_stream_decompressor_bounds_output_and_reads_concatenated_streams(compression: Compression):
+    payload = b"id;phone;dob\n" + b"1;0501234567;2000-01-01\n" * 20_000
+    compressed = _compress(compression, payload[:1000]) + _compress(compression, payload[1000:])
+    decompressor = StreamDecompressor(compression, max_chunk_size=4096)
+
+    outputs = [
+        output
+        for offset in range(0, len(compressed), 7)
+        for output in decompressor.decompress(compressed[offset : offset + 7])
+    ]
+    decompressor.finish()
+
+    assert b"".join(outputs) == payload
+    assert max(map(len, outputs)) <= 4096
+
+
+def test_stream_decompressor_rejects_truncated_and_invalid_data():
+    decompressor = StreamDecompressor(Compression.GZIP, max_chunk_size=4096)
+    list(decompressor.decompress(gzip.compress(b"id;phone;dob\n")[:-4]))
+    with pytest.raises(CsvFileError, match="truncated"):
+        decompressor.finish()
+
+    with pytest.raises(CsvFileError, match="not valid bzip2 data"):
+        list(StreamDecompressor(Compression.BZIP2, max_chunk_size=4096).decompress(b"not bzip2"))
+
+
+@pytest.mark.parametrize("compression", CODECS)
+async def test_csv_service_decompresses_uploads(
+    input_csv_path: Path,
+    expected_csv_path: Path,
+    load_bytes: Callable[[Path], bytes],
+    compression: Compression,
+    tmp_path: Path,
+):
+    # Small reads make every compressed chunk boundary fall inside CSV rows
+    service = CSVService(DataNormalizer(), normalizer_settings=DataNormalizerSettings(stream_chunk_size=64))
+    path = tmp_path / "upload"
+    path.write_bytes(_compress(compression, load_bytes(input_csv_path)))
+
+    with path.open("rb") as source:
+        upload = UploadFile(file=source, filename="input_data.csv", headers=Headers({"content-encoding": compression}))
+        result = await service.process(upload)
+
+    assert result.filename == "normalized-input_data.csv"
+    assert result.content == load_bytes(expected_csv_path)
+
+
+async def test_normalize_endpoint_accepts_gzip_upload_and_compresses_response(
+    http_client: AsyncClient,
+    input_csv_path: Path,
+    expected_csv_path: Path,
+    load_bytes: Callable[[Path], bytes],
+):
+    files = {"file": ("input_data.csv.gz", gzip.compress(load_bytes(input_csv_path)), "application/octet-stream")}
+
+    response = await http_client.post(
+        "/api/internal/v1/upload/normalize",
+        params={"stream": True},
+        files=files,
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["content-disposition"] == 'attachment; filename="normalized-input_data.csv"'
+    assert response.content == load_bytes(expected_csv_path)
+
+
+async def test_normalize_endpoint_rejects_unknown_content_encoding(http_client: AsyncClient):
+    files = {"file": ("data.csv", b"payload", "text/csv", {"Content-Encoding": "br"})}
+
+    response = await http_client.post("/api/internal/v1/upload/normalize", files=files)
+
+    assert response.status_code == 415
+    assert response.json()["detail"] == "Unsupported content encoding: br"
+
+
+async def test_small_and_identity_responses_are_not_compressed(http_client: AsyncClient):
+    response = await http_client.get("/api/internal/v1/upload/normalize/cache", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+    response = await http_client.get("/metrics", headers={"Accept-Encoding": "gzip;q=0, identity"})
+    assert "content-encoding" not in response.headers
@@ -0,0 +1,127 @@
+from io import BytesIO
+
+from httpx import AsyncClient
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.app_layer.services.csv_normalization import (
+    DateLayoutProfile,
+    DedupPolicy,
+    NormalizationCache,
+    OutputFormat,
+    RowFlag,
+)
+from app.app_layer.services.csv_normalization.batch import confidence_label
+from app.app_layer.services.csv_normalization.normalizer import DataNormalizer
+from app.app_layer.services.csv_normalization.service import CSVService
+
+PAYLOAD = (
+    b"id;phone;dob\n"
+    b"U1;+971501234567;1990-01-02\n"
+    b"U2;0501234567;13/05/1990\n"
+    b"U3;00971501234567;05/13/1990\n"
+    b"U4;+971501234567;020190\n"
+    b"U4;+971501234567;020190\n"
+)
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_normalizer_flags_inferred_values(cached: bool):  # noqa: FBT001
+    data_normalizer = DataNormalizer(cache=NormalizationCache(max_entries=100) if cached else None)
+    dobs = ["1990-01-02", "05/13/1990", "020190", "5 Apr 04", "02.01.90", "bad"]
+    phones = ["+971501234567", "0501234567", "00971501234567", "+971 (0) 50 123 4567", "501234567", ""]
+
+    for _ in range(2):
+        dob_column = data_normalizer.normalize_dobs(dobs)
+        phone_column = data_normalizer.normalize_phones(phones)
+
+        assert dob_column.flags == {
+            1: RowFlag.DOB_SWAPPED,
+            2: RowFlag.DOB_CENTURY_INFERRED,
+            3: RowFlag.DOB_CENTURY_INFERRED,
+            4: RowFlag.DOB_CENTURY_INFERRED,
+        }
+        assert phone_column.flags == {1: RowFlag.PHONE_COUNTRY_DEFAULTED, 4: RowFlag.PHONE_COUNTRY_DEFAULTED}
+
+
+async def test_single_value_lookups_keep_the_flags_of_shared_cache_entries():
+    data_normalizer = DataNormalizer(cache=NormalizationCache(max_entries=100))
+    dobs = ["1990-01-02", "05/13/1990", "020190"]
+    phones = ["+971501234567", "0501234567", "501234567"]
+
+    assert [await data_normalizer.get_date_of_birth(dob) for dob in dobs] == ["1990-01-02", "1990-05-13", "1990-01-02"]
+    assert [await data_normalizer.get_phone(phone) for phone in phones] == ["+971501234567"] * 3
+
+    assert data_normalizer.normalize_dobs(dobs).flags == {1: RowFlag.DOB_SWAPPED, 2: RowFlag.DOB_CENTURY_INFERRED}
+    assert data_normalizer.normalize_phones(phones).flags == {
+        1: RowFlag.PHONE_COUNTRY_DEFAULTED,
+        2: RowFlag.PHONE_COUNTRY_DEFAULTED,
+    }
+    assert await data_normalizer.get_phone("0501234567") == "+971501234567"
+
+
+def test_layout_fast_path_flags_inferred_centuries(data_normalizer: DataNormalizer):
+    profile = DateLayoutProfile(layouts=("DD/MM/YYYY",))
+
+    column = data_normalizer.normalize_dobs(["02.01.1990", "02.01.90"], profile)
+
+    assert column.values == ["1990-01-02", "1990-01-02"]
+    assert column.flags == {1: RowFlag.DOB_CENTURY_INFERRED}
+
+
+def test_confidence_label_names_every_flag():
+    assert confidence_label(0) == "exact"
+    assert (
+        confidence_label(RowFlag.DOB_SWAPPED | RowFlag.PHONE_COUNTRY_DEFAULTED) == "dob_swapped|phone_country_defaulted"
+    )
+
+
+@pytest.mark.parametrize("dedup", [None, DedupPolicy.FIRST])
+async def test_csv_service_writes_confidence_column(data_normalizer: DataNormalizer, dedup: DedupPolicy | None):
+    service = CSVService(data_normalizer)
+
+    result = await service.process(UploadFile(file=BytesIO(PAYLOAD), filename="data.csv"), dedup=dedup, confidence=True)
+
+    duplicate = "" if dedup else "U4;+971501234567;1990-01-02;dob_century_inferred\n"
+    assert result.content.decode() == (
+        "id;phone;dob;confidence\n"
+        "U1;+971501234567;1990-01-02;exact\n"
+        "U2;+971501234567;1990-05-13;phone_country_defaulted\n"
+        "U3;+971501234567;1990-05-13;dob_swapped\n"
+        "U4;+971501234567;1990-01-02;dob_century_inferred\n" + duplicate
+    )
+
+
+async def test_csv_service_writes_confidence_column_to_arrow(data_normalizer: DataNormalizer):
+    pa = pytest.importorskip("pyarrow")
+    service = CSVService(data_normalizer)
+
+    result = await service.process(
+        UploadFile(file=BytesIO(PAYLOAD), filename="data.csv"),
+        output_format=OutputFormat.ARROW,
+        confidence=True,
+    )
+
+    table = pa.ipc.open_stream(result.content).read_all()
+    assert table.column("confidence").to_pylist() == [
+        "exact",
+        "phone_country_defaulted",
+        "dob_swapped",
+        "dob_century_inferred",
+        "dob_century_inferred",
+    ]
+
+
+async def test_normalize_endpoint_adds_confidence_column(http_client: AsyncClient):
+    response = await http_client.post(
+        "/api/internal/v1/upload/normalize",
+        params={"confidence": True},
+        files={"file": ("data.csv", PAYLOAD, "text/csv")},
+    )
+
+    assert response.status_code == 200
+    assert response.text.splitlines()[:3] == [
+        "id;phone;dob;confidence",
+        "U1;+971501234567;1990-01-02;exact",
+        "U2;+971501234567;1990-05-13;phone_country_defaulted",
+    ]
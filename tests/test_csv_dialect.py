@@ -0,0 +1,70 @@
+from collections.abc import Callable
+import csv
+from io import BytesIO, StringIO
+from pathlib import Path
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.app_layer.services.csv_normalization import CsvNormalizationError
+from app.app_layer.services.csv_normalization.dialect import CsvDialect, sniff_dialect
+from app.app_layer.services.csv_normalization.normalizer import DataNormalizer
+from app.app_layer.services.csv_normalization.service import CSVService
+from app.configs.data_normalizer import DataNormalizerSettings
+
+
+def _service(sniff_size: int = 16 * 1024) -> CSVService:
+    settings = DataNormalizerSettings(stream_chunk_size=256, sniff_size=sniff_size)
+    return CSVService(DataNormalizer(), normalizer_settings=settings)
+
+
+def _rewrite(payload: bytes, *, delimiter: str, encoding: str, quoting: int = csv.QUOTE_MINIMAL) -> bytes:
+    rows = csv.reader(StringIO(payload.decode("utf-8")), delimiter=";")
+    buffer = StringIO()
+    csv.writer(buffer, delimiter=delimiter, quoting=quoting, lineterminator="\r\n").writerows(rows)
+    return buffer.getvalue().encode(encoding)
+
+
+@pytest.mark.parametrize(
+    ("encoding", "delimiter"),
+    [
+        ("utf-8-sig", ","),
+        ("utf-16", "\t"),
+        ("utf-16-le", "|"),
+        ("utf-16-be", ";"),
+        ("cp1252", ","),
+    ],
+)
+async def test_csv_service_sniffs_encoding_and_delimiter(
+    input_csv_path: Path,
+    expected_csv_path: Path,
+    load_bytes: Callable[[Path], bytes],
+    encoding: str,
+    delimiter: str,
+):
+    payload = _rewrite(load_bytes(input_csv_path), delimiter=delimiter, encoding=encoding)
+
+    result = await _service().process(UploadFile(file=BytesIO(payload), filename="input_data.csv"))
+
+    assert result.content == load_bytes(expected_csv_path)
+
+
+def test_sniff_dialect_reads_quoted_fields_and_cp1252():
+    sample = "'id','phone','dob'\r\n'Zoë, Jr','0501234567','1990-01-02'\r\n".encode("cp1252")
+
+    assert sniff_dialect(sample, final=True) == CsvDialect(encoding="cp1252", delimiter=",", quotechar="'")
+
+
+async def test_csv_service_keeps_cp1252_text():
+    payload = "id,phone,dob\r\nZoë,0501234567,1990-01-02\r\n".encode("cp1252")
+
+    result = await _service().process(UploadFile(file=BytesIO(payload), filename="contacts.csv"))
+
+    assert result.content.decode("utf-8") == "id;phone;dob\nZoë;+971501234567;1990-01-02\n"
+
+
+async def test_csv_service_rejects_invalid_bytes_after_sniffed_prefix():
+    payload = b"id;phone;dob\n" + b"1;0501234567;1990-01-02\n" * 20 + b"2;\xff;1990-01-02\n"
+
+    with pytest.raises(CsvNormalizationError, match="CSV is not valid UTF-8"):
+        await _service(sniff_size=64).process(UploadFile(file=BytesIO(payload), filename="contacts.csv"))
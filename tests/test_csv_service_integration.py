@@ -1,10 +1,17 @@
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 from pathlib import Path
 from tempfile import SpooledTemporaryFile
 
+import pytest
 from starlette.datastructures import UploadFile
 
+from app.app_layer.services.csv_normalization import CsvSkipReason, CsvSkipReportStore, SkipReport
+from app.app_layer.services.csv_normalization.batch import SkippedRow, init_worker
+from app.app_layer.services.csv_normalization.normalizer import DataNormalizer
 from app.app_layer.services.csv_normalization.service import CSVService
+from app.configs.data_normalizer import DataNormalizerSettings
 
 
 async def test_csv_service_processes_file(
@@ -31,3 +38,120 @@ async def test_csv_service_processes_file(
     assert not result.skipped
     assert result.content_type == "text/csv"
     assert result.content == load_bytes(expected_csv_path)
+
+
+async def test_csv_service_streams_across_chunk_boundaries(
+    data_normalizer: DataNormalizer,
+    input_csv_path: Path,
+    expected_csv_path: Path,
+    load_bytes: Callable[[Path], bytes],
+):
+    csv_service = CSVService(
+        normalizer=data_normalizer, normalizer_settings=DataNormalizerSettings(stream_chunk_size=7)
+    )
+    with SpooledTemporaryFile() as buffer:
+        buffer.write(load_bytes(input_csv_path))
+        buffer.seek(0)
+        upload: UploadFile = UploadFile(filename=input_csv_path.name, file=buffer)
+
+        result = await csv_service.stream(upload)
+        chunks = [chunk async for chunk in result.content]
+
+    assert chunks[0] == b"id;phone;dob\n"
+    assert b"".join(chunks) == load_bytes(expected_csv_path)
+    assert result.summary.processed_rows == 50
+    assert result.summary.normalized_rows == 50
+
+
+async def test_csv_service_keeps_quoted_line_breaks_split_between_chunks(data_normalizer: DataNormalizer):
+    payload = 'id;phone;dob\r\n"U\r\n1";0501234567;1990-01-02\r\nU2;"0501234568";"02 Jan\n1990"\r\n;1;2\r\n'
+    csv_service = CSVService(
+        normalizer=data_normalizer, normalizer_settings=DataNormalizerSettings(stream_chunk_size=3)
+    )
+    with SpooledTemporaryFile() as buffer:
+        buffer.write(payload.encode("utf-8"))
+        buffer.seek(0)
+        result = await csv_service.process(UploadFile(filename="quoted", file=buffer))
+
+    assert result.filename == "normalized-quoted.csv"
+    assert result.content == b'id;phone;dob\n"U\r\n1";+971501234567;1990-01-02\nU2;+971501234568;1990-01-02\n'
+    assert result.processed_rows == 3
+    assert result.skipped == [CsvSkipReason(reason="ID value is missing", count=1, row_numbers=[4])]
+
+
+async def test_csv_service_normalizes_in_process_pool_preserving_row_order(
+    data_normalizer: DataNormalizer,
+    input_csv_path: Path,
+    load_bytes: Callable[[Path], bytes],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    payload = load_bytes(input_csv_path) + b";0501234567;1990-01-02\nU999;;1990-01-02\n"
+    pickled = []
+    get_state = DataNormalizer.__getstate__
+    monkeypatch.setattr(DataNormalizer, "__getstate__", lambda self: pickled.append(self) or get_state(self))
+    inline_service = CSVService(normalizer=data_normalizer)
+    with ProcessPoolExecutor(
+        max_workers=2,
+        mp_context=get_context("spawn"),
+        initializer=init_worker,
+        initargs=(data_normalizer,),
+    ) as executor:
+        parallel_service = CSVService(
+            normalizer=data_normalizer,
+            executor=executor,
+            normalizer_settings=DataNormalizerSettings(
+                stream_chunk_size=64,
+                parallel_threshold_bytes=0,
+                parallel_batch_rows=7,
+            ),
+        )
+        results = []
+        for service in (inline_service, parallel_service):
+            with SpooledTemporaryFile() as buffer:
+                buffer.write(payload)
+                buffer.seek(0)
+                results.append(await service.process(UploadFile(filename="data.csv", file=buffer, size=len(payload))))
+
+    inline, parallel = results
+    assert parallel.content == inline.content
+    assert parallel.processed_rows == 52
+    assert parallel.skipped == [
+        CsvSkipReason(reason="ID value is missing", count=1, row_numbers=[52]),
+        CsvSkipReason(reason="Missing phone value", count=1, row_numbers=[53]),
+    ]
+    # Sent to each worker as it starts, not with each of the 8 batches
+    assert 0 < len(pickled) <= 2
+
+
+async def test_csv_service_aggregates_skips_and_spills_full_report(data_normalizer: DataNormalizer, tmp_path: Path):
+    rows = [f";050123456{index};1990-01-02" for index in range(5)] + ["U9;0501234567;31/31/1990"]
+    payload = "\n".join(["id;phone;dob", *rows, ""]).encode("utf-8")
+    csv_service = CSVService(normalizer=data_normalizer, skip_reports=CsvSkipReportStore(reports_dir=tmp_path))
+    with SpooledTemporaryFile() as buffer:
+        buffer.write(payload)
+        buffer.seek(0)
+        result = await csv_service.process(UploadFile(filename="data.csv", file=buffer), skip_report=True)
+
+    assert result.skipped_rows == 6
+    assert [(item.reason, item.count) for item in result.skipped] == [
+        ("ID value is missing", 5),
+        ("Date of birth value is not a valid date", 1),
+    ]
+    assert len(result.skipped[0].row_numbers) == 5
+    assert result.skip_report_id is not None
+    report = csv_service.skip_reports.path(result.skip_report_id)
+    assert report is not None
+    assert report.read_text(encoding="utf-8").splitlines() == [
+        "row_number;reason",
+        *(f"{row_number};ID value is missing" for row_number in range(2, 7)),
+        "7;Date of birth value is not a valid date",
+    ]
+
+
+def test_skip_report_keeps_bounded_row_sample():
+    report = SkipReport(sample_size=2)
+    report.add([SkippedRow(row_number, "Missing phone value") for row_number in range(2, 1002)])
+
+    assert report.total == 1000
+    assert report.reasons() == [CsvSkipReason(reason="Missing phone value", count=1000, row_numbers=[2, 3])]
+    assert report.details() == "Missing phone value: 1000"
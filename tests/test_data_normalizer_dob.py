@@ -3,6 +3,7 @@ from pathlib import Path
 
 import pytest
 
+from app.app_layer.services.csv_normalization.cache import NormalizationCache
 from app.app_layer.services.csv_normalization.normalizer import DataNormalizer
 
 _RESOURCES_DIR = Path(__file__).resolve().parent / "resources"
@@ -36,3 +37,92 @@ async def test_get_phone_normalizes_to_e164(
     normalized: str = await data_normalizer.get_phone(raw_phone)
 
     assert normalized == expected_phone
+
+
+def test_normalize_dobs_matches_per_value_results(data_normalizer: DataNormalizer):
+    raw_values = [row["dob"] for row in _INPUT_ROWS]
+
+    result = data_normalizer.normalize_dobs([*raw_values, None, "31/31/1990"])
+
+    assert result.values == [*(_EXPECTED_OUTPUT[row["id"]]["dob"] for row in _INPUT_ROWS), None, None]
+    assert result.errors == {len(raw_values): "Missing date of birth value", len(raw_values) + 1: ""}
+
+
+@pytest.mark.parametrize(
+    "separator_value",
+    [
+        pytest.param("050 123 4567", id="joined-column"),
+        pytest.param("050\x00123\x004567", id="separator-in-value"),
+    ],
+)
+def test_normalize_phones_matches_per_value_results(data_normalizer: DataNormalizer, separator_value: str):
+    raw_values = [row["phone"] for row in _INPUT_ROWS]
+
+    result = data_normalizer.normalize_phones([*raw_values, separator_value, "", "+12", "abc"])
+
+    assert (
+        result.values == [*(_EXPECTED_OUTPUT[row["id"]]["phone"] for row in _INPUT_ROWS), "+971501234567"] + [None] * 3
+    )
+    assert result.errors == {
+        len(raw_values) + 1: "Missing phone value",
+        len(raw_values) + 2: "Phone value is too short for E.164 format",
+        len(raw_values) + 3: "Input phone value must contain digits",
+    }
+
+
+async def test_cache_serves_repeated_values_and_failures():
+    cache = NormalizationCache(max_entries=3)
+    data_normalizer = DataNormalizer(cache=cache)
+
+    result = data_normalizer.normalize_dobs(["01/01/1990", "Jan 1 1990", "01/01/1990", "bad"])
+    assert result.values == ["1990-01-01", "1990-01-01", "1990-01-01", None]
+    assert result.errors == {3: ""}
+    assert await data_normalizer.get_date_of_birth("Jan 1 1990") == "1990-01-01"
+    with pytest.raises(ValueError, match=r"^$"):
+        await data_normalizer.get_date_of_birth("bad")
+
+    assert cache.stats.model_dump() == {"max_entries": 3, "size": 3, "hits": 2, "misses": 4, "evictions": 0}
+
+    assert await data_normalizer.get_phone("0501234567") == "+971501234567"
+    assert cache.stats.evictions == 1
+
+
+async def test_cache_is_keyed_on_normalizer_settings():
+    cache = NormalizationCache(max_entries=10)
+
+    uae = DataNormalizer(cache=cache, default_country_code="971")
+    russia = DataNormalizer(cache=cache, default_country_code="7")
+
+    assert await uae.get_phone("0501234567") == "+971501234567"
+    assert await russia.get_phone("0501234567") == "+7501234567"
+    assert cache.stats.hits == 0
+
+
+def test_detected_layouts_keep_generic_results(data_normalizer: DataNormalizer):
+    raw_values = [row["dob"] for row in _INPUT_ROWS]
+
+    profile = data_normalizer.detect_dob_layouts(raw_values)
+    result = data_normalizer.normalize_dobs(raw_values, profile)
+
+    assert profile.layouts[0] == "DD/MM/YYYY"
+    assert not profile.month_first
+    assert result.values == [_EXPECTED_OUTPUT[row["id"]]["dob"] for row in _INPUT_ROWS]
+
+
+def test_month_first_file_reads_ambiguous_dates_consistently(data_normalizer: DataNormalizer):
+    raw_values = ["12/31/1990", "04/05/2004", "01/02/1990", "19900102", "31/12/1990", "Jan 2, 1990", "99/99/99"]
+
+    profile = data_normalizer.detect_dob_layouts(raw_values[:4])
+    result = data_normalizer.normalize_dobs(raw_values, profile)
+
+    assert profile.month_first
+    assert result.values == [
+        "1990-12-31",
+        "2004-04-05",
+        "1990-01-02",
+        "1990-01-02",
+        "1990-12-31",
+        "1990-01-02",
+        None,
+    ]
+    assert result.errors == {6: ""}
@@ -0,0 +1,110 @@
+from io import BytesIO
+
+from httpx import AsyncClient
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.app_layer.services.csv_normalization import (
+    CountryPlan,
+    CsvNormalizationError,
+    CSVService,
+    DataNormalizer,
+    NumberingPlans,
+)
+
+
+def _plan(calling_code: str, *regions: str, trunk_prefix: str = "", lengths: tuple[int, ...] = (9,)) -> CountryPlan:
+    return CountryPlan(calling_code, regions, trunk_prefix, frozenset(lengths))
+
+
+def test_numbering_plans_reject_calling_codes_that_are_not_prefix_free():
+    with pytest.raises(ValueError, match="extends calling code 1"):
+        NumberingPlans([_plan("1", "US"), _plan("12", "XX")])
+
+
+def test_numbering_plans_resolve_regions_and_calling_codes():
+    plans = NumberingPlans([_plan("44", "GB", trunk_prefix="0", lengths=(10,)), _plan("1", "US", "CA")])
+
+    assert plans.resolve("gb") is plans.resolve("+44") is plans.match("442079460958")
+    assert plans.resolve(" ca ") is plans.resolve("US")
+    assert plans.resolve("FR") is None
+    assert plans.match("33612345678") is None
+
+
+@pytest.mark.parametrize(
+    ("raw_phone", "expected_phone"),
+    [
+        pytest.param("+44 (0)20 7946 0958", "+442079460958", id="international-with-trunk-prefix"),
+        pytest.param("0044 20 7946 0958", "+442079460958", id="double-zero"),
+        pytest.param("+1 (415) 555-0132", "+14155550132", id="nanp"),
+        pytest.param("+39 06 6982 1234", "+390669821234", id="leading-zero-plan"),
+        pytest.param("050 123 4567", "+971501234567", id="default-country-trunk-prefix"),
+    ],
+)
+async def test_get_phone_applies_numbering_plans(
+    raw_phone: str,
+    expected_phone: str,
+    data_normalizer: DataNormalizer,
+):
+    assert await data_normalizer.get_phone(raw_phone) == expected_phone
+
+
+async def test_get_phone_reads_local_numbers_in_hinted_country(data_normalizer: DataNormalizer):
+    assert await data_normalizer.get_phone("020 7946 0958", "GB") == "+442079460958"
+    assert await data_normalizer.get_phone("(415) 555-0132", "+1") == "+14155550132"
+
+    with pytest.raises(ValueError, match="Unknown country hint"):
+        await data_normalizer.get_phone("020 7946 0958", "ZZ")
+
+
+def test_normalize_phones_with_per_row_hints_matches_per_value_results(data_normalizer: DataNormalizer):
+    result = data_normalizer.normalize_phones(
+        ["020 7946 0958", "(415) 555-0132", "050 123 4567", "050 123 4567", "12345"],
+        ["gb", "US", None, "", "ZZ"],
+    )
+
+    assert result.values == ["+442079460958", "+14155550132", "+971501234567", "+971501234567", None]
+    assert result.errors == {4: "Unknown country hint"}
+
+
+def test_normalize_phones_with_unknown_column_hint_fails_every_row(data_normalizer: DataNormalizer):
+    result = data_normalizer.normalize_phones(["050 123 4567", None], "ZZ")
+
+    assert result.values == [None, None]
+    assert result.errors == {0: "Unknown country hint", 1: "Unknown country hint"}
+
+
+def test_strict_numbering_rejects_numbers_no_plan_accepts():
+    lenient = DataNormalizer(strict_phone_numbering=False).normalize_phones(["+999 1234 5678", "050 123 4567"])
+    strict = DataNormalizer(strict_phone_numbering=True).normalize_phones(["+999 1234 5678", "050 123 4567"])
+
+    assert lenient.values == ["+99912345678", "+971501234567"]
+    assert strict.values == [None, "+971501234567"]
+    assert strict.errors == {0: "Phone value does not match any numbering plan"}
+
+
+async def test_csv_service_reads_phones_per_country_column_and_hint(csv_service: CSVService):
+    content = b"id;phone;dob;Country\n1;020 7946 0958;01/01/1990;GB\n2;(415) 555-0132;01/01/1990;\n"
+
+    result = await csv_service.process(UploadFile(file=BytesIO(content), filename="mixed.csv"), country="US")
+
+    assert result.content.decode() == "id;phone;dob\n1;+442079460958;1990-01-01\n2;+14155550132;1990-01-01\n"
+
+
+async def test_csv_service_rejects_unknown_country_hint(csv_service: CSVService):
+    content = b"id;phone;dob\n1;020 7946 0958;01/01/1990\n"
+
+    with pytest.raises(CsvNormalizationError, match="Unknown country hint: ZZ"):
+        await csv_service.process(UploadFile(file=BytesIO(content), filename="data.csv"), country="ZZ")
+
+
+async def test_normalize_endpoint_applies_country_hint(http_client: AsyncClient):
+    files = {"file": ("data.csv", b"id;phone;dob\n1;020 7946 0958;01/01/1990\n", "text/csv")}
+
+    response = await http_client.post("/api/internal/v1/upload/normalize", files=files, params={"country": "GB"})
+    rejected = await http_client.post("/api/internal/v1/upload/normalize", files=files, params={"country": "ZZ"})
+
+    assert response.status_code == 200
+    assert response.text == "id;phone;dob\n1;+442079460958;1990-01-01\n"
+    assert rejected.status_code == 400
+    assert rejected.json()["detail"] == "Unknown country hint: ZZ"
@@ -0,0 +1,121 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from httpx import AsyncClient
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.app_layer.services.csv_normalization import CsvNormalizationError, CsvSkipReason, DedupPolicy, OutputFormat
+from app.app_layer.services.csv_normalization.batch import init_worker
+from app.app_layer.services.csv_normalization.dedup import CONFLICTING_ID_REASON, IdHashIndex
+from app.app_layer.services.csv_normalization.normalizer import DataNormalizer
+from app.app_layer.services.csv_normalization.service import CSVService
+from app.configs.data_normalizer import DataNormalizerSettings
+
+PAYLOAD = (
+    b"id;phone;dob\n"
+    b"U1;0501234567;1990-01-02\n"
+    b"U2;0507654321;1985-05-06\n"
+    b"U1;0501234567;1990-01-02\n"
+    b"U2;0509999999;1985-05-06\n"
+    b"U3;;1970-01-01\n"
+    b"U1;0501111111;1990-01-02\n"
+)
+
+
+def test_id_hash_index_grows_and_keeps_values():
+    index = IdHashIndex(max_entries=10_000, with_values=True, capacity=8)
+
+    for number in range(5000):
+        assert index.insert(f"id-{number}", number) is None
+    index.put("id-7", 70)
+
+    assert len(index) == 5000
+    assert index.insert("id-42", -1) == 42
+    assert index.get("id-7") == 70
+    assert index.get("id-5000") is None
+
+
+def test_id_hash_index_refuses_more_ids_than_allowed():
+    index = IdHashIndex(max_entries=3)
+    for row_id in ("a", "b", "c", "a"):
+        index.insert(row_id)
+
+    with pytest.raises(CsvNormalizationError, match="More than 3 distinct ids"):
+        index.insert("d")
+
+
+@pytest.mark.parametrize(
+    ("dedup", "content", "duplicates"),
+    [
+        (
+            DedupPolicy.FIRST,
+            "id;phone;dob\nU1;+971501234567;1990-01-02\nU2;+971507654321;1985-05-06\n",
+            [CsvSkipReason(reason="Duplicate id", count=3, row_numbers=[4, 5, 7])],
+        ),
+        (
+            DedupPolicy.LAST,
+            "id;phone;dob\nU2;+971509999999;1985-05-06\nU1;+971501111111;1990-01-02\n",
+            [CsvSkipReason(reason="Duplicate id", count=3, row_numbers=[2, 3, 4])],
+        ),
+        (
+            DedupPolicy.CONFLICTS,
+            "id;phone;dob\nU1;+971501234567;1990-01-02\nU2;+971507654321;1985-05-06\n",
+            [
+                CsvSkipReason(reason="Duplicate id", count=1, row_numbers=[4]),
+                CsvSkipReason(reason=CONFLICTING_ID_REASON, count=2, row_numbers=[5, 7]),
+            ],
+        ),
+    ],
+)
+async def test_csv_service_deduplicates_by_id(
+    data_normalizer: DataNormalizer,
+    dedup: DedupPolicy,
+    content: str,
+    duplicates: list[CsvSkipReason],
+):
+    settings = DataNormalizerSettings(stream_chunk_size=16, parallel_threshold_bytes=0, parallel_batch_rows=2)
+    with ThreadPoolExecutor(max_workers=2, initializer=init_worker, initargs=(data_normalizer,)) as executor:
+        for service in (
+            CSVService(data_normalizer, normalizer_settings=settings),
+            CSVService(data_normalizer, executor=executor, normalizer_settings=settings),
+        ):
+            upload = UploadFile(file=BytesIO(PAYLOAD), filename="data.csv", size=len(PAYLOAD))
+            result = await service.process(upload, dedup=dedup)
+
+            assert result.content.decode() == content
+            assert result.processed_rows == 6
+            assert result.normalized_rows == 2
+            assert sorted(result.skipped, key=lambda reason: reason.reason) == sorted(
+                [*duplicates, CsvSkipReason(reason="Missing phone value", count=1, row_numbers=[6])],
+                key=lambda reason: reason.reason,
+            )
+
+
+async def test_csv_service_deduplicates_columnar_output(data_normalizer: DataNormalizer):
+    pa = pytest.importorskip("pyarrow")
+    service = CSVService(data_normalizer)
+
+    result = await service.process(
+        UploadFile(file=BytesIO(PAYLOAD), filename="data.csv"),
+        output_format=OutputFormat.ARROW,
+        dedup=DedupPolicy.FIRST,
+    )
+
+    table = pa.ipc.open_stream(result.content).read_all()
+    assert table.column("id").to_pylist() == ["U1", "U2"]
+
+
+async def test_normalize_endpoint_streams_last_rows_of_each_id(http_client: AsyncClient):
+    response = await http_client.post(
+        "/api/internal/v1/upload/normalize",
+        params={"stream": True, "dedup": "last"},
+        files={"file": ("data.csv", PAYLOAD, "text/csv")},
+    )
+
+    assert response.status_code == 200
+    assert response.text == "id;phone;dob\nU2;+971509999999;1985-05-06\nU1;+971501111111;1990-01-02\n"
+    summary_id = response.headers["x-csv-summary-id"]
+    summary = (await http_client.get(f"/api/internal/v1/upload/normalize/summaries/{summary_id}")).json()
+    assert summary["normalized_rows"] == 2
+    assert summary["skipped_rows"] == 4
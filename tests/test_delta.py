@@ -0,0 +1,174 @@
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+from httpx import AsyncClient
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.app_layer.interfaces.services.csv_normalization import NormalizedColumn
+from app.app_layer.services.csv_normalization import (
+    CsvDeltaBaseNotFoundError,
+    CsvDeltaIndexStore,
+    CsvNormalizationDTO,
+    DeltaMode,
+)
+from app.app_layer.services.csv_normalization.batch import init_worker
+from app.app_layer.services.csv_normalization.delta import DeltaIndex
+from app.app_layer.services.csv_normalization.normalizer import DataNormalizer
+from app.app_layer.services.csv_normalization.service import CSVService
+from app.configs.data_normalizer import DataNormalizerSettings
+
+NORMALIZE = "/api/internal/v1/upload/normalize"
+YESTERDAY = (
+    b"id;phone;dob\n"
+    b"U1;0501234567;02/01/1990\n"
+    b"U2;0507654321;1985-05-06\n"
+    b"U3;0501111111;1970-01-01\n"
+    b"U4;;1971-01-01\n"
+    b"U5;0502222222;1972-02-02\n"
+)
+TODAY = (
+    b"id;phone;dob\n"
+    b"U1;0501234567;02/01/1990\n"
+    b"U2;0507654321;1985-05-07\n"
+    b"U3;0501111111;1970-01-01\n"
+    b"U4;;1971-01-01\n"
+    b"U6;0503333333;1973-03-03\n"
+    b"U5;0502222222;1972-02-02\n"
+)
+
+
+class CountingNormalizer(DataNormalizer):
+    """Normalizer counting the phone numbers it is asked to normalize."""
+
+    phones_normalized = 0
+
+    def normalize_phones(
+        self,
+        phones: Sequence[str | None],
+        countries: Sequence[str | None] | str | None = None,
+    ) -> NormalizedColumn:
+        self.phones_normalized += len(phones)
+        return super().normalize_phones(phones, countries)
+
+
+@pytest.fixture
+def counting_normalizer() -> CountingNormalizer:
+    normalizer = CountingNormalizer()
+    # Date layouts are detected from the first two rows, which are always normalized
+    normalizer.dob_sample_rows = 2
+    return normalizer
+
+
+async def _normalize(service: CSVService, content: bytes, **options: object) -> CsvNormalizationDTO:
+    return await service.process(UploadFile(file=BytesIO(content), filename="contacts.csv"), **options)  # type: ignore[arg-type]
+
+
+def test_delta_index_round_trips_through_disk(tmp_path: Path):
+    index = DeltaIndex(max_rows=10)
+    index.add(1 << 63, "+971501234567;1990-01-02")
+    index.add(7, "+971507654321;1985-05-06;exact")
+    index.add(7, "ignored")
+    store = CsvDeltaIndexStore(index_dir=tmp_path)
+    delta_id, path = store.create()
+
+    store.save(index, path)
+    loaded = store.load(delta_id)
+
+    assert len(loaded) == 2
+    assert loaded.get(1 << 63) == "+971501234567;1990-01-02"
+    assert loaded.get(7) == "+971507654321;1985-05-06;exact"
+    assert loaded.get(8) is None
+    with pytest.raises(CsvDeltaBaseNotFoundError):
+        store.load("0" * 32)
+
+
+async def test_full_delta_normalizes_only_changed_rows(tmp_path: Path, counting_normalizer: CountingNormalizer):
+    settings = DataNormalizerSettings(
+        stream_chunk_size=16,
+        sniff_size=16,
+        parallel_threshold_bytes=0,
+        parallel_batch_rows=2,
+    )
+    expected = (await _normalize(CSVService(DataNormalizer()), TODAY)).content
+    with ThreadPoolExecutor(max_workers=2, initializer=init_worker, initargs=(counting_normalizer,)) as executor:
+        for service_executor in (None, executor):
+            service = CSVService(
+                counting_normalizer,
+                executor=service_executor,
+                delta_indexes=CsvDeltaIndexStore(index_dir=tmp_path),
+                normalizer_settings=settings,
+            )
+            yesterday = await _normalize(service, YESTERDAY, delta=DeltaMode.FULL)
+            counting_normalizer.phones_normalized = 0
+
+            today = await _normalize(service, TODAY, delta=DeltaMode.FULL, delta_base=yesterday.delta_id)
+
+            assert today.content == expected
+            # The first two rows, one of them changed, and the new and skipped rows
+            assert counting_normalizer.phones_normalized == 4
+            assert (today.processed_rows, today.normalized_rows, today.skipped_rows, today.unchanged_rows) == (
+                6,
+                5,
+                1,
+                3,
+            )
+            assert today.delta_id not in {None, yesterday.delta_id}
+
+
+async def test_diff_delta_writes_only_new_and_changed_rows(tmp_path: Path, counting_normalizer: CountingNormalizer):
+    service = CSVService(counting_normalizer, delta_indexes=CsvDeltaIndexStore(index_dir=tmp_path))
+    yesterday = await _normalize(service, YESTERDAY, delta=DeltaMode.DIFF, confidence=True)
+
+    today = await _normalize(service, TODAY, delta=DeltaMode.DIFF, delta_base=yesterday.delta_id, confidence=True)
+    again = await _normalize(service, TODAY, delta=DeltaMode.DIFF, delta_base=today.delta_id, confidence=True)
+    other_options = await _normalize(service, TODAY, delta=DeltaMode.DIFF, delta_base=today.delta_id)
+
+    assert today.content.decode() == (
+        "id;phone;dob;confidence\n"
+        "U2;+971507654321;1985-05-07;phone_country_defaulted\n"
+        "U6;+971503333333;1973-03-03;phone_country_defaulted\n"
+    )
+    assert again.content.decode() == "id;phone;dob;confidence\n"
+    assert again.unchanged_rows == 5
+    assert other_options.unchanged_rows == 0
+
+
+async def test_normalize_endpoint_chains_delta_ids(http_client: AsyncClient):
+    first = await http_client.post(NORMALIZE, params={"delta": "full"}, files={"file": ("a.csv", YESTERDAY)})
+    delta_id = first.headers["x-csv-delta-id"]
+
+    second = await http_client.post(
+        NORMALIZE,
+        params={"delta": "diff", "delta_base": delta_id, "stream": True},
+        files={"file": ("a.csv", TODAY)},
+    )
+    summary = (await http_client.get(f"{NORMALIZE}/summaries/{second.headers['x-csv-summary-id']}")).json()
+
+    assert first.headers["x-csv-unchanged"] == "0"
+    assert second.text == "id;phone;dob\nU2;+971507654321;1985-05-07\nU6;+971503333333;1973-03-03\n"
+    assert summary["delta_id"] == second.headers["x-csv-delta-id"] != delta_id
+    # All of a file this small is in the first batch, so it is normalized whole
+    assert summary["unchanged_rows"] == 3
+
+
+@pytest.mark.parametrize(
+    ("params", "status_code", "detail"),
+    [
+        ({"delta": "full", "delta_base": "0" * 32}, 404, f"Delta base {'0' * 32} was not found"),
+        ({"delta": "full", "dedup": "first"}, 400, "Delta normalization can not be combined with dedup"),
+        ({"delta_base": "0" * 32}, 400, "A delta base is only used by a delta normalization"),
+    ],
+)
+async def test_normalize_endpoint_rejects_unusable_delta_requests(
+    http_client: AsyncClient,
+    params: dict[str, str],
+    status_code: int,
+    detail: str,
+):
+    response = await http_client.post(NORMALIZE, params=params, files={"file": ("a.csv", YESTERDAY)})
+
+    assert response.status_code == status_code
+    assert response.json()["detail"] == detail
@@ -0,0 +1,60 @@
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+# Cumulative `python -X importtime` budgets, a few times what the modules take on a laptop, so only
+# a regression such as a heavy import creeping back into the path trips them
+BUDGETS_SECONDS = {
+    "app.configs.base": 0.05,
+    "app.app_layer.services.csv_normalization.batch": 0.8,
+}
+# Worker processes unpickle the batch function and the normalizer, nothing of the web application
+WORKER_MODULES = (
+    "app.app_layer.services.csv_normalization.batch",
+    "app.app_layer.services.csv_normalization.normalizer",
+)
+HEAVY_MODULES = (
+    "fastapi",
+    "dependency_injector",
+    "pydantic_settings",
+    "uvicorn",
+    "app.configs.settings",
+    "app.app_layer.services.csv_normalization.jobs",
+)
+
+
+def _import_profile(*modules: str) -> dict[str, float]:
+    """Import ``modules`` in a fresh interpreter and return the cumulative seconds of every imported module."""
+    statement = "; ".join(f"import {module}" for module in modules)
+    completed = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            profile[name.strip()] = int(cumulative) / 1_000_000
+    return profile
+
+
+@pytest.mark.parametrize(("module", "budget"), BUDGETS_SECONDS.items())
+def test_import_time_stays_within_budget(module: str, budget: float):
+    # The fastest of a few runs, the first one may also be compiling bytecode
+    seconds = min(_import_profile(module)[module] for _ in range(3))
+
+    assert seconds < budget
+
+
+def test_worker_modules_do_not_import_the_web_application_or_settings():
+    imported = _import_profile(*WORKER_MODULES)
+
+    assert [module for module in HEAVY_MODULES if module in imported] == []
@@ -0,0 +1,89 @@
+from collections.abc import Callable
+import csv
+from datetime import date
+from io import BytesIO, StringIO
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+
+from httpx import AsyncClient
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.app_layer.services.csv_normalization import OutputFormat
+from app.app_layer.services.csv_normalization.service import CSVService
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def _expected_rows(expected_csv: bytes) -> list[tuple[str, str, date | None]]:
+    rows = csv.reader(StringIO(expected_csv.decode("utf-8")), delimiter=";")
+    next(rows)
+    return [(row_id, phone, date.fromisoformat(dob) if dob else None) for row_id, phone, dob in rows]
+
+
+def _table_rows(table: "pa.Table") -> list[tuple[str, str, date | None]]:
+    return list(zip(*(table.column(name).to_pylist() for name in ("id", "phone", "dob")), strict=True))
+
+
+@pytest.mark.parametrize("output_format", [OutputFormat.ARROW, OutputFormat.PARQUET])
+async def test_csv_service_writes_columnar_output(
+    csv_service: CSVService,
+    input_csv_path: Path,
+    expected_csv_path: Path,
+    load_bytes: Callable[[Path], bytes],
+    output_format: OutputFormat,
+):
+    with SpooledTemporaryFile() as buffer:
+        buffer.write(load_bytes(input_csv_path))
+        buffer.seek(0)
+        upload = UploadFile(filename=input_csv_path.name, file=buffer)
+        result = await csv_service.process(upload, output_format=output_format)
+
+    if output_format is OutputFormat.ARROW:
+        table = pa.ipc.open_stream(result.content).read_all()
+    else:
+        table = pq.read_table(BytesIO(result.content))
+
+    assert result.filename == f"normalized-input_data.{output_format}"
+    assert table.schema.field("dob").type == pa.date32()
+    assert _table_rows(table) == _expected_rows(load_bytes(expected_csv_path))
+
+
+async def test_normalize_endpoint_negotiates_arrow_stream(
+    http_client: AsyncClient,
+    input_csv_path: Path,
+    expected_csv_path: Path,
+    load_bytes: Callable[[Path], bytes],
+):
+    files = {"file": (input_csv_path.name, load_bytes(input_csv_path), "text/csv")}
+
+    response = await http_client.post(
+        "/api/internal/v1/upload/normalize?stream=true",
+        files=files,
+        headers={"Accept": "application/vnd.apache.arrow.stream, text/csv;q=0.5"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert _table_rows(table) == _expected_rows(load_bytes(expected_csv_path))
+
+
+async def test_normalize_endpoint_format_parameter_overrides_accept(
+    http_client: AsyncClient,
+    input_csv_path: Path,
+    load_bytes: Callable[[Path], bytes],
+):
+    files = {"file": (input_csv_path.name, load_bytes(input_csv_path), "text/csv")}
+
+    response = await http_client.post(
+        "/api/internal/v1/upload/normalize?format=parquet",
+        files=files,
+        headers={"Accept": "application/vnd.apache.arrow.stream"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    assert response.headers["content-disposition"] == 'attachment; filename="normalized-input_data.parquet"'
+    assert pq.read_table(BytesIO(response.content)).num_rows == 50
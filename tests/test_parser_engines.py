@@ -0,0 +1,112 @@
+from collections.abc import AsyncIterator
+from io import BytesIO
+from itertools import chain
+import sys
+from time import perf_counter
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.app_layer.services.csv_normalization import CsvNormalizationError, DataNormalizer, ParserEngine
+from app.app_layer.services.csv_normalization.reader import csv_reader_factory
+from app.app_layer.services.csv_normalization.service import CSVService
+from app.configs.data_normalizer import DataNormalizerSettings
+
+pytest.importorskip("pyarrow")
+
+# Every engine must read these the way csv.reader does
+CONFORMANCE_CSVS = {
+    "plain": (
+        b"id;phone;dob\n"
+        b"U1;0501234567;02/01/1990\n"
+        b"U2;0507654321;1985-05-06\n"
+        b";0501111111;1970-01-01\n"
+        b"U4;;1971-01-01\n"
+        b"U5;0502222222;not a date\n"
+    ),
+    "quoting": (
+        b'"id";"phone";"dob"\r\n'
+        b'"U;1";"050 123 4567";"02/01/1990"\r\n'
+        b'"U""2";0507654321;"1985-05-06"\r\n'
+        b'"U\n3";"0501111111";1970-01-01\r\n'
+        b'U4"x;0502222222;1971-01-01\r\n'
+        b'"U5"y;0503333333;1972-02-02\r\n'
+        b"\r\n"
+        b'"";"";""\r\n'
+    ),
+    "ragged": (
+        b"name;id;phone;dob;country\n"
+        b"Ann;U1;0501234567;02/01/1990;AE\n"
+        b"Bob;U2;2025550123;1985-05-06;US;extra;fields\n"
+        b"Cid;U3;0501111111\n"
+        b"\n"
+        b" \n"
+        b"Dan;U4;0502222222;1971-01-01;\n"
+        b"Eve;U5;5551234;1972-02-02\n"
+    ),
+    "cp1252": "id,phone,dob\nJosé,0501234567,02/01/1990\nZoë,0507654321,1985-05-06\n".encode("cp1252"),
+    "bom": "\ufeffid;phone;dob\n\ufeffU1;0501234567;02/01/1990\nU2;0507654321;1985-05-06".encode(),
+    "unpaired-quote": (
+        b"id;phone;dob\n"
+        b"U1;0501234567;02/01/1990\n"
+        b'"U2;0507654321;1985-05-06\n'
+        b"U3;0501111111;1970-01-01\n"
+        b"U4;0502222222;1971-01-01\n"
+    ),
+}
+
+
+async def _normalize(engine: ParserEngine, content: bytes, block_size: int) -> tuple[bytes, dict[str, object]]:
+    settings = DataNormalizerSettings(
+        parser_engine=engine,
+        parser_block_size=block_size,
+        stream_chunk_size=16,
+        sniff_size=32,
+    )
+    service = CSVService(DataNormalizer(), normalizer_settings=settings)
+    result = await service.process(UploadFile(file=BytesIO(content), filename="contacts.csv"))
+    return result.content, result.model_dump(exclude={"content", "filename"})
+
+
+@pytest.mark.parametrize("name", list(CONFORMANCE_CSVS))
+@pytest.mark.parametrize("block_size", [8, 64, 1024 * 1024])
+async def test_parser_engines_yield_identical_output(name: str, block_size: int):
+    content = CONFORMANCE_CSVS[name]
+
+    expected = await _normalize(ParserEngine.STDLIB, content, block_size)
+    actual = await _normalize(ParserEngine.PYARROW, content, block_size)
+
+    assert actual == expected
+    assert expected[1]["processed_rows"] > 0
+
+
+def test_pyarrow_engine_without_pyarrow_fails_when_the_service_is_built(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(sys.modules, "app.app_layer.services.csv_normalization.arrow_reader", None)
+
+    with pytest.raises(CsvNormalizationError, match="The pyarrow parser engine needs pyarrow"):
+        csv_reader_factory(ParserEngine.PYARROW, sniff_size=16, block_size=1024)
+
+
+async def test_pyarrow_engine_splits_rows_after_a_stray_quote_in_linear_time():
+    rows = b"".join(b"U%d;05012%05d;1990-01-02\n" % (number, number) for number in range(1, 80_000))
+    content = b'id;phone;dob\nU0;050"1234567;1990-01-02\n' + rows
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for start in range(0, len(content), 64 * 1024):
+            yield content[start : start + 64 * 1024]
+
+    columns: dict[ParserEngine, list[list[str | None]]] = {}
+    seconds: dict[ParserEngine, float] = {}
+    for engine in ParserEngine:
+        reader = csv_reader_factory(engine, sniff_size=16 * 1024, block_size=256 * 1024)(chunks())
+        started = perf_counter()
+        batches = [batch async for batch in reader.column_batches([0, 1])]
+        seconds[engine] = perf_counter() - started
+        columns[engine] = [list(chain.from_iterable(batch[index] for batch in batches)) for index in range(2)]
+
+    assert columns[ParserEngine.PYARROW] == columns[ParserEngine.STDLIB]
+    ids, phones = columns[ParserEngine.PYARROW]
+    assert ids == [f"U{number}" for number in range(80_000)]
+    assert phones[:2] == ['050"1234567', "0501200001"]
+    # Rescanning the block for every line took seconds here
+    assert seconds[ParserEngine.PYARROW] < 1
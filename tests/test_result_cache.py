@@ -0,0 +1,160 @@
+from collections.abc import AsyncIterator
+from io import BytesIO
+from pathlib import Path
+
+from fastapi import FastAPI
+from httpx import AsyncClient
+import pytest
+from starlette.datastructures import Headers, UploadFile
+
+from app.app_layer.services.csv_normalization import (
+    CountryPlan,
+    CsvNormalizationSummaryDTO,
+    CsvResultCache,
+    DataNormalizer,
+    NumberingPlans,
+)
+
+NORMALIZE = "/api/internal/v1/upload/normalize"
+CSV = b"id;phone;dob\nU1;0501234567;02/01/1990\nU2;;1985-05-06\n"
+
+
+def _list_dir(path: Path) -> list[str]:
+    return sorted(item.name for item in path.iterdir())
+
+
+def _upload(content: bytes, filename: str = "data.csv") -> UploadFile:
+    return UploadFile(file=BytesIO(content), filename=filename, headers=Headers())
+
+
+async def _drain(cache: CsvResultCache, key: str, content: bytes) -> bytes:
+    async def chunks() -> AsyncIterator[bytes]:
+        yield content[:3]
+        yield content[3:]
+
+    stored = cache.store(key, chunks(), CsvNormalizationSummaryDTO(filename="out.csv"), "text/csv")
+    return b"".join([chunk async for chunk in stored])
+
+
+async def test_key_covers_upload_bytes_options_and_normalizer_settings(tmp_path: Path):
+    cache = CsvResultCache(DataNormalizer(), cache_dir=tmp_path, max_bytes=1000)
+    upload = _upload(b"id;phone;dob\n")
+
+    key = await cache.key(upload, ("AE", False))
+
+    assert await upload.read() == b"id;phone;dob\n"
+    assert await cache.key(_upload(b"id;phone;dob\n"), ("AE", False)) == key
+    assert await cache.key(_upload(b"id;phone;dob\r\n"), ("AE", False)) != key
+    assert await cache.key(_upload(b"id;phone;dob\n"), ("AE", True)) != key
+    assert await cache.key(_upload(b"id;phone;dob\n", "data.csv.gz"), ("AE", False)) != key
+    other_normalizer = CsvResultCache(DataNormalizer(default_country_code="1"), cache_dir=tmp_path, max_bytes=1000)
+    assert await other_normalizer.key(_upload(b"id;phone;dob\n"), ("AE", False)) != key
+    other_plans = NumberingPlans(
+        [CountryPlan(calling_code="971", regions=("AE",), trunk_prefix="0", national_lengths=frozenset({9}))]
+    )
+    other_plans_cache = CsvResultCache(DataNormalizer(numbering_plans=other_plans), cache_dir=tmp_path, max_bytes=1000)
+    assert await other_plans_cache.key(_upload(b"id;phone;dob\n"), ("AE", False)) != key
+    other_layouts = DataNormalizer()
+    other_layouts.dob_sample_rows = 10
+    other_layouts_cache = CsvResultCache(other_layouts, cache_dir=tmp_path, max_bytes=1000)
+    assert await other_layouts_cache.key(_upload(b"id;phone;dob\n"), ("AE", False)) != key
+
+
+async def test_least_recently_used_outputs_are_evicted_beyond_the_budget(tmp_path: Path):
+    cache = CsvResultCache(DataNormalizer(), cache_dir=tmp_path, max_bytes=25)
+    first, second, third = ("1" * 32, "2" * 32, "3" * 32)
+
+    assert await _drain(cache, first, b"0123456789") == b"0123456789"
+    await _drain(cache, second, b"abcdefghij")
+    assert cache.get(first) is not None
+    await _drain(cache, third, b"ABCDEFGHIJ")
+
+    assert cache.get(second) is None
+    assert cache.content_path(first).read_bytes() == b"0123456789"
+    assert cache.get(third) is not None
+    assert cache.size == 20
+    assert _list_dir(tmp_path) == [
+        f"{first}.json",
+        f"{first}.out",
+        f"{third}.json",
+        f"{third}.out",
+    ]
+    # A restarted process takes over what is on disk
+    assert CsvResultCache(DataNormalizer(), cache_dir=tmp_path, max_bytes=25).size == 20
+
+
+async def test_output_read_partially_is_not_cached(tmp_path: Path):
+    cache = CsvResultCache(DataNormalizer(), cache_dir=tmp_path, max_bytes=1000)
+
+    async def chunks() -> AsyncIterator[bytes]:
+        yield b"id;phone;dob\n"
+        yield b"U1;+971501234567;1990-01-02\n"
+
+    stored = cache.store("1" * 32, chunks(), CsvNormalizationSummaryDTO(filename="out.csv"), "text/csv")
+    await anext(stored)
+    await stored.aclose()
+
+    assert cache.get("1" * 32) is None
+    assert _list_dir(tmp_path) == []
+
+
+@pytest.mark.parametrize("stream", [False, True])
+async def test_normalize_endpoint_serves_repeated_uploads_from_cache(
+    http_client: AsyncClient,
+    asgi_app: FastAPI,
+    stream: bool,  # noqa: FBT001
+):
+    files = {"file": ("data.csv", CSV, "text/csv")}
+    first = await http_client.post(NORMALIZE, params={"stream": stream}, files=files)
+    second = await http_client.post(NORMALIZE, params={"stream": stream}, files=files)
+    other_format = await http_client.post(NORMALIZE, params={"stream": stream, "confidence": True}, files=files)
+
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content == b"id;phone;dob\nU1;+971501234567;1990-01-02\n"
+    assert first.headers["etag"] == second.headers["etag"]
+    assert first.headers["content-disposition"] == second.headers["content-disposition"]
+    assert other_format.headers["etag"] != first.headers["etag"]
+    if stream:
+        summary = (await http_client.get(f"{NORMALIZE}/summaries/{second.headers['x-csv-summary-id']}")).json()
+        assert (summary["processed_rows"], summary["skipped_rows"]) == (2, 1)
+    else:
+        assert second.headers["x-csv-processed"] == first.headers["x-csv-processed"]
+    metrics = asgi_app.state.container.csv_normalization_metrics()
+    assert metrics.result_cache_lookups.value(result="hit") == 1
+    assert metrics.normalizations.value(outcome="completed") == 2
+
+
+async def test_normalize_endpoint_answers_304_for_a_matching_etag(http_client: AsyncClient):
+    files = {"file": ("data.csv", CSV, "text/csv")}
+    etag = (await http_client.post(NORMALIZE, files=files)).headers["etag"]
+
+    not_modified = await http_client.post(NORMALIZE, files=files, headers={"If-None-Match": f'"other", W/{etag}'})
+    changed = await http_client.post(NORMALIZE, params={"country": "US"}, files=files, headers={"If-None-Match": etag})
+
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert not not_modified.content
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+async def test_normalize_endpoint_answers_304_for_any_etag_only_when_cached(http_client: AsyncClient):
+    files = {"file": ("data.csv", CSV, "text/csv")}
+
+    uncached = await http_client.post(NORMALIZE, files=files, headers={"If-None-Match": "*"})
+    cached = await http_client.post(NORMALIZE, files=files, headers={"If-None-Match": "*"})
+
+    assert uncached.status_code == 200
+    assert uncached.content == b"id;phone;dob\nU1;+971501234567;1990-01-02\n"
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == uncached.headers["etag"]
+    assert not cached.content
+
+
+async def test_normalize_endpoint_with_skip_report_bypasses_the_cache(http_client: AsyncClient):
+    files = {"file": ("data.csv", b"id;phone;dob\nU1;;1990-01-02\n", "text/csv")}
+
+    responses = [await http_client.post(NORMALIZE, params={"skip_report": True}, files=files) for _ in range(2)]
+
+    assert all("etag" not in response.headers for response in responses)
+    assert responses[0].headers["x-csv-skip-report-id"] != responses[1].headers["x-csv-skip-report-id"]
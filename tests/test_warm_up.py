@@ -0,0 +1,25 @@
+from fastapi import FastAPI
+import pytest
+
+from app.app_layer.services.csv_normalization import NormalizationCache
+from app.app_layer.services.csv_normalization.normalizer import DataNormalizer
+from app.app_layer.services.csv_normalization.service import CSVService
+
+
+async def test_warm_up_leaves_the_cache_to_uploads():
+    cache = NormalizationCache(max_entries=100)
+
+    await CSVService(DataNormalizer(cache=cache)).warm_up()
+
+    assert cache.stats.size == cache.stats.hits == cache.stats.misses == 0
+
+
+@pytest.mark.usefixtures("http_client")
+async def test_container_shares_one_service_across_requests(asgi_app: FastAPI):
+    container = asgi_app.state.container
+
+    service = container.get_csv_normalization_service()
+
+    assert service is container.get_csv_normalization_service()
+    assert service.normalizer is container.data_normalizer()
+    assert service.normalizer.cache is container.normalization_cache()